@@ -14,6 +14,7 @@ from padicmath import (
     rational_to_binary_padic
 )
 from padicmath.verification.verifier import BinaryPAdicVerifier
+from padicmath.verification.checks import STAGE_FLAGS
 
 def test_complex_perfectoid_factorization():
     """Test complex perfectoid factorization patterns from Section 2.3 of the paper."""
@@ -127,9 +128,9 @@ def test_complex_perfectoid_factorization():
     print(f"Perfectoid factorization predicate result: {result}")
 
 def test_advanced_schema_theoretic_properties():
-    """Test advanced schema-theoretic properties from Section 4 of the paper."""
-    print("\n=== Testing Advanced Schema-Theoretic Properties ===")
-    print("These properties correspond to Section 4 of the paper")
+    """Run the digit-arithmetic checks behind the schema-theoretic stage."""
+    print("\n=== Testing Schema-Theoretic Stage ===")
+    print("The stage checks the digit arithmetic of p-adic expansions")
     
     # Create a verifier
     verifier = BinaryPAdicVerifier()
@@ -137,36 +138,15 @@ def test_advanced_schema_theoretic_properties():
     # Run schema-theoretic verification
     result = verifier.verify_schema_theoretic_properties()
     
-    # Extract and display advanced formal properties
-    print("\n=== Advanced Formal Properties (Section 4.3) ===")
-    print("Property                                          | Verified")
+    # Display what the stage actually checked: the digit arithmetic of the
+    # p-adic expansions, not the geometric properties of Section 4
+    print("\n=== Digit Arithmetic Checks ===")
+    print("Check                                             | Verified")
     print("-----------------------------------------------------------")
-    
-    if 'advanced_formal_verified' in result and result['advanced_formal_verified']:
-        print("Global Coherence                                  | True")
-        print("Local-to-Global Principle                         | True")
-        print("Compatibility with Frobenius                      | True")
-        print("Compatibility with Perfectoid Completion          | True")
-        print("Algebraization Property                           | True")
-    else:
-        print("Advanced formal properties not verified")
-    
-    # Check tensor operations
-    print("\n=== Advanced Tensor Operations (Theorem 4.7) ===")
-    print("Operation                                          | Compatible")
-    print("-----------------------------------------------------------")
-    
-    print("τ+(O_X, Δ₁) ⊗ τ+(O_X, Δ₂)                          | True")
-    print("τ+(O_X, Δ) ⊗ L (line bundle)                       | True")
-    print("τ+(O_X, Δ) ⊗ O_X(D)                                | True")
-    print("τ+(O_X, Δ) ⊗ f_*O_Y                                | True")
-    
-    # Verify global coherence
-    print("\n=== Global Coherence (Theorem 4.1) ===")
-    print("The binary p-adic approach produces a coherent sheaf of test ideals")
-    print("Restriction Maps Consistency: True")
-    print("Gluing Conditions: True")
-    print("Sheaf Axioms: True")
+    for flag in STAGE_FLAGS["schema"]:
+        print(f"{flag:<50}| {result[flag]}")
+    print(f"\nChecked {result['checked']['elements']} elements and "
+          f"{result['checked']['pairs']} products")
 
 def main():
     """Run the enhanced verification examples."""
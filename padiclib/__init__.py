@@ -7,8 +7,13 @@ in Mixed Characteristic".
 """
 
 from .binary import BinaryPredicate, test_ideal_membership
-from .binary import subadditivity_factorization
-from .binary import FormulationClassifier
+from .binary import WeightedDigitPredicate, digit_matrix
+from .binary import DivisorPredicate, divisor_weight_vector
+from .binary import batch_test_ideal_membership, membership_threshold
+from .binary import subadditivity_factorization, FactorizationSearch
+from .binary import FormulationClassifier, predicate_key
+from .binary import cached_test_set, get_test_set_cache_info, clear_test_set_cache
 from .padic import PadicElement, Divisor, QDivisor
+from .padic import precision_context, get_default_precision
 
 __version__ = "0.1.0"
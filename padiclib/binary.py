@@ -2,9 +2,18 @@
 Implementation of binary p-adic predicates and test ideal membership algorithms.
 """
 
-from typing import Callable, Dict, List, Set, Tuple, Union
+from typing import Callable, Dict, List, Sequence, Set, Tuple, Union
 from fractions import Fraction
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from types import FunctionType, MappingProxyType
+import hashlib
+import io
+import json
 import math
+import pickle
+
+import numpy as np
 
 from .padic import PadicElement, Divisor, QDivisor
 
@@ -19,6 +28,7 @@ class BinaryPredicate:
         predicate_func: Callable[[PadicElement, int], bool],
         p: int,
         divisor: QDivisor = None,
+        monotone: str = None,
     ):
         """
         Initialize a binary predicate.
@@ -27,10 +37,16 @@ class BinaryPredicate:
             predicate_func: A function taking a p-adic element and integer t, returning True/False
             p: The prime number p
             divisor: The associated Q-divisor (if any)
+            monotone: How test ideal membership varies with t, if known:
+                "decreasing" (τ(R, φ, p^t) shrinks as t grows, the usual
+                divisor-based case) or "increasing"
         """
+        if monotone not in (None, "decreasing", "increasing"):
+            raise ValueError(f"Unknown monotonicity: {monotone}")
         self.func = predicate_func
         self.p = p
         self.divisor = divisor
+        self.monotone = monotone
 
     def evaluate(self, element: PadicElement, t: int) -> bool:
         """Evaluate the predicate on a given p-adic element."""
@@ -40,6 +56,35 @@ class BinaryPredicate:
             )
         return self.func(element, t)
 
+    def evaluate_batch(self, elements: List[PadicElement], t: int) -> List[bool]:
+        """
+        Evaluate the predicate on many p-adic elements.
+
+        Opaque predicates are called once per element; structured predicates
+        such as WeightedDigitPredicate override this with a vectorized path.
+        """
+        return [self.evaluate(element, t) for element in elements]
+
+    def digit_window(self, t: int) -> Union[int, None]:
+        """
+        Number of leading digits the predicate reads at parameter t.
+
+        Returns None when unknown, i.e. for predicates given as an arbitrary
+        callable, which must be handed full elements.
+        """
+        return None
+
+    def prefix_budget(self, t: int) -> Union[Tuple[List[float], float], None]:
+        """
+        Digit budget usable to prune searches over valuation-0 elements.
+
+        Returns (weights, bound) such that an element whose leading digits
+        a_0, ..., a_{k-1} already give Σ_{i<k} weights[i]·[a_i ≠ 0] >= bound
+        fails the predicate whatever its later digits, or None when no such
+        budget is known (as for arbitrary callables).
+        """
+        return None
+
     def test_ideal(self, ring_element, t: int) -> bool:
         """
         Test if a ring element belongs to the test ideal τ(R, φ, p^t).
@@ -51,17 +96,273 @@ class BinaryPredicate:
         Returns:
             True if the element is in the test ideal, False otherwise
         """
-        # Convert ring element to PadicElement if needed
-        if not isinstance(ring_element, PadicElement):
-            # Simple conversion for demo purposes
-            if isinstance(ring_element, int):
-                element = PadicElement(self.p, {0: ring_element}, 0)
+        return test_ideal_membership(self, self._to_element(ring_element), t)
+
+    def test_ideal_batch(self, ring_elements, t_values: List[int]) -> List[List[bool]]:
+        """
+        Test many ring elements against τ(R, φ, p^t) for many values of t.
+
+        Args:
+            ring_elements: Elements of the ring (convertible to PadicElement)
+            t_values: The parameters t in p^t
+
+        Returns:
+            Membership matrix with one row per element and one column per t
+        """
+        elements = [self._to_element(x) for x in ring_elements]
+        return batch_test_ideal_membership(self, elements, t_values)
+
+    def membership_threshold(self, ring_element, t_max: int, t_min: int = 0):
+        """
+        Find the t at which a ring element enters or leaves the test ideal.
+
+        See membership_threshold for details.
+        """
+        return membership_threshold(self, self._to_element(ring_element), t_max, t_min)
+
+    def _to_element(self, ring_element) -> PadicElement:
+        """Convert a ring element to a PadicElement."""
+        if isinstance(ring_element, PadicElement):
+            return ring_element
+        # Simple conversion for demo purposes
+        if isinstance(ring_element, int):
+            return PadicElement(self.p, {0: ring_element}, 0)
+        raise TypeError("Unsupported ring element type")
+
+
+class WeightedDigitPredicate(BinaryPredicate):
+    """
+    Binary predicate in structured (compiled) form.
+
+    Represents the common shape
+
+        φ(a, t) = guard_result                       if val(a) >= valuation_guard
+                  Σ_{i < window(t)} w_i·[a_i ≠ 0] < bound   otherwise
+
+    Because the digit window and weights are declared, the predicate can be
+    evaluated for a whole batch of elements as one matrix-vector product over
+    their digit matrix.
+    """
+
+    def __init__(
+        self,
+        p: int,
+        weights: Union[Callable[[int], float], Sequence[float]],
+        bound: float,
+        window: Union[Callable[[int], int], int],
+        valuation_guard: int = None,
+        guard_result: bool = True,
+        divisor: QDivisor = None,
+        monotone: str = None,
+    ):
+        """
+        Initialize a structured binary predicate.
+
+        Args:
+            p: The prime number p
+            weights: Weight w_i of digit position i, as a function of i or a
+                sequence (positions beyond its end get weight 0)
+            bound: The constant the weighted sum must stay strictly below
+            window: Number of leading digits read at parameter t, as a
+                function of t or a constant
+            valuation_guard: If given, elements with valuation at least this
+                value short-circuit to guard_result
+            guard_result: Value returned when the valuation guard applies
+            divisor: The associated Q-divisor (if any)
+            monotone: Monotonicity of membership in t, as for BinaryPredicate
+        """
+        super().__init__(self._evaluate_element, p, divisor, monotone)
+        self.weights = weights
+        self.bound = bound
+        self.window = window
+        self.valuation_guard = valuation_guard
+        self.guard_result = guard_result
+        self._weight_vector = np.zeros(0)
+        self._weight_list = None
+
+    def __getstate__(self):
+        """Pickle without the weight caches, which are rebuilt on demand."""
+        state = dict(self.__dict__)
+        state["_weight_vector"] = np.zeros(0)
+        state["_weight_list"] = None
+        return state
+
+    def digit_window(self, t: int) -> int:
+        """Number of leading digits the predicate reads at parameter t."""
+        return self.window(t) if callable(self.window) else self.window
+
+    def weight_vector(self, length: int) -> np.ndarray:
+        """Weights w_0, ..., w_{length-1}, extended and cached on demand."""
+        if len(self._weight_vector) < length:
+            if callable(self.weights):
+                start = len(self._weight_vector)
+                extra = [self.weights(i) for i in range(start, length)]
+                self._weight_vector = np.concatenate(
+                    [self._weight_vector, np.asarray(extra, dtype=float)]
+                )
             else:
-                raise TypeError("Unsupported ring element type")
-        else:
-            element = ring_element
+                vector = np.zeros(length)
+                known = np.asarray(self.weights[:length], dtype=float)
+                vector[: len(known)] = known
+                self._weight_vector = vector
+        return self._weight_vector[:length]
+
+    def prefix_budget(self, t: int) -> Union[Tuple[List[float], float], None]:
+        """
+        Weights inside the window and the bound, if the weights are non-negative.
+
+        Weighted sums only grow as digits are added, so a prefix reaching the
+        bound can be pruned. If the valuation guard covers valuation 0 the
+        predicate is constant, expressed as an empty budget with bound 0 or ∞.
+        """
+        if self.valuation_guard is not None and self.valuation_guard <= 0:
+            return [], (math.inf if self.guard_result else 0.0)
+        weights = self.weight_vector(self.digit_window(t))
+        if (weights < 0).any():
+            return None
+        return weights.tolist(), self.bound
+
+    def evaluate_matrix(
+        self, digits: np.ndarray, valuations: np.ndarray, t: int
+    ) -> np.ndarray:
+        """
+        Evaluate the predicate on a digit matrix.
+
+        Args:
+            digits: Array with one row per element holding at least
+                digit_window(t) leading digits (as returned by digit_matrix)
+            valuations: Valuation of each element
+            t: The parameter t
+
+        Returns:
+            Boolean vector with one entry per row
+        """
+        window = self.digit_window(t)
+        if digits.shape[1] < window:
+            raise ValueError(f"Digit matrix must have at least {window} columns")
+
+        weighted = (digits[:, :window] != 0).astype(float) @ self.weight_vector(window)
+        result = weighted < self.bound
+        if self.valuation_guard is not None:
+            result[np.asarray(valuations) >= self.valuation_guard] = self.guard_result
+        return result
+
+    def evaluate_batch(self, elements: List[PadicElement], t: int) -> List[bool]:
+        """Evaluate the predicate on many p-adic elements as one matrix product."""
+        for element in elements:
+            if element.p != self.p:
+                raise ValueError(
+                    f"Element prime {element.p} does not match predicate prime {self.p}"
+                )
+        digits, valuations = digit_matrix(elements, self.digit_window(t))
+        return self.evaluate_matrix(digits, valuations, t).tolist()
+
+    def _evaluate_element(self, element: PadicElement, t: int) -> bool:
+        """Scalar path: a direct weighted sum over the non-zero digits in the window."""
+        if self.valuation_guard is not None and element.valuation >= self.valuation_guard:
+            return self.guard_result
+        window = self.digit_window(t)
+        weights = self._scalar_weights(window)
+        weighted = 0.0
+        for i in sorted(pos - element.valuation for pos, digit in element.digits.items()
+                        if digit):
+            if 0 <= i < window:
+                weighted += weights[i]
+        return weighted < self.bound
+
+    def _scalar_weights(self, length: int) -> List[float]:
+        """Weights w_0, ..., w_{length-1} as a list of floats, cached per length."""
+        if self._weight_list is None or len(self._weight_list) < length:
+            self._weight_list = self.weight_vector(length).tolist()
+        return self._weight_list
+
+
+class DivisorPredicate(WeightedDigitPredicate):
+    """
+    The divisor predicate P_Δ of the paper in compiled form:
 
-        return test_ideal_membership(self, element, t)
+        P_Δ(a, t) = (val(a) < t_Δ) ∧ (Σ_{i < N} w_i(Δ)·[a_i ≠ 0] < C_Δ)
+
+    The weights w_0(Δ), ..., w_{N-1}(Δ), the threshold t_Δ and the bound C_Δ
+    are computed once per (divisor, p, N) and shared between instances.
+
+    P_Δ does not depend on t, so the predicate is declared "decreasing":
+    membership is constant for t <= t_Δ and given by the completion theorem
+    shortcut beyond, which membership_threshold answers in closed form.
+    """
+
+    def __init__(self, divisor: QDivisor, p: int, truncation: int = 20):
+        """
+        Initialize the predicate of a Q-divisor.
+
+        Args:
+            divisor: The Q-divisor Δ
+            p: The prime number p
+            truncation: Number N of leading digits entering the weighted sum
+        """
+        super().__init__(
+            p,
+            weights=divisor_weight_vector(divisor, p, truncation),
+            bound=divisor.compute_complexity_bound(),
+            window=truncation,
+            valuation_guard=divisor.compute_threshold(),
+            guard_result=False,
+            divisor=divisor,
+            monotone="decreasing",
+        )
+        self.truncation = truncation
+
+    def weight_vector(self, length: int) -> np.ndarray:
+        """Weights w_0(Δ), ..., w_{length-1}(Δ) from the shared cache."""
+        return divisor_weight_vector(self.divisor, self.p, length)
+
+
+# Maximum number of (divisor, p, length) weight vectors kept by divisor_weight_vector
+WEIGHT_CACHE_SIZE = 128
+
+
+@lru_cache(maxsize=WEIGHT_CACHE_SIZE)
+def divisor_weight_vector(divisor: QDivisor, p: int, length: int) -> np.ndarray:
+    """
+    Weights w_0(Δ), ..., w_{length-1}(Δ) as a read-only vector.
+
+    Equal to [divisor.compute_weights(i, p) for i in range(length)], but the
+    epsilon values are computed once instead of once per position. Results
+    are cached per (divisor, p, length).
+    """
+    epsilons = divisor.compute_epsilon_values()
+    terms = [(coef, epsilons[div]) for div, coef in divisor.components.items()]
+    vector = np.array(
+        [sum(coef * pow(p, -i * eps) for coef, eps in terms) for i in range(length)],
+        dtype=float,
+    )
+    vector.setflags(write=False)
+    return vector
+
+
+def digit_matrix(
+    elements: List[PadicElement], width: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Collect the leading digits of many p-adic elements into a matrix.
+
+    Args:
+        elements: The p-adic elements
+        width: Number of digits per element (positions counted from the valuation)
+
+    Returns:
+        Tuple (digits, valuations): an int64 array of shape (len(elements), width)
+        with digits[k, i] == elements[k].get_digit(i), and the valuation vector
+    """
+    digits = np.zeros((len(elements), width), dtype=np.int64)
+    valuations = np.zeros(len(elements), dtype=np.int64)
+    for row, element in enumerate(elements):
+        valuations[row] = element.valuation
+        for pos, digit in element.digits.items():
+            i = pos - element.valuation
+            if 0 <= i < width:
+                digits[row, i] = digit
+    return digits, valuations
 
 
 def test_ideal_membership(
@@ -96,8 +397,8 @@ def test_ideal_membership(
     # 1. Determine the precision needed
     precision = t + 10  # Using a reasonable approximation depth
 
-    # 2. Generate test elements (simplified approach)
-    test_set = generate_test_set(p, precision)
+    # 2. Generate test elements (simplified approach, shared across queries)
+    test_set = cached_test_set(p, precision)
 
     # 3. Check if for all test elements, predicate is satisfied
     for test_element in test_set:
@@ -111,6 +412,137 @@ def test_ideal_membership(
     return True
 
 
+def batch_test_ideal_membership(
+    predicate: BinaryPredicate, elements: List[PadicElement], t_values: List[int]
+) -> List[List[bool]]:
+    """
+    Determine membership in τ(R, φ, p^t) for many elements and many t at once.
+
+    Entry [i][j] equals test_ideal_membership(predicate, elements[i], t_values[j]).
+    The test set is fetched once per effective precision, and the products
+    element * test_element are computed lazily, at most once per element, and
+    shared by all values of t. Each (element, t) cell stops at the first
+    test element for which the predicate fails.
+
+    Args:
+        predicate: The binary predicate φ
+        elements: The p-adic elements to test
+        t_values: The parameters t in p^t
+
+    Returns:
+        Membership matrix with one row per element and one column per t
+    """
+    p = predicate.p
+    divisor_threshold = (
+        predicate.divisor.compute_threshold() if predicate.divisor else None
+    )
+
+    matrix = []
+    for element in elements:
+        products = {}  # test element -> element * test element
+        row = []
+        for t in t_values:
+            # Completion theorem shortcut, as in test_ideal_membership
+            if divisor_threshold is not None and t > divisor_threshold:
+                digits = element.get_digits_up_to(t - divisor_threshold)
+                row.append(all(d == 0 for d in digits))
+                continue
+
+            member = True
+            for test_element in cached_test_set(p, t + 10):
+                product = products.get(id(test_element))
+                if product is None:
+                    product = element * test_element
+                    products[id(test_element)] = product
+                if not predicate.evaluate(product, t):
+                    member = False
+                    break
+            row.append(member)
+        matrix.append(row)
+
+    return matrix
+
+
+def membership_threshold(
+    predicate: BinaryPredicate, element: PadicElement, t_max: int, t_min: int = 0
+) -> Union[int, None]:
+    """
+    Locate the membership boundary of an element for a monotone predicate.
+
+    For a predicate declared "decreasing" this is the largest t in
+    [t_min, t_max] with the element in τ(R, φ, p^t); for "increasing" it is
+    the smallest such t. Monotonicity allows an exponential search from t_min
+    followed by a binary search, so only O(log t_max) full membership tests
+    are run instead of one per t.
+
+    For a decreasing predicate with a divisor, membership for t > t_Δ is
+    decided by the completion theorem shortcut of test_ideal_membership (the
+    first t - t_Δ digits vanish) and is answered in closed form, so the
+    predicate only needs to be monotone for t <= t_Δ. This covers
+    DivisorPredicate, which does not depend on t and is constant there.
+
+    Args:
+        predicate: The binary predicate φ (must declare its monotonicity)
+        element: The p-adic element to test
+        t_max: Largest parameter t to consider
+        t_min: Smallest parameter t to consider
+
+    Returns:
+        The boundary value of t, or None if the element is in no test ideal
+        of the range
+    """
+    if predicate.monotone is None:
+        raise ValueError("Predicate is not declared monotone in t")
+    if t_min > t_max:
+        raise ValueError("t_min must not exceed t_max")
+
+    decreasing = predicate.monotone == "decreasing"
+
+    if decreasing and predicate.divisor:
+        divisor_threshold = predicate.divisor.compute_threshold()
+        # Member for t_Δ < t <= t_Δ + (number of leading zero digits)
+        nonzero = [
+            pos - element.valuation
+            for pos, digit in element.digits.items()
+            if digit and pos >= element.valuation
+        ]
+        last = t_max if not nonzero else min(t_max, divisor_threshold + min(nonzero))
+        if last >= max(t_min, divisor_threshold + 1):
+            return last
+        t_max = min(t_max, divisor_threshold)
+        if t_min > t_max:
+            return None
+
+    def reached(t: int) -> bool:
+        # True once the search has passed the boundary
+        member = test_ideal_membership(predicate, element, t)
+        return not member if decreasing else member
+
+    # Exponential search for the first t at which `reached` holds
+    low, step = t_min - 1, 1  # `reached` is False at low (or low is out of range)
+    high = None
+    while high is None:
+        probe = min(t_min + step - 1, t_max)
+        if reached(probe):
+            high = probe
+        elif probe == t_max:
+            high = t_max + 1
+        else:
+            low, step = probe, 2 * step
+
+    # Binary search in (low, high]
+    while high - low > 1:
+        mid = (low + high) // 2
+        if reached(mid):
+            high = mid
+        else:
+            low = mid
+
+    if decreasing:
+        return low if low >= t_min else None
+    return high if high <= t_max else None
+
+
 def generate_test_set(p: int, precision: int) -> List[PadicElement]:
     """
     Generate a set of test elements for the test ideal membership algorithm.
@@ -144,6 +576,294 @@ def generate_test_set(p: int, precision: int) -> List[PadicElement]:
     return result
 
 
+# Maximum number of (p, precision) test sets kept by cached_test_set
+TEST_SET_CACHE_SIZE = 128
+
+
+def _effective_test_set_precision(precision: int) -> int:
+    """
+    Smallest precision producing the same test set as `precision`.
+
+    generate_test_set only looks at min(precision, 3) and
+    min(precision // 2, 3), so all precisions from 6 upwards coincide.
+    """
+    return min(precision, 6)
+
+
+@lru_cache(maxsize=TEST_SET_CACHE_SIZE)
+def _build_test_set(p: int, precision: int) -> Tuple[PadicElement, ...]:
+    """Build a frozen test set; digits are exposed as read-only mappings."""
+    frozen = []
+    for element in generate_test_set(p, precision):
+        element.digits = MappingProxyType(element.digits)
+        frozen.append(element)
+    return tuple(frozen)
+
+
+def cached_test_set(p: int, precision: int) -> Tuple[PadicElement, ...]:
+    """
+    Return the test set for (p, precision) from an LRU cache.
+
+    The test set is generated and normalized once per prime and effective
+    precision and shared between callers, so it is returned as an immutable
+    tuple whose elements have read-only digits.
+
+    Args:
+        p: The prime number
+        precision: The precision to use
+
+    Returns:
+        A tuple of p-adic elements to use for testing
+    """
+    return _build_test_set(p, _effective_test_set_precision(precision))
+
+
+def get_test_set_cache_info():
+    """Return hit/miss/size statistics of the test set cache."""
+    return _build_test_set.cache_info()
+
+
+def clear_test_set_cache() -> None:
+    """Empty the test set cache and reset its statistics."""
+    _build_test_set.cache_clear()
+
+
+# Returned by FactorizationSearch.search when max_nodes ran out before the
+# search space was covered
+SEARCH_EXHAUSTED = "exhausted"
+
+
+class FactorizationSearch:
+    """
+    Search for factorizations x ≡ a·b (mod p^t) with φ(a, s) and ψ(b, t - s).
+
+    Monomial factors u·p^k (u a digit, p^k dividing x mod p^t) paired with
+    the quotient are tried first, on either side; they decide most elements
+    in p + t candidates. The remaining candidate factors are valuation-0
+    elements built digit by digit. At
+    position i the digit a_i is enumerated (zero first) and b_i is solved
+    from a·b ≡ x (mod p^(i+1)): it is unique when a_0 is a unit, and only
+    for a_0 = 0 are all (or no) digits b_i possible. Branches whose prefix
+    already exhausts the prefix_budget of φ or ψ are pruned; complete
+    candidates are checked with the full predicates.
+
+    Each (digits of x below t, s, t) search visits at most max_nodes
+    prefixes. Searches that cover their whole space are memoized; searches
+    cut off by max_nodes are not answered from the memo once max_nodes is
+    raised. Without prefix budgets (opaque predicates) the search space grows
+    like p^t, so for large t searches are cut off.
+
+    Instances are callable as the predicate function θ(x, t), which holds
+    when a factorization is found for some split s in [0, t]. θ is
+    conservative: when no factorization was found but some split was cut off
+    by max_nodes, it is False, and the statistic "undecided" counts these
+    evaluations.
+    """
+
+    def __init__(self, phi: BinaryPredicate, psi: BinaryPredicate, max_nodes: int = 10000):
+        """
+        Initialize the search.
+
+        Args:
+            phi: Predicate the first factor must satisfy at s
+            psi: Predicate the second factor must satisfy at t - s
+            max_nodes: Maximum number of prefixes visited per (x, s, t) search
+        """
+        if phi.p != psi.p:
+            raise ValueError("Predicates must have the same prime p")
+        self.phi = phi
+        self.psi = psi
+        self.p = phi.p
+        self.max_nodes = max_nodes
+        self._memo = {}
+        self.reset_statistics()
+
+    def __call__(self, element: PadicElement, t: int) -> bool:
+        """Evaluate θ(element, t)."""
+        return self.find(element, t) is not None
+
+    def find(
+        self, element: PadicElement, t: int
+    ) -> Union[Tuple[PadicElement, PadicElement, int], None]:
+        """
+        Find a factorization of element at parameter t.
+
+        Returns:
+            Tuple (a, b, s) with a·b and element agreeing in their first t
+            digits, φ(a, s) and ψ(b, t - s), or None if none was found (no
+            factorization exists, or the search for some split s ran out of
+            max_nodes; the latter is counted in statistics()["undecided"])
+        """
+        prefix = tuple(element.get_digits_up_to(t))
+        undecided = False
+        for s in range(t + 1):
+            found = self.search(prefix, s, t)
+            if found is SEARCH_EXHAUSTED:
+                undecided = True
+            elif found is not None:
+                return found[0], found[1], s
+        if undecided:
+            self.stats["undecided"] += 1
+        return None
+
+    def search(
+        self, prefix: Tuple[int, ...], s: int, t: int
+    ) -> Union[Tuple[PadicElement, PadicElement], None, str]:
+        """
+        Find factors (a, b) of the digit prefix x_0, ..., x_{t-1} for a fixed split s.
+
+        Returns:
+            Tuple (a, b); None if no factorization exists; or SEARCH_EXHAUSTED
+            if max_nodes prefixes were visited without deciding
+        """
+        key = (prefix, s, t)
+        if key in self._memo:
+            result, budget = self._memo[key]
+            if result is not SEARCH_EXHAUSTED or budget >= self.max_nodes:
+                self.stats["memo_hits"] += 1
+                return result
+        self.stats["searches"] += 1
+        result = self._search(prefix, s, t)
+        self._memo[key] = (result, self.max_nodes)
+        return result
+
+    def _search(
+        self, prefix: Tuple[int, ...], s: int, t: int
+    ) -> Union[Tuple[PadicElement, PadicElement], None, str]:
+        """Depth-first search over digit prefixes; see search."""
+        p = self.p
+        target = sum(d * p**i for i, d in enumerate(prefix))
+        budgets = [self.phi.prefix_budget(s), self.psi.prefix_budget(t - s)]
+        weights = [b[0] if b else [] for b in budgets]
+        bounds = [b[1] if b else math.inf for b in budgets]
+
+        for A, B in self._monomial_factors(target, t):
+            self.stats["candidates"] += 1
+            a = _element_from_digits(p, _value_digits(p, A, t))
+            b = _element_from_digits(p, _value_digits(p, B, t))
+            if self.phi.evaluate(a, s) and self.psi.evaluate(b, t - s):
+                return a, b
+
+        # Each entry: (position, a digits, b digits, A, B, spent on φ, spent on ψ)
+        stack = [(0, (), (), 0, 0, 0.0, 0.0)]
+        nodes = 0
+        while stack:
+            i, a_digits, b_digits, A, B, spent_a, spent_b = stack.pop()
+            nodes += 1
+            if nodes > self.max_nodes:
+                self.stats["exhausted"] += 1
+                self.stats["nodes"] += self.max_nodes
+                return SEARCH_EXHAUSTED
+
+            if i == t:
+                self.stats["candidates"] += 1
+                a = _element_from_digits(p, a_digits)
+                b = _element_from_digits(p, b_digits)
+                if self.phi.evaluate(a, s) and self.psi.evaluate(b, t - s):
+                    self.stats["nodes"] += nodes
+                    return a, b
+                continue
+
+            power = p**i
+            weight_a = weights[0][i] if i < len(weights[0]) else 0.0
+            weight_b = weights[1][i] if i < len(weights[1]) else 0.0
+            children = []
+            for a_i in range(p):
+                next_a = A + a_i * power
+                cost_a = spent_a + (weight_a if a_i else 0.0)
+                if cost_a >= bounds[0]:
+                    self.stats["pruned"] += 1
+                    continue
+                # a·b ≡ x (mod p^(i+1)) reads b_i·a_0 ≡ r (mod p)
+                r = (target - next_a * B) // power % p
+                unit = next_a % p
+                if unit:
+                    b_choices = ((r * pow(unit, -1, p)) % p,)
+                else:
+                    b_choices = range(p) if r == 0 else ()
+                for b_i in b_choices:
+                    cost_b = spent_b + (weight_b if b_i else 0.0)
+                    if cost_b >= bounds[1]:
+                        self.stats["pruned"] += 1
+                        continue
+                    children.append(
+                        (i + 1, a_digits + (a_i,), b_digits + (b_i,),
+                         next_a, B + b_i * power, cost_a, cost_b)
+                    )
+            # Pushed in reverse so that zero digits are explored first
+            stack.extend(reversed(children))
+
+        self.stats["nodes"] += nodes
+        return None
+
+    def _monomial_factors(self, target: int, t: int):
+        """
+        Pairs (A, B) with A·B ≡ target (mod p^t) where A or B is u·p^k.
+
+        k runs over the exponents of p dividing target mod p^t (k = t stands
+        for the factor 0 when target ≡ 0) and u over the non-zero digits.
+        """
+        p = self.p
+        modulus = p**t
+        target %= modulus
+        k = 0
+        while k < t and target % p**(k + 1) == 0:
+            k += 1
+        for shift in range(k + 1):
+            for u in range(1, p):
+                if shift == t:
+                    monomial, quotient = 0, u
+                else:
+                    monomial = u * p**shift
+                    quotient = (target // p**shift) * pow(u, -1, p**(t - shift)) % p**(t - shift)
+                yield monomial, quotient
+                yield quotient, monomial
+
+    def statistics(self) -> Dict[str, int]:
+        """
+        Counters accumulated over all searches.
+
+        searches: (x, s, t) searches run; memo_hits: searches answered from
+        the memo; nodes: prefixes visited; pruned: branches cut by a prefix
+        budget; candidates: complete factor pairs checked with the full
+        predicates; exhausted: searches stopped by max_nodes; undecided:
+        evaluations of θ that returned False because of such searches.
+        """
+        return dict(self.stats)
+
+    def reset_statistics(self) -> None:
+        """Reset all counters (the memo is kept)."""
+        self.stats = {
+            "searches": 0,
+            "memo_hits": 0,
+            "nodes": 0,
+            "pruned": 0,
+            "candidates": 0,
+            "exhausted": 0,
+            "undecided": 0,
+        }
+
+    def clear_memo(self) -> None:
+        """Forget all memoized search results."""
+        self._memo.clear()
+
+
+def _value_digits(p: int, value: int, t: int) -> List[int]:
+    """First t base-p digits of a non-negative integer."""
+    digits = []
+    for _ in range(t):
+        value, digit = divmod(value, p)
+        digits.append(digit)
+    return digits
+
+
+def _element_from_digits(p: int, digits: Sequence[int]) -> PadicElement:
+    """Valuation-0 element with the given (already reduced) leading digits."""
+    return PadicElement.from_canonical(
+        p, {i: d for i, d in enumerate(digits) if d}, 0
+    )
+
+
 def subadditivity_factorization(
     phi: BinaryPredicate, psi: BinaryPredicate
 ) -> Tuple[BinaryPredicate, int]:
@@ -158,7 +878,9 @@ def subadditivity_factorization(
         psi: The second binary predicate
 
     Returns:
-        A tuple (theta, C) where theta is the combined predicate and C is the constant
+        A tuple (theta, C) where theta is the combined predicate and C is the constant.
+        With divisors, theta.func is the FactorizationSearch evaluating θ
+        (see its statistics()).
     """
     if phi.p != psi.p:
         raise ValueError("Predicates must have the same prime p")
@@ -173,38 +895,9 @@ def subadditivity_factorization(
         # Compute the complexity bound
         C = math.ceil(combined_divisor.compute_complexity_bound())
 
-        # Create the combined predicate function
-        def combined_func(element: PadicElement, t: int) -> bool:
-            # Binary search to find optimal split point s
-            left, right = 0, t
-            while left <= right:
-                s = (left + right) // 2
-
-                # Try to factorize element for test ideal membership
-                # This is a simplification - in practice would need to solve
-                # the factorization problem more carefully
-                for i in range(min(10, p)):
-                    a = PadicElement(p, {0: i}, 0)
-                    b = PadicElement(p, {0: (1 if i == 0 else 1)}, 0)
-
-                    if (
-                        phi.evaluate(a, s)
-                        and psi.evaluate(b, t - s)
-                        and (a * b).get_digits_up_to(t) == element.get_digits_up_to(t)
-                    ):
-                        return True
-
-                # Adjust search range based on some heuristic
-                # In practice, we'd use a more sophisticated approach
-                if element.get_digit(s) > p // 2:
-                    left = s + 1
-                else:
-                    right = s - 1
-
-            # If no factorization found, return False
-            return False
-
-        theta = BinaryPredicate(combined_func, p, combined_divisor)
+        # θ(x, t) holds when x factors as a·b with φ(a, s) and ψ(b, t - s)
+        search = FactorizationSearch(phi, psi)
+        theta = BinaryPredicate(search, p, combined_divisor)
 
     else:
         # Without divisors, use a more conservative approach
@@ -223,29 +916,246 @@ def subadditivity_factorization(
     return theta, C
 
 
+class _PredicateKeyPickler(pickle.Pickler):
+    """Pickler recording functions by code and constants instead of by name."""
+
+    def reducer_override(self, obj):
+        if isinstance(obj, FunctionType):
+            if obj.__closure__:
+                raise pickle.PicklingError("closures have no predicate key")
+            code = obj.__code__
+            return tuple, ((obj.__module__, obj.__qualname__, code.co_code,
+                            repr(code.co_consts), code.co_names, obj.__defaults__),)
+        return NotImplemented
+
+
+def predicate_key(predicate: BinaryPredicate) -> Union[str, None]:
+    """
+    Content key of a predicate, or None.
+
+    The key hashes the pickled predicate, with functions recorded by their
+    code and constants, so predicates built from the same parameters and
+    functions share it and a changed parameter or function body changes it.
+    Predicates holding closures or other unpicklable state have no key.
+    """
+    buffer = io.BytesIO()
+    try:
+        _PredicateKeyPickler(buffer).dump(predicate)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return None
+    return hashlib.sha256(buffer.getvalue()).hexdigest()
+
+
 class FormulationClassifier:
     """
     Classifier for determining equivalent formulations of binary predicates.
+
+    Formulations are compared through signatures: the vector of predicate
+    values on a shared grid of test elements and parameters t. The grid is
+    built once per precision, and formulations with equal signatures are
+    equivalent up to that precision.
+
+    At the index precision every registered formulation also has a
+    fingerprint (its signature packed into an integer bitset), and
+    formulations are indexed by fingerprint, so a query predicate is
+    evaluated once and matched with a single dictionary lookup. The index can
+    be saved to a JSON file; fingerprints loaded back are reused when the
+    same names are registered again.
     """
 
-    def __init__(self, p: int):
+    def __init__(self, p: int, index_precision: int = 10):
         """
         Initialize the classifier.
 
         Args:
             p: The prime number
+            index_precision: Precision of the test grid behind the fingerprint index
         """
         self.p = p
+        self.index_precision = index_precision
         self.formulations = {}
+        self._grids = {}
+        self._fingerprints = {}  # name -> fingerprint, registered names only
+        self._index = {}  # fingerprint -> names, in registration order
+        self._keys = {}  # name -> predicate key, registered names only
+        self._loaded = {}  # name -> (fingerprint, predicate key) read by load_index
+
+    def register_formulation(
+        self, name: str, predicate: BinaryPredicate, workers: int = 1
+    ) -> None:
+        """
+        Register a named formulation of a binary predicate and index it.
+
+        The predicate is evaluated on the whole test grid at the index
+        precision right away, unless load_index read a fingerprint for the
+        name together with the same predicate key (see predicate_key): that
+        fingerprint is then reused without evaluating the predicate.
 
-    def register_formulation(self, name: str, predicate: BinaryPredicate) -> None:
-        """Register a named formulation of a binary predicate."""
+        Args:
+            name: Name of the formulation
+            predicate: The binary predicate
+            workers: Number of worker processes for the evaluation, as for signature
+        """
         self.formulations[name] = predicate
+        key = predicate_key(predicate)
+        fingerprint, loaded_key = self._loaded.pop(name, (None, None))
+        if key is None or loaded_key != key:
+            fingerprint = self.fingerprint(predicate, workers)
+        self._keys[name] = key
+        self._index_fingerprint(name, fingerprint)
+
+    def fingerprint(self, predicate: BinaryPredicate, workers: int = 1) -> int:
+        """Signature at the index precision packed into an integer bitset."""
+        bits = 0
+        signature = self.signature(predicate, self.index_precision, workers)
+        for k, value in enumerate(signature):
+            if value:
+                bits |= 1 << k
+        return bits
+
+    def _index_fingerprint(self, name: str, fingerprint: int) -> None:
+        """Insert or move a name in the fingerprint index."""
+        previous = self._fingerprints.get(name)
+        if previous is not None:
+            names = self._index[previous]
+            names.remove(name)
+            if not names:
+                del self._index[previous]
+        self._fingerprints[name] = fingerprint
+        self._index.setdefault(fingerprint, []).append(name)
+
+    def save_index(self, path: str) -> None:
+        """Write the fingerprint index to a JSON file."""
+        data = {
+            "p": self.p,
+            "precision": self.index_precision,
+            "fingerprints": {
+                name: format(fingerprint, "x")
+                for name, (fingerprint, _) in self._loaded.items()
+            },
+            "keys": {name: key for name, (_, key) in self._loaded.items() if key},
+        }
+        for name, fingerprint in self._fingerprints.items():
+            data["fingerprints"][name] = format(fingerprint, "x")
+            if self._keys[name]:
+                data["keys"][name] = self._keys[name]
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, indent=2)
+
+    def load_index(self, path: str) -> None:
+        """
+        Read fingerprints from a JSON file written by save_index.
+
+        Names already registered keep their fingerprints. For other names the
+        fingerprint is kept until the name is registered; it is reused then
+        if the registered predicate has the predicate key saved with it, and
+        recomputed otherwise. Names that are never registered are not
+        returned by find_equivalent_formulations.
+        """
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        if data["p"] != self.p or data["precision"] != self.index_precision:
+            raise ValueError(
+                f"Index was built for p={data['p']}, precision={data['precision']}"
+            )
+        keys = data.get("keys", {})
+        for name, fingerprint in data["fingerprints"].items():
+            if name not in self.formulations:
+                self._loaded[name] = (int(fingerprint, 16), keys.get(name))
+
+    def test_grid(self, precision: int = 10) -> Tuple[List[PadicElement], List[int]]:
+        """
+        The shared test elements and parameters t for a precision.
+
+        Elements are p^val·dig for val < precision and dig < min(5, p) (zero
+        once), and t runs over 1, ..., precision - 1.
+        """
+        if precision not in self._grids:
+            elements = [PadicElement(self.p, {}, 0)]
+            for val in range(precision):
+                for dig in range(1, min(5, self.p)):
+                    elements.append(PadicElement(self.p, {val: dig}, 0))
+            self._grids[precision] = (elements, list(range(1, precision)))
+        return self._grids[precision]
+
+    def signature(
+        self, predicate: BinaryPredicate, precision: int = 10, workers: int = 1
+    ) -> Tuple[bool, ...]:
+        """
+        Values of the predicate on the test grid, t-major.
+
+        With workers > 1 the values of t are split into contiguous chunks
+        evaluated in worker processes (the predicate must be picklable).
+        """
+        elements, t_values = self.test_grid(precision)
+        if workers == 1 or len(t_values) < 2:
+            return _formulation_signature(predicate, elements, t_values)
+
+        size = -(-len(t_values) // workers)
+        chunks = [t_values[k:k + size] for k in range(0, len(t_values), size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = executor.map(
+                _formulation_signature,
+                [predicate] * len(chunks),
+                [elements] * len(chunks),
+                chunks,
+            )
+            return tuple(value for part in parts for value in part)
+
+    def signatures(self, precision: int = 10, workers: int = 1) -> Dict[str, Tuple[bool, ...]]:
+        """
+        Signatures of all registered formulations, computed in one pass.
+
+        Args:
+            precision: The precision to check up to
+            workers: Number of worker processes (1 runs in-process; more
+                require picklable predicates, such as WeightedDigitPredicate
+                and DivisorPredicate, or callables defined at module level)
+
+        Returns:
+            Dictionary mapping formulation names to signatures
+        """
+        elements, t_values = self.test_grid(precision)
+        names = list(self.formulations)
+        if workers == 1:
+            results = [
+                _formulation_signature(self.formulations[name], elements, t_values)
+                for name in names
+            ]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(
+                    executor.map(
+                        _formulation_signature,
+                        [self.formulations[name] for name in names],
+                        [elements] * len(names),
+                        [t_values] * len(names),
+                    )
+                )
+        return dict(zip(names, results))
+
+    def equivalence_classes(self, precision: int = 10, workers: int = 1) -> List[List[str]]:
+        """
+        Group the registered formulations into equivalence classes.
+
+        Args:
+            precision: The precision to check up to
+            workers: Number of worker processes, as for signatures
+
+        Returns:
+            Lists of formulation names with equal signatures, in registration order
+        """
+        classes = {}
+        for name, signature in self.signatures(precision, workers).items():
+            classes.setdefault(signature, []).append(name)
+        return list(classes.values())
 
     def are_equivalent(self, name1: str, name2: str, precision: int = 10) -> bool:
         """
         Check if two formulations are equivalent up to the given precision.
 
+        Stops at the first grid point where the formulations differ.
+
         Args:
             name1: First formulation name
             name2: Second formulation name
@@ -260,54 +1170,48 @@ class FormulationClassifier:
         if not pred1 or not pred2:
             raise ValueError("Formulation not registered")
 
-        # Generate a set of test p-adic elements
-        test_elements = []
-        for val in range(precision):
-            for dig in range(min(5, self.p)):
-                digits = {val: dig}
-                test_elements.append(PadicElement(self.p, digits, 0))
-
-        # Check if predicates give the same result on all test elements
-        for elem in test_elements:
-            for t in range(1, precision):
-                if pred1.evaluate(elem, t) != pred2.evaluate(elem, t):
-                    return False
+        elements, t_values = self.test_grid(precision)
+        for t in t_values:
+            if pred1.evaluate_batch(elements, t) != pred2.evaluate_batch(elements, t):
+                return False
 
         return True
 
     def find_equivalent_formulations(
-        self, predicate: BinaryPredicate, precision: int = 10
+        self, predicate: BinaryPredicate, precision: int = 10, workers: int = 1
     ) -> List[str]:
         """
         Find all registered formulations equivalent to the given predicate.
 
+        At the index precision this is a fingerprint lookup, and workers
+        only parallelize the evaluation of the query predicate; other
+        precisions re-evaluate all registered formulations in the workers.
+
         Args:
             predicate: The predicate to check against
             precision: The precision to check up to
+            workers: Number of worker processes, as for signatures
 
         Returns:
             List of formulation names equivalent to the given predicate
         """
-        result = []
-
-        for name, pred in self.formulations.items():
-            # Generate a set of test p-adic elements
-            equivalent = True
-
-            # Check on a selection of test cases
-            for val in range(precision):
-                for dig in range(min(5, self.p)):
-                    elem = PadicElement(self.p, {val: dig}, 0)
-                    for t in range(1, precision):
-                        if pred.evaluate(elem, t) != predicate.evaluate(elem, t):
-                            equivalent = False
-                            break
-                    if not equivalent:
-                        break
-                if not equivalent:
-                    break
-
-            if equivalent:
-                result.append(name)
-
-        return result
+        if precision == self.index_precision:
+            names = self._index.get(self.fingerprint(predicate, workers), [])
+            return [name for name in names if name in self.formulations]
+
+        target = self.signature(predicate, precision, workers)
+        return [
+            name
+            for name, signature in self.signatures(precision, workers).items()
+            if signature == target
+        ]
+
+
+def _formulation_signature(
+    predicate: BinaryPredicate, elements: List[PadicElement], t_values: List[int]
+) -> Tuple[bool, ...]:
+    """Predicate values on elements × t_values, t-major (process pool worker)."""
+    signature = []
+    for t in t_values:
+        signature.extend(predicate.evaluate_batch(elements, t))
+    return tuple(signature)
@@ -2,9 +2,57 @@
 Core classes for representing p-adic elements and divisors.
 """
 
-from typing import Dict, List, Tuple, Union
+from typing import Dict, List, Tuple, Union, Iterator, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
 import math
 from fractions import Fraction
+from types import MappingProxyType
+
+
+# Default number of digits kept by arithmetic results (None means unbounded)
+_default_precision: ContextVar[Optional[int]] = ContextVar(
+    "padiclib_precision", default=None
+)
+
+
+def get_default_precision() -> Optional[int]:
+    """Return the precision applied to arithmetic results in the current context."""
+    return _default_precision.get()
+
+
+@contextmanager
+def precision_context(precision: Optional[int]) -> Iterator[None]:
+    """
+    Cap the precision of all p-adic arithmetic inside a with-block.
+
+    Results of multiplication and exponentiation keep only the first
+    `precision` digits after the valuation, so repeated products stay
+    bounded in size.
+
+    The context applies to PadicElement arithmetic only. padicmath has its
+    own, independent padicmath.precision_context for PAdicNumber; neither
+    affects the other.
+
+    Args:
+        precision: Number of digits to keep, or None for unbounded arithmetic
+    """
+    if precision is not None and precision < 0:
+        raise ValueError("Precision must be non-negative")
+    token = _default_precision.set(precision)
+    try:
+        yield
+    finally:
+        _default_precision.reset(token)
+
+
+def _result_precision(*precisions: Optional[int]) -> Optional[int]:
+    """Smallest of the given precisions and the context default, ignoring None."""
+    known = [n for n in precisions if n is not None]
+    default = _default_precision.get()
+    if default is not None:
+        known.append(default)
+    return min(known) if known else None
 
 
 class PadicElement:
@@ -12,7 +60,13 @@ class PadicElement:
     Represents an element in a p-adic ring with its digit representation.
     """
 
-    def __init__(self, p: int, digits: Dict[int, int] = None, valuation: int = 0):
+    def __init__(
+        self,
+        p: int,
+        digits: Dict[int, int] = None,
+        valuation: int = 0,
+        precision: int = None,
+    ):
         """
         Initialize a p-adic element.
 
@@ -20,27 +74,49 @@ class PadicElement:
             p: The prime number p
             digits: Dictionary mapping position to digit (sparse representation)
             valuation: The p-adic valuation of the element
+            precision: If given, only the first `precision` digits after the
+                valuation are kept, here and in arithmetic results
         """
         self.p = p
         self.digits = digits or {}
         self.valuation = valuation
+        self.precision = precision
         self._normalize()
 
-    def _normalize(self):
-        """Ensure all digits are in range [0, p-1] and handle carries."""
-        # Remove zero digits for sparse representation
-        self.digits = {k: v for k, v in self.digits.items() if v != 0}
+    @classmethod
+    def from_canonical(
+        cls,
+        p: int,
+        digits: Dict[int, int],
+        valuation: int = 0,
+        precision: int = None,
+    ) -> "PadicElement":
+        """
+        Create a p-adic element from digits that are already normalized.
+
+        Skips normalization entirely, so the caller must guarantee that every
+        digit is in range [1, p-1] (zero digits omitted). The dictionary is used
+        as-is, not copied.
 
-        # Ensure all digits are in range [0, p-1]
-        for pos in sorted(self.digits.keys()):
-            if self.digits[pos] >= self.p:
-                carry = self.digits[pos] // self.p
-                self.digits[pos] %= self.p
-                self.digits[pos + 1] = self.digits.get(pos + 1, 0) + carry
+        Args:
+            p: The prime number p
+            digits: Dictionary mapping position to digit (sparse, canonical)
+            valuation: The p-adic valuation of the element
+            precision: Number of digits after the valuation that are kept
+        """
+        element = cls.__new__(cls)
+        element.p = p
+        element.digits = digits
+        element.valuation = valuation
+        element.precision = precision
+        return element
 
-                # Remove zero digits
-                if self.digits[pos] == 0:
-                    del self.digits[pos]
+    def _normalize(self):
+        """Ensure all digits are in range [0, p-1] and handle carries."""
+        self.digits = normalize_digits(self.digits, self.p)
+        if self.precision is not None:
+            bound = self.valuation + self.precision
+            self.digits = {pos: d for pos, d in self.digits.items() if pos < bound}
 
     def get_digit(self, position: int) -> int:
         """Get the digit at the specified position."""
@@ -52,28 +128,58 @@ class PadicElement:
 
     def __mul__(self, other: "PadicElement") -> "PadicElement":
         """Multiply two p-adic elements."""
+        return self.multiply(other)
+
+    def multiply(
+        self, other: "PadicElement", precision: int = None, strategy: str = "auto"
+    ) -> "PadicElement":
+        """
+        Multiply two p-adic elements, optionally truncating the result.
+
+        The result keeps the smallest of the operand precisions, the
+        `precision` argument and the precision_context default; digits beyond
+        it are never computed.
+
+        Args:
+            other: The element to multiply by
+            precision: Number of digits after the valuation to keep
+            strategy: "sparse" (pairwise convolution), "dense" (Kronecker
+                substitution through a single big-integer product) or "auto"
+                to choose by density
+
+        Returns:
+            The product as a new PadicElement
+        """
         if self.p != other.p:
             raise ValueError("Elements must have the same prime p")
 
         result_val = self.valuation + other.valuation
-        result_digits = {}
-
-        # Compute the product using convolution
-        for i, a_i in self.digits.items():
-            for j, b_j in other.digits.items():
-                pos = i + j - self.valuation - other.valuation
-                result_digits[pos] = result_digits.get(pos, 0) + a_i * b_j
-
-        return PadicElement(self.p, result_digits, result_val)
+        result_precision = _result_precision(self.precision, other.precision, precision)
+        result_digits = multiply_digits(
+            self.digits,
+            other.digits,
+            self.p,
+            shift=-result_val,
+            precision=(
+                None if result_precision is None else result_val + result_precision
+            ),
+            strategy=strategy,
+        )
+        return PadicElement.from_canonical(
+            self.p, result_digits, result_val, result_precision
+        )
 
     def __pow__(self, exponent: Union[int, Fraction]) -> "PadicElement":
         """Raise a p-adic element to a power (integer or rational)."""
         if isinstance(exponent, int):
             if exponent == 0:
-                return PadicElement(self.p, {0: 1}, 0)  # Return 1
+                return PadicElement(self.p, {0: 1}, 0, self.precision)  # Return 1
 
-            result = PadicElement(self.p, {0: 1}, 0)  # Start with 1
-            base = PadicElement(self.p, self.digits.copy(), self.valuation)
+            # Start with 1; every product below is truncated to the result precision
+            result = PadicElement.from_canonical(self.p, {0: 1}, 0, self.precision)
+            base = PadicElement.from_canonical(
+                self.p, self.digits.copy(), self.valuation, self.precision
+            )
             exp = abs(exponent)
 
             while exp > 0:
@@ -131,11 +237,198 @@ class PadicElement:
         return " + ".join(terms) or "0"
 
 
+def normalize_digits(digits: Dict[int, int], p: int) -> Dict[int, int]:
+    """
+    Propagate carries so that every digit is in range [0, p-1].
+
+    Positions are visited once in increasing order while a single pending
+    carry is pushed upwards, so carries landing on existing positions or on
+    new positions beyond the last one are all resolved. The cost is
+    O(k log k) for the sort of the k non-zero positions plus the length of
+    the carry chains. Negative digits are left untouched.
+
+    Args:
+        digits: Dictionary mapping position to (possibly unreduced) digit
+        p: The prime number p
+
+    Returns:
+        New sparse dictionary without zero digits
+    """
+    result = {}
+    carry, carry_pos = 0, 0
+
+    for pos in sorted(digits):
+        # Flush the pending carry up to (but excluding) this position
+        while carry and carry_pos < pos:
+            carry, digit = divmod(carry, p)
+            if digit:
+                result[carry_pos] = digit
+            carry_pos += 1
+
+        value = digits[pos] + (carry if carry_pos == pos else 0)
+        if value >= p:
+            carry, value = divmod(value, p)
+        else:
+            carry = 0
+        if value:
+            result[pos] = value
+        carry_pos = pos + 1
+
+    while carry:
+        carry, digit = divmod(carry, p)
+        if digit:
+            result[carry_pos] = digit
+        carry_pos += 1
+
+    return result
+
+
+# Below this many digit pairs the sparse convolution is always used
+SPARSE_PAIR_LIMIT = 64
+
+
+def _pack_digits(digits: Dict[int, int], p: int, offset: int) -> int:
+    """Evaluate sum(d · p^(pos - offset)) as a single integer."""
+    if not digits:
+        return 0
+    span = max(digits) - offset + 1
+    coefficients = [0] * span
+    for pos, digit in digits.items():
+        coefficients[pos - offset] = digit
+    return _pack_list(coefficients, p)
+
+
+def _pack_list(coefficients: List[int], p: int) -> int:
+    """Divide-and-conquer Horner evaluation of a coefficient list at p."""
+    if len(coefficients) <= 64:
+        value = 0
+        for coefficient in reversed(coefficients):
+            value = value * p + coefficient
+        return value
+    half = len(coefficients) // 2
+    return _pack_list(coefficients[:half], p) + _pack_list(coefficients[half:], p) * p**half
+
+
+def _unpack_digits(value: int, p: int, offset: int) -> Dict[int, int]:
+    """Expand a non-negative integer into sparse base-p digits starting at offset."""
+    result = {}
+    stack = [(value, offset, None)]
+    while stack:
+        value, pos, length = stack.pop()
+        if not value:
+            continue
+        if length is None:
+            # Upper bound on the number of base-p digits of value
+            length = int(value.bit_length() / math.log2(p)) + 2
+        if length <= 64:
+            while value:
+                value, digit = divmod(value, p)
+                if digit:
+                    result[pos] = digit
+                pos += 1
+            continue
+        half = length // 2
+        high, low = divmod(value, p**half)
+        stack.append((low, pos, half))
+        stack.append((high, pos + half, length - half))
+    return result
+
+
+def multiply_digits(
+    a: Dict[int, int],
+    b: Dict[int, int],
+    p: int,
+    shift: int = 0,
+    precision: int = None,
+    strategy: str = "auto",
+) -> Dict[int, int]:
+    """
+    Multiply two sparse digit expansions and normalize the result.
+
+    Computes the digits of (Σ a_i·p^i)(Σ b_j·p^j)·p^shift. Sparse inputs use
+    the pairwise convolution; dense inputs are packed into integers
+    (Kronecker substitution at p itself), multiplied with the sub-quadratic
+    big-integer product and expanded again, so no carry pass is needed.
+
+    Args:
+        a: First sparse digit dictionary
+        b: Second sparse digit dictionary
+        p: The prime number p
+        shift: Offset added to every result position
+        precision: If given, positions at or above this bound are dropped
+        strategy: "sparse", "dense" or "auto"
+
+    Returns:
+        Normalized sparse digit dictionary of the product
+    """
+    if not a or not b:
+        return {}
+    if strategy not in ("auto", "sparse", "dense"):
+        raise ValueError(f"Unknown multiplication strategy: {strategy}")
+
+    if strategy == "auto":
+        pairs = len(a) * len(b)
+        span = (max(a) - min(a)) + (max(b) - min(b)) + 2
+        dense = pairs > SPARSE_PAIR_LIMIT and pairs > 4 * span
+        strategy = "dense" if dense else "sparse"
+    # Packing needs non-negative digits; otherwise keep the exact convolution
+    if strategy == "dense" and (min(a.values()) < 0 or min(b.values()) < 0):
+        strategy = "sparse"
+
+    if strategy == "sparse":
+        result = {}
+        b_items = sorted(b.items())
+        for i, a_i in a.items():
+            for j, b_j in b_items:
+                pos = i + j + shift
+                if precision is not None and pos >= precision:
+                    break
+                result[pos] = result.get(pos, 0) + a_i * b_j
+        result = normalize_digits(result, p)
+        if precision is not None:
+            result = {pos: d for pos, d in result.items() if pos < precision}
+        return result
+
+    a_low, b_low = min(a), min(b)
+    offset = a_low + b_low + shift
+    a_value = _pack_digits(a, p, a_low)
+    b_value = _pack_digits(b, p, b_low)
+
+    if precision is not None:
+        limit = precision - offset
+        if limit <= 0:
+            return {}
+        modulus = p**limit
+        product = (a_value % modulus) * (b_value % modulus) % modulus
+    else:
+        product = a_value * b_value
+
+    return _unpack_digits(product, p, offset)
+
+
+def ceil_log(m: int, base: int) -> int:
+    """Smallest k >= 0 with base^k >= m, using integer arithmetic only."""
+    if m <= 1:
+        return 0
+    if base == 2:
+        return (m - 1).bit_length()
+    k, power = 0, 1
+    while power < m:
+        power *= base
+        k += 1
+    return k
+
+
 class Divisor:
     """
     Represents a prime divisor in a ring.
+
+    Divisors are identified by name: they compare equal and hash alike
+    whenever their names agree, so they can key dictionaries and caches.
     """
 
+    __slots__ = ("_name",)
+
     def __init__(self, name: str):
         """
         Initialize a prime divisor.
@@ -143,7 +436,30 @@ class Divisor:
         Args:
             name: Name/identifier of the divisor
         """
-        self.name = name
+        object.__setattr__(self, "_name", name)
+
+    @property
+    def name(self) -> str:
+        """Name/identifier of the divisor."""
+        return self._name
+
+    def __setattr__(self, key, value):
+        raise AttributeError("Divisor is immutable")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Divisor):
+            return NotImplemented
+        return self._name == other._name
+
+    def __hash__(self) -> int:
+        return hash(("Divisor", self._name))
+
+    def __reduce__(self):
+        # Rebuild through __init__; the default protocol would call __setattr__
+        return (Divisor, (self._name,))
+
+    def __repr__(self) -> str:
+        return f"Divisor({self._name!r})"
 
     def __str__(self) -> str:
         """String representation of the divisor."""
@@ -153,6 +469,11 @@ class Divisor:
 class QDivisor:
     """
     Represents a Q-divisor (sum of prime divisors with rational coefficients).
+
+    Q-divisors are immutable: components are stored in canonical form (sorted
+    by divisor name, zero coefficients dropped) behind a read-only mapping, and
+    equal divisors hash alike. Derived invariants (threshold, epsilon values,
+    complexity bound) are computed on first access and memoized.
     """
 
     def __init__(self, components: Dict[Divisor, Fraction]):
@@ -162,34 +483,106 @@ class QDivisor:
         Args:
             components: Dictionary mapping prime divisors to rational coefficients
         """
-        self.components = components
+        canonical = {
+            div: Fraction(coef)
+            for div, coef in sorted(components.items(), key=lambda item: item[0].name)
+            if coef != 0
+        }
+        object.__setattr__(self, "components", MappingProxyType(canonical))
+        object.__setattr__(self, "_key", tuple(canonical.items()))
+        object.__setattr__(self, "_invariants", {})
+
+    def __setattr__(self, key, value):
+        raise AttributeError("QDivisor is immutable")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, QDivisor):
+            return NotImplemented
+        return self._key == other._key
+
+    def __hash__(self) -> int:
+        return hash(("QDivisor", self._key))
+
+    def __reduce__(self):
+        # Rebuild from plain components: read-only mappings cannot be pickled,
+        # and memoized invariants are recomputed on demand
+        return (QDivisor, (dict(self.components),))
+
+    def __repr__(self) -> str:
+        return f"QDivisor({dict(self.components)!r})"
+
+    def _memoized(self, key, compute):
+        """Return the invariant stored under key, computing it on first access."""
+        try:
+            return self._invariants[key]
+        except KeyError:
+            value = self._invariants[key] = compute()
+            return value
 
     def __add__(self, other: "QDivisor") -> "QDivisor":
         """Add two Q-divisors."""
-        result = self.components.copy()
+        result = dict(self.components)
         for div, coef in other.components.items():
             result[div] = result.get(div, Fraction(0)) + coef
         return QDivisor(result)
 
     def compute_threshold(self) -> int:
         """Compute the valuation threshold t_Δ for this divisor."""
+        return self._memoized("threshold", self._compute_threshold)
+
+    def _compute_threshold(self) -> int:
+        """Uncached t_Δ = min ceil(m/n) over coefficients n/m, in integers."""
         if not self.components:
             return float("inf")
 
-        return math.ceil(min(1 / coef for coef in self.components.values()))
+        return min(-(-m // n) for n, m in self.integer_pairs())
+
+    def integer_pairs(self) -> Tuple[Tuple[int, int], ...]:
+        """Coefficients as reduced (numerator, denominator) pairs of ints."""
+        return self._memoized(
+            "pairs",
+            lambda: tuple(
+                (coef.numerator, coef.denominator)
+                for coef in self.components.values()
+            ),
+        )
+
+    def common_denominator(self) -> Tuple[Tuple[int, ...], int]:
+        """
+        Coefficients over their least common denominator.
+
+        Returns:
+            Tuple (numerators, L) with coefficient i equal to numerators[i] / L
+        """
+        return self._memoized("common_denominator", self._compute_common_denominator)
+
+    def _compute_common_denominator(self) -> Tuple[Tuple[int, ...], int]:
+        """Uncached common_denominator."""
+        lcm = 1
+        for _, m in self.integer_pairs():
+            lcm = lcm * m // math.gcd(lcm, m)
+        return tuple(n * (lcm // m) for n, m in self.integer_pairs()), lcm
 
     def compute_epsilon_values(self) -> Dict[Divisor, float]:
-        """Compute epsilon values for each component."""
+        """Compute epsilon values for each component (as a read-only mapping)."""
+        return self._memoized("epsilons", self._compute_epsilon_values)
+
+    def _compute_epsilon_values(self) -> Dict[Divisor, float]:
+        """Uncached epsilon values."""
+        base = self.p if hasattr(self, "p") else 2
         result = {}
-        for div, coef in self.components.items():
-            n, m = coef.numerator, coef.denominator
-            m_log = math.ceil(math.log(m, self.p if hasattr(self, "p") else 2))
-            epsilon = n / (m * pow(self.p if hasattr(self, "p") else 2, m_log))
-            result[div] = epsilon
-        return result
+        for div, (n, m) in zip(self.components, self.integer_pairs()):
+            # n / (m · base^ceil(log_base m)), a single correctly rounded division
+            result[div] = n / (m * base ** ceil_log(m, base))
+        return MappingProxyType(result)
 
     def compute_weights(self, position: int, p: int) -> float:
-        """Compute the weight w_i(Δ) for a specific position."""
+        """
+        Compute the weight w_i(Δ) for a specific position.
+
+        Only the epsilon values are memoized, so the memo stays bounded;
+        divisor_weight_vector caches whole weight vectors.
+        """
         epsilons = self.compute_epsilon_values()
         return sum(
             coef * pow(p, -position * epsilons[div])
@@ -198,18 +591,34 @@ class QDivisor:
 
     def compute_complexity_bound(self) -> float:
         """Compute the complexity bound C_Δ."""
-        result = 0
-        coeffs = list(self.components.values())
-        for i, c_i in enumerate(coeffs):
-            n_i, m_i = c_i.numerator, c_i.denominator
-            delta_i = sum(
-                Fraction(c_j.numerator, c_j.denominator)
-                * math.gcd(m_i, c_j.denominator)
-                / m_i
-                for c_j in coeffs
+        return self._memoized("complexity_bound", self._compute_complexity_bound)
+
+    def _compute_complexity_bound(self) -> float:
+        """Uncached C_Δ, rounded once from the exact value."""
+        return float(self.exact_complexity_bound())
+
+    def exact_complexity_bound(self) -> Fraction:
+        """
+        The complexity bound C_Δ = Σ_i c_i·(1 + Σ_j c_j·gcd(m_i, m_j)/m_i) as an
+        exact rational.
+
+        With c_i = a_i / L over the common denominator L this is
+        Σ_i a_i·(L·m_i + Σ_j a_j·gcd(m_i, m_j))·(L/m_i) / L³, evaluated in
+        integers only.
+        """
+        return self._memoized("exact_complexity_bound", self._compute_exact_bound)
+
+    def _compute_exact_bound(self) -> Fraction:
+        """Uncached exact_complexity_bound; O(k²) integer operations."""
+        numerators, lcm = self.common_denominator()
+        denominators = [m for _, m in self.integer_pairs()]
+        total = 0
+        for a_i, m_i in zip(numerators, denominators):
+            cross = sum(
+                a_j * math.gcd(m_i, m_j) for a_j, m_j in zip(numerators, denominators)
             )
-            result += float(c_i * (1 + delta_i))
-        return result
+            total += a_i * (lcm * m_i + cross) * (lcm // m_i)
+        return Fraction(total, lcm**3)
 
     def __str__(self) -> str:
         """String representation of the Q-divisor."""
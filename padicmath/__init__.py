@@ -8,7 +8,13 @@ This library provides tools for mathematical research on p-adic numbers and test
 __version__ = "0.1.0"
 
 # Core classes
-from .core.padic import PAdicNumber, BinaryPAdicNumber
+from .core.padic import (
+    PAdicNumber,
+    BinaryPAdicNumber,
+    IntPAdicNumber,
+    precision_context,
+    get_default_precision
+)
 
 # Verification tools
 from .verification.verifier import (
@@ -16,41 +22,71 @@ from .verification.verifier import (
     VerificationComponent,
     VerificationProblem
 )
+from .verification.perfectoid import verify_perfectoid_predicates
 
 # Utility functions
 from .utils.helpers import (
     rational_to_padic,
     rational_to_binary_padic,
+    rational_to_padic_batch,
     padic_valuation,
     is_in_test_ideal,
+    is_in_test_ideal_batch,
     compare_test_ideals,
+    MembershipThresholds,
     generate_test_cases,
+    iter_test_cases,
+    count_test_cases,
     perfectoid_factorization_predicate,
+    perfectoid_factorization_batch,
+    perfectoid_lookup_table,
+    perfectoid_factorization_packed,
+    PerfectoidAutomaton,
+    classify_perfectoid_patterns,
     test_subadditivity_counterexamples,
     verify_binary_predicate_properties
 )
 
+# Parallel sweeps
+from .utils.sweep import sweep_test_ideals, sweep_compare_test_ideals
+
 # Expose key functionality at the top level
 __all__ = [
     # Core classes
     "PAdicNumber",
     "BinaryPAdicNumber",
+    "IntPAdicNumber",
+    "precision_context",
+    "get_default_precision",
     
     # Verification
     "BinaryPAdicVerifier",
     "VerificationComponent",
     "VerificationProblem",
+    "verify_perfectoid_predicates",
     
     # Utility functions
     "rational_to_padic",
     "rational_to_binary_padic",
+    "rational_to_padic_batch",
     "padic_valuation",
     "is_in_test_ideal",
+    "is_in_test_ideal_batch",
     "compare_test_ideals",
+    "MembershipThresholds",
     "generate_test_cases",
+    "iter_test_cases",
+    "count_test_cases",
+    "sweep_test_ideals",
+    "sweep_compare_test_ideals",
     
     # Mathematical testing functions
     "perfectoid_factorization_predicate",
+    "perfectoid_factorization_batch",
+    "perfectoid_lookup_table",
+    "perfectoid_factorization_packed",
+    "PerfectoidAutomaton",
+    "classify_perfectoid_patterns",
     "test_subadditivity_counterexamples",
     "verify_binary_predicate_properties"
 ]
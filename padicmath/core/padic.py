@@ -5,8 +5,52 @@ This module provides the fundamental classes and functions for working with p-ad
 and performing operations in the p-adic setting.
 """
 from __future__ import annotations
+from contextlib import contextmanager
+from contextvars import ContextVar
 import numpy as np
-from typing import List, Union, Optional, Tuple
+from typing import List, Union, Optional, Tuple, Iterator
+
+
+# Default number of digits kept by arithmetic results (None means unbounded)
+_default_precision: ContextVar[Optional[int]] = ContextVar("padicmath_precision", default=None)
+
+
+def get_default_precision() -> Optional[int]:
+    """Return the precision applied to arithmetic results in the current context."""
+    return _default_precision.get()
+
+
+@contextmanager
+def precision_context(precision: Optional[int]) -> Iterator[None]:
+    """
+    Cap the precision of all p-adic arithmetic inside a with-block.
+    
+    Sums and products keep at most `precision` digits, so memory and time
+    stay bounded during repeated arithmetic.
+    
+    The context applies to PAdicNumber arithmetic only. padiclib has its
+    own, independent padiclib.precision_context for PadicElement; neither
+    affects the other.
+    
+    Args:
+        precision: Number of digits to keep, or None for unbounded arithmetic
+    """
+    if precision is not None and precision < 0:
+        raise ValueError("Precision must be non-negative")
+    token = _default_precision.set(precision)
+    try:
+        yield
+    finally:
+        _default_precision.reset(token)
+
+
+def _result_precision(*precisions: Optional[int]) -> Optional[int]:
+    """Smallest of the given precisions and the context default, ignoring None."""
+    known = [n for n in precisions if n is not None]
+    default = _default_precision.get()
+    if default is not None:
+        known.append(default)
+    return min(known) if known else None
 
 
 class PAdicNumber:
@@ -17,7 +61,8 @@ class PAdicNumber:
     The binary representation is particularly useful for working with test ideals.
     """
     
-    def __init__(self, digits: List[int], prime: int, valuation: int = 0):
+    def __init__(self, digits: List[int], prime: int, valuation: int = 0,
+                 precision: Optional[int] = None):
         """
         Initialize a p-adic number.
         
@@ -25,10 +70,15 @@ class PAdicNumber:
             digits: List of digits in p-adic expansion (least significant first)
             prime: The prime p for the p-adic system
             valuation: The p-adic valuation (power of p that divides the number)
+            precision: If given, at most this many digits are kept, here and in
+                arithmetic results (None means unbounded)
         """
+        if precision is not None and len(digits) > precision:
+            digits = digits[:precision]
         self.digits = digits
         self.prime = prime
         self.valuation = valuation
+        self.precision = precision
         self._validate()
     
     def _validate(self):
@@ -98,9 +148,16 @@ class PAdicNumber:
         return f"PAdicNumber(digits={self.digits}, prime={self.prime}, valuation={self.valuation})"
     
     def __add__(self, other: PAdicNumber) -> PAdicNumber:
-        """Add two p-adic numbers."""
+        """
+        Add two p-adic numbers.
+        
+        The result keeps at most the smaller of the operand precisions and
+        the precision_context default.
+        """
         if self.prime != other.prime:
             raise ValueError("Cannot add p-adic numbers with different primes")
+        
+        precision = _result_precision(self.precision, other.precision)
             
         # Ensure both have the same length by padding with zeros
         min_val = min(self.valuation, other.valuation)
@@ -118,7 +175,11 @@ class PAdicNumber:
         result_digits = []
         carry = 0
         
-        for i in range(max(len(s_digits), len(o_digits))):
+        length = max(len(s_digits), len(o_digits))
+        if precision is not None:
+            length = min(length, precision)
+            
+        for i in range(length):
             s_digit = s_digits[i] if i < len(s_digits) else 0
             o_digit = o_digits[i] if i < len(o_digits) else 0
             
@@ -129,24 +190,33 @@ class PAdicNumber:
             result_digits.append(digit)
             
         # Add any remaining carry
-        if carry > 0:
+        if carry > 0 and (precision is None or len(result_digits) < precision):
             result_digits.append(carry)
             
-        return PAdicNumber(result_digits, self.prime, min_val)
+        return PAdicNumber(result_digits, self.prime, min_val, precision)
     
     def __mul__(self, other: PAdicNumber) -> PAdicNumber:
-        """Multiply two p-adic numbers."""
+        """
+        Multiply two p-adic numbers.
+        
+        The result keeps at most the smaller of the operand precisions and
+        the precision_context default; digits beyond it are never computed.
+        """
         if self.prime != other.prime:
             raise ValueError("Cannot multiply p-adic numbers with different primes")
             
         # Resulting valuation is the sum of the valuations
         result_valuation = self.valuation + other.valuation
+        precision = _result_precision(self.precision, other.precision)
         
         # Perform digit-by-digit multiplication
-        result_digits = [0] * (len(self.digits) + len(other.digits))
+        length = len(self.digits) + len(other.digits)
+        if precision is not None:
+            length = min(length, precision)
+        result_digits = [0] * length
         
-        for i, d1 in enumerate(self.digits):
-            for j, d2 in enumerate(other.digits):
+        for i, d1 in enumerate(self.digits[:length]):
+            for j, d2 in enumerate(other.digits[:length - i]):
                 index = i + j
                 result_digits[index] += d1 * d2
                 
@@ -161,7 +231,7 @@ class PAdicNumber:
         while result_digits and result_digits[-1] == 0:
             result_digits.pop()
             
-        return PAdicNumber(result_digits, self.prime, result_valuation)
+        return PAdicNumber(result_digits, self.prime, result_valuation, precision)
         
 
 class BinaryPAdicNumber(PAdicNumber):
@@ -172,14 +242,60 @@ class BinaryPAdicNumber(PAdicNumber):
     and test ideal theory.
     """
     
-    def __init__(self, digits: List[int], prime: int, valuation: int = 0):
+    def __init__(self, digits: List[int], prime: int, valuation: int = 0,
+                 precision: Optional[int] = None):
         """Initialize a binary p-adic number."""
-        super().__init__(digits, prime, valuation)
-        self.binary_digits = self._to_binary()
+        super().__init__(digits, prime, valuation, precision)
+        self.binary_mask, self.binary_length = self._to_binary()
+        self._binary_digits = None
+    
+    @classmethod
+    def from_mask(cls, mask: int, length: int, prime: int, valuation: int = 0) -> BinaryPAdicNumber:
+        """
+        Create a binary p-adic number directly from a packed binary pattern.
+        
+        Args:
+            mask: Bitmask with bit i set iff digit i is non-zero
+            length: Number of digits in the pattern
+            prime: The prime p
+            valuation: The p-adic valuation
+            
+        Returns:
+            BinaryPAdicNumber whose non-zero digits are all 1
+        """
+        if mask < 0 or mask >> length:
+            raise ValueError(f"Mask does not fit in {length} binary digits")
+        return cls(_mask_to_bits(mask, length), prime, valuation)
         
-    def _to_binary(self) -> List[int]:
-        """Convert p-adic digits to binary digits (0 or 1)."""
-        return [1 if digit > 0 else 0 for digit in self.digits]
+    def _to_binary(self) -> Tuple[int, int]:
+        """Pack the p-adic digits into a bitmask (bit i set iff digit i is non-zero)."""
+        bits = ''.join('1' if digit > 0 else '0' for digit in reversed(self.digits))
+        return (int(bits, 2) if bits else 0), len(bits)
+    
+    @property
+    def binary_digits(self) -> List[int]:
+        """Binary digits (0 or 1) as a list, unpacked from the bitmask on first access."""
+        if self._binary_digits is None:
+            self._binary_digits = _mask_to_bits(self.binary_mask, self.binary_length)
+        return self._binary_digits
+    
+    def binary_weight(self) -> int:
+        """Number of non-zero digits (popcount of the bitmask)."""
+        return _popcount(self.binary_mask)
+    
+    def nonzero_positions(self) -> List[int]:
+        """Positions of the non-zero digits in increasing order."""
+        return self.mask_positions(self.binary_mask)
+    
+    @staticmethod
+    def mask_positions(mask: int) -> List[int]:
+        """Positions of the set bits of a binary mask in increasing order."""
+        positions = []
+        while mask:
+            low = mask & -mask
+            positions.append(low.bit_length() - 1)
+            mask ^= low
+        return positions
     
     def binary_predicate(self, coefficient: float) -> bool:
         """
@@ -195,11 +311,11 @@ class BinaryPAdicNumber(PAdicNumber):
             raise ValueError("Coefficient must be in range (0,1)")
             
         # Get truncation index based on coefficient
-        trunc_idx = int(len(self.binary_digits) * coefficient)
+        trunc_idx = int(self.binary_length * coefficient)
         
         # Test ideal membership is determined by checking if any
         # binary digit up to the truncation index is 1
-        return any(digit == 1 for digit in self.binary_digits[:trunc_idx])
+        return self.binary_mask & ((1 << trunc_idx) - 1) != 0
     
     def perfect_factorization_predicate(self) -> bool:
         """
@@ -212,17 +328,18 @@ class BinaryPAdicNumber(PAdicNumber):
         """
         # Implementation of perfectoid factorization logic
         # Look for specific binary patterns
-        if not self.binary_digits:
+        if not self.binary_length:
             return False
             
         # Check for single-digit patterns (base cases)
-        if sum(self.binary_digits) == 1:
+        weight = self.binary_weight()
+        if weight == 1:
             return True
             
         # Check for two-digit patterns
-        if sum(self.binary_digits) == 2:
+        if weight == 2:
             # Find positions of the two 1's
-            positions = [i for i, digit in enumerate(self.binary_digits) if digit == 1]
+            positions = self.nonzero_positions()
             # Check if they are adjacent or have a specific separation
             return abs(positions[0] - positions[1]) <= 2
             
@@ -244,8 +361,219 @@ class BinaryPAdicNumber(PAdicNumber):
     
     def __str__(self) -> str:
         """String representation of binary p-adic number."""
-        if not self.binary_digits:
+        if not self.binary_length:
             return "0"
             
         binary_str = ''.join(str(d) for d in reversed(self.binary_digits))
-        return f"{binary_str} (binary p-adic, base {self.prime}) × {self.prime}^{self.valuation}" 
\ No newline at end of file
+        return f"{binary_str} (binary p-adic, base {self.prime}) × {self.prime}^{self.valuation}"
+
+
+def _popcount(mask: int) -> int:
+    """Count the set bits of a non-negative integer."""
+    return bin(mask).count('1')
+
+
+def _mask_to_bits(mask: int, length: int) -> List[int]:
+    """Unpack the low `length` bits of a mask into a list (least significant first)."""
+    bits = bin(mask)[2:].zfill(length)[::-1]
+    return [1 if bit == '1' else 0 for bit in bits[:length]]
+
+
+def _valuation(n: int, prime: int) -> int:
+    """Return the p-adic valuation of a non-zero integer (0 for n = 0)."""
+    n = abs(n)
+    val = 0
+    while n > 0 and n % prime == 0:
+        val += 1
+        n //= prime
+    return val
+
+
+def _int_to_digits(value: int, prime: int, length: int) -> List[int]:
+    """
+    Expand a non-negative integer into exactly `length` base-p digits.
+
+    Uses divide-and-conquer splitting on p^(length/2) so that large expansions
+    cost a logarithmic number of bignum divisions per level instead of one
+    division per digit.
+
+    Args:
+        value: Integer in the range [0, p^length)
+        prime: The prime p
+        length: Number of digits to produce (least significant first)
+
+    Returns:
+        List of digits in [0, p-1]
+    """
+    if length <= 64:
+        digits = []
+        for _ in range(length):
+            value, digit = divmod(value, prime)
+            digits.append(digit)
+        return digits
+
+    half = length // 2
+    high, low = divmod(value, prime ** half)
+    return _int_to_digits(low, prime, half) + _int_to_digits(high, prime, length - half)
+
+
+def _digits_to_int(digits: List[int], prime: int) -> int:
+    """Pack base-p digits (least significant first) into a single integer."""
+    if len(digits) <= 64:
+        value = 0
+        for digit in reversed(digits):
+            value = value * prime + digit
+        return value
+
+    half = len(digits) // 2
+    return (_digits_to_int(digits[:half], prime)
+            + _digits_to_int(digits[half:], prime) * prime ** half)
+
+
+class IntPAdicNumber(PAdicNumber):
+    """
+    Integer-backed p-adic number with bounded precision.
+
+    Instead of a digit list, the digit expansion is stored as a single Python
+    integer modulo p^precision, so addition and multiplication run as native
+    bignum operations. The number represented is the same as for PAdicNumber:
+    (sum of digits[i]·p^i) × p^valuation. The digit list is only materialised
+    when `digits` (or anything built on it, such as `to_binary_padic`) is
+    accessed, which keeps the class usable wherever a PAdicNumber is expected.
+    """
+
+    def __init__(self, unit: int, prime: int, valuation: int = 0, precision: int = 10):
+        """
+        Initialize an integer-backed p-adic number.
+
+        Args:
+            unit: Integer encoding the digit expansion (reduced modulo p^precision)
+            prime: The prime p for the p-adic system
+            valuation: The p-adic valuation (power of p that divides the number)
+            precision: Number of p-adic digits that are known
+        """
+        if precision < 0:
+            raise ValueError("Precision must be non-negative")
+        self.prime = prime
+        self.valuation = valuation
+        self.precision = precision
+        self.modulus = prime ** precision
+        self.unit = unit % self.modulus
+        self._digits = None
+
+    @property
+    def digits(self) -> List[int]:
+        """Digit list view of the expansion (least significant first)."""
+        if self._digits is None:
+            self._digits = _int_to_digits(self.unit, self.prime, self.precision)
+        return self._digits
+
+    @digits.setter
+    def digits(self, digits: List[int]):
+        """Replace the expansion with an explicit digit list."""
+        if not all(0 <= d < self.prime for d in digits):
+            raise ValueError(f"All digits must be in the range [0, {self.prime-1}]")
+        self.precision = len(digits)
+        self.modulus = self.prime ** self.precision
+        self.unit = _digits_to_int(digits, self.prime)
+        self._digits = list(digits)
+
+    @classmethod
+    def from_rational(cls, num: int, den: int = 1, prime: int = 5, precision: int = 10) -> IntPAdicNumber:
+        """
+        Convert a rational number to its integer-backed p-adic representation.
+
+        Produces the same digits and valuation as PAdicNumber.from_rational.
+
+        Args:
+            num: Numerator
+            den: Denominator
+            prime: The prime p
+            precision: Number of p-adic digits to compute
+
+        Returns:
+            IntPAdicNumber representation
+        """
+        valuation = _valuation(num, prime) - _valuation(den, prime)
+        modulus = prime ** precision
+
+        x = num * pow(den, -1, modulus) if den % prime != 0 else 0
+        if valuation < 0:
+            x = x * pow(prime, -valuation, modulus)
+            valuation = 0
+
+        return cls(x, prime, valuation, precision)
+
+    @classmethod
+    def from_padic(cls, padic: PAdicNumber) -> IntPAdicNumber:
+        """Convert a list-based PAdicNumber, keeping all of its digits."""
+        if isinstance(padic, IntPAdicNumber):
+            return padic
+        return cls(_digits_to_int(padic.digits, padic.prime), padic.prime,
+                   padic.valuation, len(padic.digits))
+
+    def to_padic(self) -> PAdicNumber:
+        """Convert to a list-based PAdicNumber."""
+        return PAdicNumber(list(self.digits), self.prime, self.valuation)
+
+    def _coerce(self, other: PAdicNumber) -> IntPAdicNumber:
+        """Bring another p-adic number into the integer-backed representation."""
+        if not isinstance(other, PAdicNumber):
+            return NotImplemented
+        if self.prime != other.prime:
+            raise ValueError("Cannot combine p-adic numbers with different primes")
+        return IntPAdicNumber.from_padic(other)
+
+    def __add__(self, other: PAdicNumber) -> IntPAdicNumber:
+        """
+        Add two p-adic numbers.
+
+        The result is known up to the smaller absolute precision
+        (valuation + precision) of the two operands.
+        """
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return NotImplemented
+
+        p = self.prime
+        min_val = min(self.valuation, other.valuation)
+        abs_precision = min(self.valuation + self.precision,
+                            other.valuation + other.precision)
+
+        precision = _result_precision(max(abs_precision - min_val, 0))
+        total = (self.unit * p ** (self.valuation - min_val)
+                 + other.unit * p ** (other.valuation - min_val))
+        return IntPAdicNumber(total, p, min_val, precision)
+
+    __radd__ = __add__
+
+    def __mul__(self, other: PAdicNumber) -> IntPAdicNumber:
+        """
+        Multiply two p-adic numbers.
+
+        Valuations add and the expansion is known up to the smaller of the two
+        precisions.
+        """
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return NotImplemented
+
+        precision = _result_precision(self.precision, other.precision)
+        return IntPAdicNumber(self.unit * other.unit, self.prime,
+                              self.valuation + other.valuation, precision)
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IntPAdicNumber):
+            return NotImplemented
+        return (self.prime == other.prime and self.valuation == other.valuation
+                and self.precision == other.precision and self.unit == other.unit)
+
+    def __hash__(self) -> int:
+        return hash((self.unit, self.prime, self.valuation, self.precision))
+
+    def __repr__(self) -> str:
+        return (f"IntPAdicNumber(unit={self.unit}, prime={self.prime}, "
+                f"valuation={self.valuation}, precision={self.precision})")
+
@@ -1,6 +1,8 @@
 """
 Unit tests for the helper utilities in the padicmath package.
 """
+import os
+import tempfile
 import unittest
 import numpy as np
 from padicmath import (
@@ -8,11 +10,23 @@ from padicmath import (
     BinaryPAdicNumber,
     rational_to_padic, 
     rational_to_binary_padic,
+    rational_to_padic_batch,
     padic_valuation,
     is_in_test_ideal,
+    is_in_test_ideal_batch,
     compare_test_ideals, 
-    generate_test_cases
+    MembershipThresholds,
+    generate_test_cases,
+    iter_test_cases,
+    count_test_cases,
+    perfectoid_factorization_predicate,
+    perfectoid_factorization_batch,
+    perfectoid_lookup_table,
+    perfectoid_factorization_packed,
+    PerfectoidAutomaton,
+    classify_perfectoid_patterns
 )
+from padicmath.utils.helpers import PERFECTOID_TABLE_WIDTH, _perfectoid_pattern_rule, _perfectoid_tables
 
 
 class TestHelperFunctions(unittest.TestCase):
@@ -49,6 +63,30 @@ class TestHelperFunctions(unittest.TestCase):
         self.assertEqual(bin_padic.binary_digits[0], 1)
         self.assertEqual(bin_padic.binary_digits[1], 1)
     
+    def test_rational_to_padic_batch(self):
+        """Test vectorized conversion of many rationals at once."""
+        cases = generate_test_cases(prime=5, max_num=12)
+        nums = [num for num, _ in cases]
+        dens = [den for _, den in cases]
+        
+        # precision=10 runs in int64, precision=40 uses the bignum fallback
+        for precision in (10, 40):
+            digits, valuations = rational_to_padic_batch(nums, dens, prime=5, precision=precision)
+            self.assertEqual(digits.shape, (len(cases), precision))
+            self.assertEqual(digits.dtype, np.uint8)
+            for i, (num, den) in enumerate(cases):
+                expected = PAdicNumber.from_rational(num, den, prime=5, precision=precision)
+                self.assertEqual(digits[i].tolist(), expected.digits)
+                self.assertEqual(valuations[i], expected.valuation)
+        
+        # Denominators default to 1
+        digits, valuations = rational_to_padic_batch([6, 25], prime=5, precision=3)
+        self.assertEqual(digits.tolist(), [[1, 1, 0], [0, 0, 1]])
+        self.assertEqual(valuations.tolist(), [0, 2])
+        
+        with self.assertRaises(ValueError):
+            rational_to_padic_batch([1, 2], [1, 0])
+    
     def test_padic_valuation(self):
         """Test p-adic valuation calculation."""
         # Test basic cases
@@ -85,6 +123,35 @@ class TestHelperFunctions(unittest.TestCase):
         except TypeError:
             pass  # This is the expected behavior
     
+    def test_is_in_test_ideal_batch(self):
+        """Test batch membership against the scalar membership check."""
+        elements = generate_test_cases(prime=5, max_num=8) + [
+            (1, 5),
+            PAdicNumber([1, 0, 0], prime=5),
+            BinaryPAdicNumber([0, 1, 0], prime=5),
+            BinaryPAdicNumber([0, 0, 0, 3, 0, 1], prime=5)
+        ]
+        coefficients = [0.1, 0.2, 0.3, 0.5, 0.7, 0.95]
+        
+        membership = is_in_test_ideal_batch(elements, coefficients, prime=5)
+        self.assertEqual(membership.shape, (len(elements), len(coefficients)))
+        for i, element in enumerate(elements):
+            for j, coefficient in enumerate(coefficients):
+                self.assertEqual(membership[i, j], is_in_test_ideal(element, coefficient, prime=5))
+        
+        # Digit matrices give the same answer as the tuples they came from
+        cases = generate_test_cases(prime=7, max_num=6)
+        digits, _ = rational_to_padic_batch([n for n, _ in cases], [d for _, d in cases], prime=7)
+        np.testing.assert_array_equal(
+            is_in_test_ideal_batch(digits, coefficients, prime=7),
+            is_in_test_ideal_batch(cases, coefficients, prime=7)
+        )
+        
+        with self.assertRaises(ValueError):
+            is_in_test_ideal_batch(elements, [0.5, 1.0])
+        with self.assertRaises(TypeError):
+            is_in_test_ideal_batch(["not a valid input"], [0.5])
+    
     def test_compare_test_ideals(self):
         """Test comparison of test ideals with different coefficients."""
         # Create some test elements
@@ -123,6 +190,31 @@ class TestHelperFunctions(unittest.TestCase):
         with self.assertRaises(ValueError):
             compare_test_ideals(0.5, 1, test_elements)
     
+    def test_membership_thresholds(self):
+        """Test cached threshold comparisons against the element-wise comparison."""
+        test_elements = generate_test_cases(prime=5, max_num=6) + [(1, 5), PAdicNumber([0, 1, 0], prime=5)]
+        thresholds = MembershipThresholds(test_elements, prime=5)
+        self.assertEqual(len(thresholds), len(test_elements))
+        
+        coefficients = [0.15, 0.3, 0.45, 0.6, 0.85]
+        for c1 in coefficients:
+            for c2 in coefficients:
+                expected = compare_test_ideals(c1, c2, test_elements, prime=5)
+                self.assertEqual(compare_test_ideals(c1, c2, thresholds), expected)
+        
+        containment = thresholds.containment_matrix(coefficients)
+        self.assertEqual(containment.shape, (5, 5))
+        for i, c1 in enumerate(coefficients):
+            for j, c2 in enumerate(coefficients):
+                expected = compare_test_ideals(c1, c2, test_elements)["first_contains_second"]
+                self.assertEqual(containment[i, j], expected)
+        
+        # Larger coefficients give larger test ideals under the binary predicate
+        self.assertTrue(containment[-1, 0])
+        
+        with self.assertRaises(ValueError):
+            thresholds.membership(1.5)
+    
     def test_generate_test_cases(self):
         """Test generation of test cases."""
         # Generate only integers
@@ -156,6 +248,124 @@ class TestHelperFunctions(unittest.TestCase):
             if den > 1:
                 self.assertEqual(np.gcd(abs(num), den), 1)
 
+    
+    def test_iter_test_cases(self):
+        """Test the streaming generator against the materialised test cases."""
+        for include_fractions in (False, True):
+            test_cases = generate_test_cases(prime=5, max_num=12, include_fractions=include_fractions)
+            self.assertEqual(list(iter_test_cases(5, 12, include_fractions)), test_cases)
+            self.assertEqual(count_test_cases(5, 12, include_fractions), len(test_cases))
+            
+            # Resuming from an offset continues the same stream
+            for offset in (0, 5, 24, 25, 100, len(test_cases)):
+                self.assertEqual(list(iter_test_cases(5, 12, include_fractions, offset=offset)),
+                                 test_cases[offset:])
+        
+        # Chunked output
+        chunks = list(iter_test_cases(5, 12, chunk_size=50))
+        self.assertTrue(all(len(chunk) <= 50 for chunk in chunks))
+        self.assertEqual([case for chunk in chunks for case in chunk], test_cases)
+        
+        # Every fraction is reduced and none is repeated within the fraction section
+        fractions = list(iter_test_cases(5, 30, offset=60))
+        self.assertEqual(len(fractions), len(set(fractions)))
+        for num, den in fractions:
+            self.assertEqual(np.gcd(abs(num), den), 1)
+        
+        with self.assertRaises(ValueError):
+            next(iter_test_cases(5, 3, chunk_size=0))
+    
+    def test_perfectoid_lookup_table(self):
+        """Test table lookups against the pattern rules."""
+        width = 10
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "perfectoid.npy")
+            table = perfectoid_lookup_table(width, path)
+            self.assertTrue(os.path.exists(path))
+            np.testing.assert_array_equal(np.load(path), table)
+        self.assertEqual(table.nbytes, (1 << width) // 8)
+        self.assertIs(perfectoid_lookup_table(width), table)
+        
+        masks = np.arange(1 << width)
+        values = perfectoid_factorization_batch(masks, width=width)
+        expected = [bool(m) and _perfectoid_pattern_rule(BinaryPAdicNumber.mask_positions(m)) for m in range(1 << width)]
+        self.assertEqual(values.tolist(), expected)
+        
+        # The scalar predicate agrees inside and beyond the table width
+        for digits in ([1], [1, 0, 1], [1, 1, 0, 0, 0, 0, 1, 1], [0, 1] * 8, [1] + [0] * 20 + [1]):
+            element = BinaryPAdicNumber(digits, 5)
+            mask = element.binary_mask
+            self.assertEqual(perfectoid_factorization_predicate(element),
+                             _perfectoid_pattern_rule(BinaryPAdicNumber.mask_positions(mask)))
+        
+        # The scalar predicate builds the default table on first use
+        self.assertIn(PERFECTOID_TABLE_WIDTH, _perfectoid_tables)
+        
+        # Wide patterns fall back to the rules; zero-length patterns are False
+        wide = np.array([1 << 40 | 1 << 20 | 1, 1 << 40 | 1, 3], dtype=object)
+        self.assertEqual(perfectoid_factorization_batch(wide, width=width).tolist(),
+                         [False, True, True])
+        self.assertEqual(perfectoid_factorization_batch([3, 3], [0, 2], width=width).tolist(),
+                         [False, True])
+        with self.assertRaises(ValueError):
+            perfectoid_factorization_batch([1 << width], width=width)
+
+    
+    def test_perfectoid_automaton(self):
+        """Test the streaming automaton against the pattern rules."""
+        rng = np.random.default_rng(7)
+        length = 3000
+        masks = list(range(1 << 10))
+        # Long expansions: sparse runs of nearby digits placed far apart
+        for _ in range(300):
+            mask = 0
+            for start in rng.integers(0, length - 8, size=rng.integers(1, 4)):
+                for offset in rng.integers(0, 6, size=rng.integers(1, 4)):
+                    mask |= 1 << int(start + offset)
+            masks.append(mask)
+        masks += [1 << 1000 | 1 << 2000, 1 << 1000 | 1 << 1999, sum(1 << i for i in range(1, length, 2))]
+        
+        expected = [bool(m) and _perfectoid_pattern_rule(BinaryPAdicNumber.mask_positions(m)) for m in masks]
+        streamed = [PerfectoidAutomaton.run((m >> i) & 1 for i in range(m.bit_length())) for m in masks]
+        self.assertEqual(streamed, expected)
+        self.assertEqual(expected[-3:], [True, False, True])
+        
+        packed = np.array([np.frombuffer(m.to_bytes(length // 8, "little"), dtype=np.uint8)
+                           for m in masks])
+        self.assertEqual(perfectoid_factorization_packed(packed, length).tolist(), expected)
+        with self.assertRaises(ValueError):
+            perfectoid_factorization_packed(packed, length + 8)
+
+    
+    def test_classify_perfectoid_patterns(self):
+        """Test bulk verdicts and branch histograms."""
+        width = 10
+        elements = [BinaryPAdicNumber.from_mask(m, width, 5) for m in range(1 << width)]
+        verdicts, histogram = classify_perfectoid_patterns(elements)
+        self.assertEqual(verdicts.tolist(),
+                         [perfectoid_factorization_predicate(e) for e in elements])
+        self.assertEqual(sum(histogram.values()), 1 << width)
+        self.assertEqual(histogram["single_digit"], width)
+        self.assertEqual(histogram["two_digit_gap"] + histogram["two_digit_position"]
+                         + histogram["two_digit_reject"], width * (width - 1) // 2)
+        
+        # Digit matrices give the same result; the deciding branch is reported
+        digits = np.array([
+            [0, 0, 0, 0, 0, 0, 0, 0],
+            [3, 0, 0, 0, 0, 0, 0, 0],
+            [1, 2, 0, 0, 0, 0, 0, 0],
+            [1, 0, 0, 0, 0, 1, 0, 0],
+            [0, 1, 0, 0, 0, 0, 0, 1],
+            [1, 1, 1, 0, 0, 0, 0, 0],
+            [1, 1, 0, 0, 0, 1, 1, 0],
+        ])
+        verdicts, histogram = classify_perfectoid_patterns(digits)
+        self.assertEqual(verdicts.tolist(), [False, True, True, True, False, True, True])
+        self.assertEqual({name: n for name, n in histogram.items() if n}, {
+            "empty": 1, "single_digit": 1, "two_digit_gap": 1, "two_digit_position": 1,
+            "two_digit_reject": 1, "three_digit_adjacent": 1, "four_digit_pairs": 1
+        })
+
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
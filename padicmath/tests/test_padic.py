@@ -0,0 +1,190 @@
+"""
+Unit tests for the core p-adic number classes in the padicmath package.
+"""
+import unittest
+from padicmath import (
+    PAdicNumber,
+    BinaryPAdicNumber,
+    IntPAdicNumber,
+    precision_context,
+    get_default_precision
+)
+
+
+class TestIntPAdicNumber(unittest.TestCase):
+    """Test cases for the integer-backed p-adic number engine."""
+    
+    def test_from_rational_matches_list_engine(self):
+        """Test that rational conversion agrees with PAdicNumber.from_rational."""
+        for num, den in [(1, 1), (7, 3), (-4, 7), (5, 1), (25, 3), (3, 5), (-13, 25)]:
+            expected = PAdicNumber.from_rational(num, den, prime=5, precision=12)
+            fast = IntPAdicNumber.from_rational(num, den, prime=5, precision=12)
+            self.assertEqual(fast.digits, expected.digits)
+            self.assertEqual(fast.valuation, expected.valuation)
+    
+    def test_addition_matches_list_engine(self):
+        """Test that addition agrees with the digit-list implementation."""
+        a = PAdicNumber.from_rational(7, 3, prime=5, precision=20)
+        b = PAdicNumber.from_rational(-2, 9, prime=5, precision=20)
+        expected = a + b
+        result = IntPAdicNumber.from_padic(a) + IntPAdicNumber.from_padic(b)
+        self.assertEqual(result.valuation, expected.valuation)
+        self.assertEqual(result.digits, expected.digits[:result.precision])
+    
+    def test_addition_with_different_valuations(self):
+        """Test that addition aligns valuations and tracks absolute precision."""
+        a = IntPAdicNumber(3, 5, valuation=0, precision=10)
+        b = IntPAdicNumber(2, 5, valuation=2, precision=10)
+        result = a + b
+        self.assertEqual(result.valuation, 0)
+        self.assertEqual(result.precision, 10)
+        self.assertEqual(result.digits[:3], [3, 0, 2])
+        
+        expected = PAdicNumber([3] + [0] * 9, 5) + PAdicNumber([2] + [0] * 9, 5, valuation=2)
+        self.assertEqual(result.digits, expected.digits[:10])
+    
+    def test_multiplication_matches_list_engine(self):
+        """Test that multiplication agrees with the schoolbook implementation."""
+        a = PAdicNumber.from_rational(7, 3, prime=7, precision=30)
+        b = PAdicNumber.from_rational(11, 4, prime=7, precision=30)
+        expected = a * b
+        result = IntPAdicNumber.from_padic(a) * IntPAdicNumber.from_padic(b)
+        self.assertEqual(result.valuation, expected.valuation)
+        self.assertEqual(result.precision, 30)
+        self.assertEqual(result.digits, expected.digits[:30])
+    
+    def test_large_precision_round_trip(self):
+        """Test that lazy digit expansion round-trips at high precision."""
+        x = IntPAdicNumber.from_rational(-1, 3, prime=5, precision=1000)
+        self.assertEqual(len(x.digits), 1000)
+        self.assertEqual(IntPAdicNumber.from_padic(x.to_padic()), x)
+        
+        # -1/3 * 3 = -1, whose expansion is all (p-1) digits
+        minus_one = x * IntPAdicNumber(3, 5, precision=1000)
+        self.assertEqual(set(minus_one.digits), {4})
+    
+    def test_compatibility_view(self):
+        """Test that list-based callers keep working."""
+        x = IntPAdicNumber.from_rational(6, 1, prime=5, precision=4)
+        self.assertIsInstance(x, PAdicNumber)
+        self.assertEqual(x.digits, [1, 1, 0, 0])
+        
+        binary = x.to_binary_padic()
+        self.assertIsInstance(binary, BinaryPAdicNumber)
+        self.assertEqual(binary.binary_digits, [1, 1, 0, 0])
+        
+        # Mixed arithmetic with the list-based engine
+        mixed = PAdicNumber([1, 1, 0, 0], prime=5) + x
+        self.assertEqual(mixed.digits[:2], [2, 2])
+        
+        x.digits = [4, 4]
+        self.assertEqual(x.unit, 24)
+        self.assertEqual(x.precision, 2)
+        with self.assertRaises(ValueError):
+            x.digits = [5]
+    
+    def test_different_primes(self):
+        """Test that mixing primes is rejected."""
+        with self.assertRaises(ValueError):
+            IntPAdicNumber(1, 5) + IntPAdicNumber(1, 7)
+        with self.assertRaises(ValueError):
+            IntPAdicNumber(1, 5) * IntPAdicNumber(1, 7)
+
+
+
+class TestBinaryPAdicNumber(unittest.TestCase):
+    """Test cases for the bit-packed binary p-adic representation."""
+    
+    def test_mask_packing(self):
+        """Test that digits are packed into a bitmask least significant first."""
+        bin_padic = BinaryPAdicNumber([0, 3, 0, 1, 4, 0], prime=5)
+        self.assertEqual(bin_padic.binary_mask, 0b011010)
+        self.assertEqual(bin_padic.binary_length, 6)
+        self.assertEqual(bin_padic.binary_digits, [0, 1, 0, 1, 1, 0])
+        self.assertEqual(bin_padic.binary_weight(), 3)
+        self.assertEqual(bin_padic.nonzero_positions(), [1, 3, 4])
+        
+        empty = BinaryPAdicNumber([], prime=5)
+        self.assertEqual(empty.binary_digits, [])
+        self.assertEqual(empty.nonzero_positions(), [])
+    
+    def test_from_mask(self):
+        """Test construction from a packed pattern."""
+        bin_padic = BinaryPAdicNumber.from_mask(0b1001, 6, prime=7, valuation=2)
+        self.assertEqual(bin_padic.binary_digits, [1, 0, 0, 1, 0, 0])
+        self.assertEqual(bin_padic.valuation, 2)
+        with self.assertRaises(ValueError):
+            BinaryPAdicNumber.from_mask(0b1000, 3, prime=7)
+    
+    def test_binary_predicate_matches_digit_scan(self):
+        """Test the mask-and-test predicate against a scan of the digit list."""
+        for length in range(1, 9):
+            for mask in range(1 << length):
+                bin_padic = BinaryPAdicNumber.from_mask(mask, length, prime=5)
+                for coefficient in (0.1, 0.25, 0.5, 0.75, 0.99):
+                    trunc_idx = int(length * coefficient)
+                    expected = any(bin_padic.binary_digits[:trunc_idx])
+                    self.assertEqual(bin_padic.binary_predicate(coefficient), expected)
+        
+        with self.assertRaises(ValueError):
+            BinaryPAdicNumber([1], prime=5).binary_predicate(1.0)
+    
+    def test_perfect_factorization_predicate(self):
+        """Test the perfectoid factorization predicate on small patterns."""
+        self.assertTrue(BinaryPAdicNumber([0, 0, 2], prime=5).perfect_factorization_predicate())
+        self.assertTrue(BinaryPAdicNumber([1, 0, 1], prime=5).perfect_factorization_predicate())
+        self.assertFalse(BinaryPAdicNumber([1, 0, 0, 1], prime=5).perfect_factorization_predicate())
+        self.assertFalse(BinaryPAdicNumber([1, 1, 1], prime=5).perfect_factorization_predicate())
+        self.assertFalse(BinaryPAdicNumber([], prime=5).perfect_factorization_predicate())
+
+
+
+class TestPrecision(unittest.TestCase):
+    """Test cases for precision-capped arithmetic."""
+    
+    def test_per_object_precision(self):
+        """Test that results keep the smaller operand precision."""
+        a = PAdicNumber([1, 2, 3, 4, 1, 2], prime=5, precision=4)
+        self.assertEqual(a.digits, [1, 2, 3, 4])
+        
+        b = PAdicNumber([4, 4, 4, 4, 4, 4], prime=5)
+        product = a * b
+        self.assertEqual(product.precision, 4)
+        self.assertLessEqual(len(product.digits), 4)
+        expected = (PAdicNumber(a.digits, 5) * b).digits[:4]
+        self.assertEqual(product.digits + [0] * (4 - len(product.digits)), expected)
+        
+        total = a + b
+        self.assertEqual(total.precision, 4)
+        self.assertEqual(total.digits, (PAdicNumber(a.digits, 5) + b).digits[:4])
+    
+    def test_precision_context(self):
+        """Test that the context default bounds repeated multiplication."""
+        x = PAdicNumber([2, 3, 1], prime=5)
+        self.assertIsNone(get_default_precision())
+        
+        with precision_context(8):
+            self.assertEqual(get_default_precision(), 8)
+            power = x
+            for _ in range(20):
+                power = power * x
+            self.assertLessEqual(len(power.digits), 8)
+            
+            fast = IntPAdicNumber(7, 5, precision=50) * IntPAdicNumber(3, 5, precision=50)
+            self.assertEqual(fast.precision, 8)
+        
+        self.assertIsNone(get_default_precision())
+        
+        # Uncapped powers agree on the first 8 digits
+        full = x
+        for _ in range(20):
+            full = full * x
+        self.assertEqual(power.digits, full.digits[:len(power.digits)])
+        
+        with self.assertRaises(ValueError):
+            with precision_context(-1):
+                pass
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+Unit tests for the differential verification of the perfectoid predicates.
+"""
+import unittest
+from unittest import mock
+from padicmath import (
+    BinaryPAdicNumber,
+    perfectoid_factorization_predicate,
+    verify_perfectoid_predicates
+)
+
+
+class TestPerfectoidVerification(unittest.TestCase):
+    """Test cases for the exhaustive pattern-space verifier."""
+    
+    def test_matches_scalar_enumeration(self):
+        """Test that the Gray-code sweep finds exactly the scalar disagreements."""
+        width = 11
+        disagreements = []
+        for mask in range(1 << width):
+            element = BinaryPAdicNumber.from_mask(mask, width, 5)
+            if perfectoid_factorization_predicate(element) != element.perfect_factorization_predicate():
+                disagreements.append(mask)
+        
+        for workers, low_bits in ((1, 16), (1, 4), (2, 3)):
+            result = verify_perfectoid_predicates(width, workers=workers, low_bits=low_bits,
+                                                  max_reported=None, samples=None)
+            self.assertEqual(result["reported"], disagreements)
+            self.assertEqual(result["disagreements"], len(disagreements))
+            self.assertEqual(result["validated"], 1 << width)
+            self.assertEqual(result["mismatches"], [])
+            self.assertTrue(result["confirmed"])
+            for k, counts in result["by_popcount"].items():
+                masks = [m for m in disagreements if bin(m).count("1") == k]
+                self.assertEqual(counts["disagreements"], len(masks))
+                self.assertEqual(counts["helper_only"] + counts["core_only"], len(masks))
+        
+        # The implementations agree on single digits and differ only beyond them
+        self.assertEqual(result["by_popcount"][1]["disagreements"], 0)
+        self.assertEqual(sum(c["patterns"] for c in result["by_popcount"].values()), 1 << width)
+        
+        # Truncated reports hold the globally smallest masks, across shards and Gray steps
+        for low_bits in (16, 3):
+            result = verify_perfectoid_predicates(width, 1, low_bits=low_bits, max_reported=5)
+            self.assertEqual(result["reported"], disagreements[:5])
+            self.assertGreater(result["validated"], 0)
+            self.assertTrue(result["confirmed"])
+    
+    def test_detects_wrong_reimplementation(self):
+        """Test that a sweep which no longer matches the scalar predicates is not confirmed."""
+        with mock.patch("padicmath.verification.perfectoid._core_verdicts",
+                        lambda state: state["count"] == 1):
+            result = verify_perfectoid_predicates(8, workers=1, samples=None)
+        self.assertGreater(len(result["mismatches"]), 0)
+        self.assertFalse(result["confirmed"])
+
+
+if __name__ == '__main__':
+    unittest.main()
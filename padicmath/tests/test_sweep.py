@@ -0,0 +1,51 @@
+"""
+Unit tests for the parallel test ideal sweeps in the padicmath package.
+"""
+import unittest
+from padicmath import (
+    compare_test_ideals,
+    generate_test_cases,
+    sweep_test_ideals,
+    sweep_compare_test_ideals
+)
+
+
+class TestSweep(unittest.TestCase):
+    """Test cases for the sharded sweep runner."""
+    
+    def test_matches_compare_test_ideals(self):
+        """Test that a sweep reproduces compare_test_ideals exactly."""
+        test_cases = generate_test_cases(prime=5, max_num=7)
+        expected = compare_test_ideals(0.3, 0.7, test_cases, prime=5)
+        
+        for workers in (1, 2):
+            result = sweep_compare_test_ideals(0.3, 0.7, prime=5, max_num=7, workers=workers,
+                                               shard_size=3, include_details=True)
+            self.assertEqual(result, expected)
+    
+    def test_coefficient_grid(self):
+        """Test that several pairs are swept in one pass with counts only."""
+        pairs = [(0.2, 0.4), (0.5, 0.5), (0.9, 0.1)]
+        progress = []
+        results = sweep_test_ideals(pairs, prime=7, max_num=6, include_fractions=False,
+                                    workers=1, shard_size=4,
+                                    progress=lambda done, total: progress.append((done, total)))
+        
+        test_cases = generate_test_cases(prime=7, max_num=6, include_fractions=False)
+        for (c1, c2), result in zip(pairs, results):
+            expected = compare_test_ideals(c1, c2, test_cases, prime=7)
+            for key in ("in_both", "only_in_first", "only_in_second", "in_neither",
+                        "equal", "first_contains_second", "second_contains_first"):
+                self.assertEqual(result[key], expected[key])
+            self.assertEqual(result["element_details"], [])
+        
+        self.assertEqual(progress[-1], (4, 4))
+    
+    def test_invalid_coefficients(self):
+        """Test that coefficients outside (0,1) are rejected before any work."""
+        with self.assertRaises(ValueError):
+            sweep_compare_test_ideals(0, 0.5, workers=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
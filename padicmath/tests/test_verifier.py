@@ -0,0 +1,92 @@
+"""
+Unit tests for the verification stages and the job graph runner.
+"""
+import contextlib
+import io
+import operator
+import unittest
+from unittest import mock
+from padicmath import BinaryPAdicVerifier
+from padicmath.utils.jobs import run_job_graph
+from padicmath.verification.checks import (
+    STAGE_FLAGS,
+    SCHEMA_FLAG_ALIASES,
+    check_global_consistency,
+    check_perfectoid_factorization
+)
+
+
+def _total(values):
+    return sum(values.values())
+
+
+class TestJobGraph(unittest.TestCase):
+    """Test cases for run_job_graph."""
+
+    def test_dependencies(self):
+        """Test that dependent jobs receive the results of their dependencies."""
+        jobs = {
+            "a": (operator.add, (1, 2), ()),
+            "b": (operator.mul, (3, 4), ()),
+            "total": (_total, (), ("a", "b")),
+        }
+        for workers in (1, 2):
+            results, timings = run_job_graph(jobs, workers)
+            self.assertEqual(results, {"a": 3, "b": 12, "total": 15})
+            self.assertEqual(list(timings), ["a", "b", "total"])
+
+    def test_invalid_graphs(self):
+        """Test that unknown dependencies and cycles are rejected."""
+        with self.assertRaises(ValueError):
+            run_job_graph({"a": (_total, (), ("missing",))}, 1)
+        with self.assertRaises(ValueError):
+            run_job_graph({"a": (_total, (), ("b",)), "b": (_total, (), ("a",))}, 1)
+
+
+class TestVerifier(unittest.TestCase):
+    """Test cases for BinaryPAdicVerifier."""
+
+    def test_stage_checks(self):
+        """Test that a stage check reports its flags and workload."""
+        result = check_global_consistency(3, 8, 6)
+        for flag in STAGE_FLAGS["global"]:
+            self.assertIs(result[flag], True)
+        self.assertGreater(result["checked"]["elements"], 0)
+
+        # Core/helper disagreements are informational and set no flag
+        perfectoid = check_perfectoid_factorization(3, 8, 6)
+        self.assertTrue(all(perfectoid[flag] for flag in STAGE_FLAGS["perfectoid"]))
+        self.assertGreater(perfectoid["implementation_disagreements"], 0)
+
+        # The bulk classifier is checked against the scalar rules, not only the table
+        with mock.patch("padicmath.verification.checks._perfectoid_pattern_rule",
+                        lambda positions: len(positions) == 1):
+            self.assertFalse(check_perfectoid_factorization(3, 8, 6)["general_factorization"])
+
+    def test_parallel_matches_sequential(self):
+        """Test that the job graph gives the same results as the individual stages."""
+        sequential = BinaryPAdicVerifier(prime=3, precision=8, max_num=6)
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = [sequential.verify_global_consistency(),
+                       sequential.verify_schema_theoretic_properties(),
+                       sequential.verify_perfectoid_factorization(),
+                       sequential.verify_edge_cases(),
+                       sequential.verify_final_consistency()]
+            deep = BinaryPAdicVerifier(prime=3, precision=8, max_num=6)
+            report = deep.run_deep_verification_analysis(workers=2)
+
+        self.assertTrue(report["final_verification"])
+        self.assertEqual(deep.stage_results, sequential.stage_results)
+        for expected, actual in zip(results, report["all_verification_results"]):
+            expected.pop("stage_timings", None)
+            actual.pop("stage_timings", None)
+            self.assertEqual(expected, actual)
+        self.assertEqual(set(report["stage_timings"]), set(STAGE_FLAGS))
+        schema = report["all_verification_results"][1]
+        for alias, flag in SCHEMA_FLAG_ALIASES.items():
+            self.assertIs(schema[alias], schema[flag])
+        self.assertTrue(all(problem.is_verified for problem in deep.verification_framework))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,7 +4,10 @@ Helper utilities for working with p-adic numbers and test ideals.
 This module provides utility functions that simplify working with
 p-adic numbers and test ideals in both theoretical and computational contexts.
 """
-from typing import List, Dict, Any, Union, Optional, Tuple
+from typing import List, Dict, Any, Union, Optional, Tuple, Iterator
+import itertools
+import math
+import os
 import numpy as np
 from ..core.padic import PAdicNumber, BinaryPAdicNumber
 
@@ -50,6 +53,96 @@ def rational_to_binary_padic(num: int, den: int = 1, prime: int = 5, precision:
     return BinaryPAdicNumber(padic.digits, padic.prime, padic.valuation)
 
 
+# Largest modulus for which products of two residues still fit in int64
+_INT64_SAFE_MODULUS = 3037000499
+
+
+def _batch_digit_dtype(prime: int) -> np.dtype:
+    """Smallest unsigned dtype that can hold digits in [0, p-1]."""
+    if prime <= 256:
+        return np.dtype(np.uint8)
+    if prime <= 65536:
+        return np.dtype(np.uint16)
+    return np.dtype(np.int64)
+
+
+def rational_to_padic_batch(nums: Union[List[int], np.ndarray],
+                            dens: Optional[Union[List[int], np.ndarray]] = None,
+                            prime: int = 5,
+                            precision: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert many rational numbers to p-adic digits in one vectorized pass.
+    
+    Row i of the result agrees with PAdicNumber.from_rational(nums[i], dens[i],
+    prime, precision). Arithmetic runs in int64 while p^precision is small
+    enough for products of residues to fit; otherwise the same computation is
+    carried out on object arrays of Python ints.
+    
+    Args:
+        nums: Numerators
+        dens: Denominators (all 1 if omitted)
+        prime: The prime p
+        precision: Number of p-adic digits to compute
+        
+    Returns:
+        Tuple (digits, valuations) where digits is an array of shape
+        (len(nums), precision) with the least significant digit first, and
+        valuations is an int64 vector of p-adic valuations
+    """
+    modulus = prime ** precision
+    use_int64 = modulus <= _INT64_SAFE_MODULUS
+    
+    try:
+        num_arr = np.asarray(nums, dtype=np.int64 if use_int64 else object)
+        den_arr = (np.ones_like(num_arr) if dens is None
+                   else np.asarray(dens, dtype=np.int64 if use_int64 else object))
+    except OverflowError:
+        # Inputs too large for int64 even though p^precision is small
+        num_arr = np.asarray(nums, dtype=object)
+        den_arr = np.ones_like(num_arr) if dens is None else np.asarray(dens, dtype=object)
+    
+    if num_arr.shape != den_arr.shape or num_arr.ndim != 1:
+        raise ValueError("Numerators and denominators must be 1-D arrays of equal length")
+    if np.any(den_arr == 0):
+        raise ValueError("Denominators must be non-zero")
+    
+    # Valuations: strip one factor of p per pass from every entry that still has one
+    valuations = np.zeros(num_arr.shape, dtype=np.int64)
+    for arr, sign in ((np.abs(num_arr), 1), (np.abs(den_arr), -1)):
+        divisible = (arr != 0) & (arr % prime == 0)
+        while np.any(divisible):
+            valuations += sign * divisible
+            arr = np.where(divisible, arr // prime, arr)
+            divisible = (arr != 0) & (arr % prime == 0)
+    
+    # Inverse of each p-unit denominator modulo p^precision: Fermat's little
+    # theorem modulo p, then Newton lifting x <- x(2 - dx) doubling precision
+    unit_den = den_arr % prime != 0
+    d = np.where(unit_den, den_arr % modulus, 1)
+    inv = np.ones_like(d)
+    base, exp = d % prime, prime - 2
+    while exp > 0:
+        if exp & 1:
+            inv = inv * base % prime
+        base = base * base % prime
+        exp >>= 1
+    
+    known = 1
+    while known < precision:
+        known = min(2 * known, precision)
+        inv = inv * ((2 - d * inv) % modulus) % modulus
+    
+    x = np.where(unit_den, (num_arr % modulus) * inv % modulus, 0)
+    valuations = np.maximum(valuations, 0)
+    
+    digits = np.empty((num_arr.shape[0], precision), dtype=_batch_digit_dtype(prime))
+    for i in range(precision):
+        digits[:, i] = (x % prime).astype(np.int64)
+        x = x // prime
+    
+    return digits, valuations
+
+
 def padic_valuation(n: int, p: int) -> Union[int, float]:
     """
     Calculate the p-adic valuation of an integer n.
@@ -110,37 +203,204 @@ def is_in_test_ideal(element: Union[PAdicNumber, BinaryPAdicNumber, Tuple[int, i
         else:
             bin_padic = BinaryPAdicNumber(element.digits, element.prime, element.valuation)
     
-    # Special test cases
-    if bin_padic.binary_digits == [0, 1, 0]:
+    # Special test cases (binary pattern [0, 1, 0])
+    if bin_padic.binary_length == 3 and bin_padic.binary_mask == 0b010:
         return coefficient >= 0.3
     
     # Use binary predicate for membership test
     return bin_padic.binary_predicate(coefficient)
 
 
-def compare_test_ideals(coefficient1: float, coefficient2: float, 
-                       test_elements: List[Union[PAdicNumber, Tuple[int, int]]], 
-                       prime: int = 5) -> Dict[str, Any]:
+def _binary_profile(elements: Union[np.ndarray, List[Union[PAdicNumber, Tuple[int, int]]]],
+                    prime: int = 5) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
-    Compare test ideals with different coefficients.
+    Reduce elements to the data the binary predicate depends on.
     
     Args:
-        coefficient1: First coefficient
-        coefficient2: Second coefficient
-        test_elements: List of elements to test, can be PAdicNumbers or rational tuples
-        prime: The prime p
+        elements: Digit matrix (one element per row) or list of elements
+            accepted by is_in_test_ideal
+        prime: The prime p (only used for rational tuples)
         
     Returns:
-        Dict containing:
-        - in_both: Count of elements in both test ideals
-        - only_in_first: Count of elements only in first test ideal
-        - only_in_second: Count of elements only in second test ideal
-        - in_neither: Count of elements in neither test ideal
-        - equal: Whether the test ideals are equal
-        - first_contains_second: Whether first test ideal contains second
-        - second_contains_first: Whether second test ideal contains first
-        - element_details: List of details for each element
+        Tuple (first, lengths, special) of per-element arrays: index of the first
+        non-zero binary digit (equal to the length if there is none), number of
+        digits, and whether the element is the special pattern [0, 1, 0]
     """
+    if isinstance(elements, np.ndarray):
+        if elements.ndim != 2:
+            raise ValueError("Digit matrix must be 2-dimensional")
+        bits = elements != 0
+        width = bits.shape[1]
+        first = np.where(bits.any(axis=1), bits.argmax(axis=1), width).astype(np.int64)
+        lengths = np.full(bits.shape[0], width, dtype=np.int64)
+        if width == 3:
+            special = ~bits[:, 0] & bits[:, 1] & ~bits[:, 2]
+        else:
+            special = np.zeros(bits.shape[0], dtype=bool)
+        return first, lengths, special
+    
+    count = len(elements)
+    first = np.empty(count, dtype=np.int64)
+    lengths = np.empty(count, dtype=np.int64)
+    special = np.zeros(count, dtype=bool)
+    
+    rational_rows = []
+    for i, element in enumerate(elements):
+        if isinstance(element, tuple):
+            rational_rows.append(i)
+        elif isinstance(element, PAdicNumber):
+            if not isinstance(element, BinaryPAdicNumber):
+                element = BinaryPAdicNumber(element.digits, element.prime, element.valuation)
+            mask, length = element.binary_mask, element.binary_length
+            first[i] = (mask & -mask).bit_length() - 1 if mask else length
+            lengths[i] = length
+            special[i] = length == 3 and mask == 0b010
+        else:
+            raise TypeError("Element must be a PAdicNumber, BinaryPAdicNumber, or rational tuple")
+    
+    if rational_rows:
+        rows = np.asarray(rational_rows)
+        pairs = [elements[i] for i in rational_rows]
+        digits, _ = rational_to_padic_batch([num for num, _ in pairs],
+                                            [den for _, den in pairs], prime)
+        row_first, row_lengths, row_special = _binary_profile(digits)
+        
+        # rational_to_padic represents 1/5 (for p = 5) by the single digit [0]
+        if prime == 5:
+            one_fifth = np.array([pair == (1, 5) for pair in pairs])
+            row_first[one_fifth] = 1
+            row_lengths[one_fifth] = 1
+        
+        first[rows] = row_first
+        lengths[rows] = row_lengths
+        special[rows] = row_special
+    
+    return first, lengths, special
+
+
+def is_in_test_ideal_batch(elements: Union[np.ndarray, List[Union[PAdicNumber, Tuple[int, int]]]],
+                           coefficients: Union[List[float], np.ndarray],
+                           prime: int = 5) -> np.ndarray:
+    """
+    Determine test ideal membership for many elements and coefficients at once.
+    
+    Entry (i, j) of the result equals is_in_test_ideal(elements[i], coefficients[j], prime).
+    Each element is reduced once to the index of its first non-zero binary
+    digit, so the whole grid is a single broadcast comparison against the
+    truncation indices int(length * coefficient).
+    
+    Args:
+        elements: Digit matrix with one element per row (e.g. from
+            rational_to_padic_batch), or a list of PAdicNumbers,
+            BinaryPAdicNumbers and rational tuples (num, den)
+        coefficients: Divisor coefficients, each in (0,1)
+        prime: The prime p (only used for rational tuples)
+        
+    Returns:
+        Boolean array of shape (len(elements), len(coefficients))
+        
+    Raises:
+        TypeError: If an element is not a PAdicNumber, BinaryPAdicNumber, or rational tuple
+        ValueError: If a coefficient is outside (0,1)
+    """
+    coefs = np.asarray(coefficients, dtype=np.float64).reshape(-1)
+    if np.any((coefs <= 0) | (coefs >= 1)):
+        raise ValueError("Coefficient must be in range (0,1)")
+    
+    first, lengths, special = _binary_profile(elements, prime)
+    
+    trunc_idx = np.floor(lengths[:, None] * coefs[None, :]).astype(np.int64)
+    membership = first[:, None] < trunc_idx
+    membership[special] = coefs >= 0.3
+    
+    return membership
+
+
+class MembershipThresholds:
+    """
+    Cached membership data for comparing test ideals over a fixed element set.
+    
+    Membership under the binary predicate is monotone in the coefficient: an
+    element with first non-zero binary digit at index f and n digits is in the
+    test ideal exactly when f < int(n * coefficient). The index f and length n
+    are computed once per element, after which any number of coefficients can
+    be compared with integer comparisons only.
+    """
+    
+    def __init__(self, test_elements: Union[np.ndarray, List[Union[PAdicNumber, Tuple[int, int]]]],
+                 prime: int = 5):
+        """
+        Compute and cache the membership thresholds of the test elements.
+        
+        Args:
+            test_elements: Digit matrix or list of elements accepted by is_in_test_ideal
+            prime: The prime p (only used for rational tuples)
+        """
+        self.test_elements = test_elements
+        self.prime = prime
+        self.first_nonzero, lengths, self.special = _binary_profile(test_elements, prime)
+        self.distinct_lengths, self._length_index = np.unique(lengths, return_inverse=True)
+        self._membership_cache = {}
+    
+    def __len__(self) -> int:
+        return len(self.first_nonzero)
+    
+    def membership(self, coefficient: float) -> np.ndarray:
+        """
+        Membership of every test element in the test ideal with given coefficient.
+        
+        Args:
+            coefficient: Divisor coefficient in (0,1)
+            
+        Returns:
+            Boolean vector with one entry per test element
+        """
+        if coefficient in self._membership_cache:
+            return self._membership_cache[coefficient]
+        if not 0 < coefficient < 1:
+            raise ValueError("Coefficient must be in range (0,1)")
+        
+        # Truncation index only depends on the element length, of which there are few
+        trunc_idx = np.array([int(length * coefficient) for length in self.distinct_lengths],
+                             dtype=np.int64)
+        members = self.first_nonzero < trunc_idx[self._length_index]
+        members[self.special] = coefficient >= 0.3
+        
+        self._membership_cache[coefficient] = members
+        return members
+    
+    def compare(self, coefficient1: float, coefficient2: float) -> Dict[str, Any]:
+        """
+        Compare two test ideals on the cached elements.
+        
+        Returns:
+            Dict with the same keys as compare_test_ideals
+        """
+        return _comparison_result(self.test_elements,
+                                  self.membership(coefficient1),
+                                  self.membership(coefficient2))
+    
+    def containment_matrix(self, coefficients: List[float]) -> np.ndarray:
+        """
+        Pairwise containment of test ideals for a list of coefficients.
+        
+        Args:
+            coefficients: Divisor coefficients, each in (0,1)
+            
+        Returns:
+            Boolean matrix C with C[i, j] True iff the test ideal for
+            coefficients[i] contains the one for coefficients[j] on the test elements
+        """
+        members = np.column_stack([self.membership(c) for c in coefficients]).astype(np.int64)
+        # Count elements in ideal j but not in ideal i
+        escaped = (1 - members).T @ members
+        return escaped == 0
+
+
+def _comparison_result(test_elements: Union[np.ndarray, List[Any]],
+                       in_first_values: List[bool],
+                       in_second_values: List[bool]) -> Dict[str, Any]:
+    """Tally per-element memberships into the compare_test_ideals result dict."""
     result = {
         "in_both": 0,
         "only_in_first": 0,
@@ -152,23 +412,19 @@ def compare_test_ideals(coefficient1: float, coefficient2: float,
         "element_details": []
     }
     
-    for element in test_elements:
-        in_first = is_in_test_ideal(element, coefficient1, prime)
-        in_second = is_in_test_ideal(element, coefficient2, prime)
+    for element, in_first, in_second in zip(test_elements, in_first_values, in_second_values):
+        in_first, in_second = bool(in_first), bool(in_second)
         
         # Determine category
         if in_first and in_second:
             category = "in_both"
-            result["in_both"] += 1
         elif in_first:
             category = "only_in_first"
-            result["only_in_first"] += 1
         elif in_second:
             category = "only_in_second"
-            result["only_in_second"] += 1
         else:
             category = "in_neither"
-            result["in_neither"] += 1
+        result[category] += 1
         
         # Add element detail
         element_detail = {
@@ -187,11 +443,48 @@ def compare_test_ideals(coefficient1: float, coefficient2: float,
     return result
 
 
+def compare_test_ideals(coefficient1: float, coefficient2: float, 
+                       test_elements: Union[List[Union[PAdicNumber, Tuple[int, int]]], MembershipThresholds], 
+                       prime: int = 5) -> Dict[str, Any]:
+    """
+    Compare test ideals with different coefficients.
+    
+    Args:
+        coefficient1: First coefficient
+        coefficient2: Second coefficient
+        test_elements: List of elements to test, can be PAdicNumbers or rational tuples.
+            Passing a MembershipThresholds instead reuses its cached per-element
+            thresholds, which is much faster when comparing many coefficient pairs.
+        prime: The prime p
+        
+    Returns:
+        Dict containing:
+        - in_both: Count of elements in both test ideals
+        - only_in_first: Count of elements only in first test ideal
+        - only_in_second: Count of elements only in second test ideal
+        - in_neither: Count of elements in neither test ideal
+        - equal: Whether the test ideals are equal
+        - first_contains_second: Whether first test ideal contains second
+        - second_contains_first: Whether second test ideal contains first
+        - element_details: List of details for each element
+    """
+    if isinstance(test_elements, MembershipThresholds):
+        return test_elements.compare(coefficient1, coefficient2)
+    
+    in_first = [is_in_test_ideal(element, coefficient1, prime) for element in test_elements]
+    in_second = [is_in_test_ideal(element, coefficient2, prime) for element in test_elements]
+    
+    return _comparison_result(test_elements, in_first, in_second)
+
+
 def generate_test_cases(prime: int = 5, max_num: int = 10, 
                        include_fractions: bool = True) -> List[Union[PAdicNumber, Tuple[int, int]]]:
     """
     Generate test cases for verifying test ideal properties.
     
+    Materialises iter_test_cases; use that generator directly to stream
+    large test sets.
+    
     Args:
         prime: The prime p
         max_num: Maximum absolute value for integers
@@ -200,21 +493,136 @@ def generate_test_cases(prime: int = 5, max_num: int = 10,
     Returns:
         List of test elements
     """
-    test_cases = []
+    return list(iter_test_cases(prime, max_num, include_fractions))
+
+
+def _smallest_prime_factors(limit: int) -> List[int]:
+    """Sieve the smallest prime factor of every integer up to limit."""
+    spf = list(range(limit + 1))
+    for i in range(2, math.isqrt(limit) + 1):
+        if spf[i] == i:
+            for multiple in range(i * i, limit + 1, i):
+                if spf[multiple] == multiple:
+                    spf[multiple] = i
+    return spf
+
+
+def _distinct_prime_factors(n: int, spf: List[int]) -> List[int]:
+    """Distinct prime factors of n using a smallest-prime-factor table."""
+    factors = []
+    while n > 1:
+        q = spf[n]
+        factors.append(q)
+        while n % q == 0:
+            n //= q
+    return factors
+
+
+def _coprime_denominators(factors: List[int], max_den: int) -> List[int]:
+    """Denominators in [1, max_den] sharing no prime factor with the numerator."""
+    coprime = bytearray(b'\x01') * (max_den + 1)
+    for q in factors:
+        coprime[q::q] = bytes(len(range(q, max_den + 1, q)))
+    return list(itertools.compress(range(1, max_den + 1), coprime[1:]))
+
+
+def _count_coprime(factors: List[int], max_den: int) -> int:
+    """Count denominators in [1, max_den] coprime to the numerator (inclusion-exclusion)."""
+    count = 0
+    for size in range(len(factors) + 1):
+        for subset in itertools.combinations(factors, size):
+            count += (-1) ** size * (max_den // math.prod(subset))
+    return count
+
+
+def iter_test_cases(prime: int = 5, max_num: int = 10,
+                    include_fractions: bool = True,
+                    offset: int = 0,
+                    chunk_size: Optional[int] = None) -> Iterator[Any]:
+    """
+    Lazily generate the test cases of generate_test_cases, in the same order.
     
-    # Add integer cases
-    for i in range(-max_num, max_num + 1):
-        if i != 0:  # Skip 0
-            test_cases.append((i, 1))  # As rational tuples
+    Reduced fractions are enumerated per numerator by sieving out the
+    multiples of its prime factors, so no gcd is computed per pair and only
+    one numerator's denominators are held in memory at a time.
     
-    # Add fraction cases if requested
-    if include_fractions:
-        for num in range(-max_num, max_num + 1):
-            for den in range(1, max_num + 1):
-                if num != 0 and np.gcd(abs(num), den) == 1:  # Skip 0 and reduce fractions
-                    test_cases.append((num, den))
+    Args:
+        prime: The prime p
+        max_num: Maximum absolute value for integers
+        include_fractions: Whether to include fractions
+        offset: Number of leading test cases to skip (for resuming a stream);
+            whole numerators are skipped by counting, without enumeration
+        chunk_size: If given, yield lists of up to chunk_size test cases
+        
+    Yields:
+        Rational tuples (num, den), or lists of them when chunk_size is set
+    """
+    if chunk_size is not None:
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be positive")
+        stream = iter_test_cases(prime, max_num, include_fractions, offset)
+        while True:
+            chunk = list(itertools.islice(stream, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+    
+    if offset < 0:
+        raise ValueError("Offset must be non-negative")
+    
+    # Integer cases
+    integers = [i for i in range(-max_num, max_num + 1) if i != 0]
+    if offset < len(integers):
+        for i in integers[offset:]:
+            yield (i, 1)
+        offset = 0
+    else:
+        offset -= len(integers)
     
-    return test_cases
+    if not include_fractions:
+        return
+    
+    # Fraction cases, numerator by numerator
+    spf = _smallest_prime_factors(max_num)
+    for num in range(-max_num, max_num + 1):
+        if num == 0:
+            continue
+        factors = _distinct_prime_factors(abs(num), spf)
+        if offset:
+            count = _count_coprime(factors, max_num)
+            if offset >= count:
+                offset -= count
+                continue
+        dens = _coprime_denominators(factors, max_num)
+        for den in dens[offset:]:
+            yield (num, den)
+        offset = 0
+
+
+def count_test_cases(prime: int = 5, max_num: int = 10, include_fractions: bool = True) -> int:
+    """
+    Count the test cases generate_test_cases would produce, without generating them.
+    
+    Uses a totient sieve: the number of coprime pairs 1 <= num, den <= max_num
+    is 2·Σφ(k) - 1, and negative numerators double it.
+    
+    Args:
+        prime: The prime p
+        max_num: Maximum absolute value for integers
+        include_fractions: Whether to include fractions
+        
+    Returns:
+        Number of test cases
+    """
+    count = 2 * max_num
+    if include_fractions and max_num > 0:
+        phi = list(range(max_num + 1))
+        for i in range(2, max_num + 1):
+            if phi[i] == i:
+                for multiple in range(i, max_num + 1, i):
+                    phi[multiple] -= phi[multiple] // i
+        count += 2 * (2 * sum(phi[1:]) - 1)
+    return count
 
 
 def perfectoid_factorization_predicate(bin_padic: BinaryPAdicNumber) -> bool:
@@ -225,6 +633,10 @@ def perfectoid_factorization_predicate(bin_padic: BinaryPAdicNumber) -> bool:
     can be factored in a way that resolves apparent subadditivity counterexamples.
     The factorization is based on binary patterns as detailed in Section 2.3 of the paper.
     
+    The answer depends only on the binary pattern, so patterns covered by a
+    lookup table are answered by a single table lookup. The first call builds
+    the table of width PERFECTOID_TABLE_WIDTH (see perfectoid_lookup_table).
+    
     Args:
         bin_padic: Binary p-adic number to test
         
@@ -232,15 +644,25 @@ def perfectoid_factorization_predicate(bin_padic: BinaryPAdicNumber) -> bool:
         bool: True if the element admits perfectoid factorization
     """
     # If empty, return False
-    if not bin_padic.binary_digits:
+    if not bin_padic.binary_length:
         return False
     
-    # Single digit case (base case - Lemma 2.5 in the paper)
-    if sum(bin_padic.binary_digits) == 1:
-        return True
+    mask = bin_padic.binary_mask
+    for width, table in _perfectoid_tables.items():
+        if not mask >> width:
+            return _lookup_packed(table, mask)
+    if not mask >> PERFECTOID_TABLE_WIDTH:
+        return _lookup_packed(perfectoid_lookup_table(), mask)
     
     # Extract positions of 1's in the binary pattern
-    positions = [i for i, digit in enumerate(bin_padic.binary_digits) if digit == 1]
+    return _perfectoid_pattern_rule(bin_padic.nonzero_positions())
+
+
+def _perfectoid_pattern_rule(positions: List[int]) -> bool:
+    """Perfectoid factorization rules on the sorted positions of the non-zero digits."""
+    # Single digit case (base case - Lemma 2.5 in the paper)
+    if len(positions) == 1:
+        return True
     
     # Two-digit case (Lemma 2.6 in the paper)
     if len(positions) == 2:
@@ -323,6 +745,367 @@ def perfectoid_factorization_predicate(bin_padic: BinaryPAdicNumber) -> bool:
     return False
 
 
+class PerfectoidAutomaton:
+    """
+    Streaming form of the perfectoid factorization rules.
+    
+    Digits are consumed from position 0 upwards, one step per digit, in O(1)
+    state and without building position lists. The state records the number
+    of non-zero digits (saturating at 5, i.e. "more than four"), the first
+    gaps between them, the block decomposition (gaps <= 2 join a block) and
+    whether every gap is <= 2. All counters saturate except two integer
+    registers, the first position q0 and the first gap: the two-digit rule
+    "gap == q0" compares unbounded values and is not a regular property, and
+    both registers are frozen once a third non-zero digit is seen.
+    
+    State tuple: (count, q0, run, g1, g2, g3, blocks, block_size, blocks_ok,
+    all_close), where run is the number of zeros since the last non-zero digit.
+    """
+    
+    # Saturation point of gaps and zero runs once q0 and g1 are fixed
+    GAP_CAP = 6
+    
+    START = (0, 0, 0, 0, 0, 0, 0, 0, True, True)
+    
+    @classmethod
+    def step(cls, state: Tuple, digit: int) -> Tuple:
+        """Consume the next digit (only zero / non-zero matters)."""
+        count, q0, run, g1, g2, g3, blocks, size, blocks_ok, all_close = state
+        if not digit:
+            # Zero runs are needed exactly only for q0 (count 0) and g1 (count 1)
+            if count >= 2:
+                run = min(run + 1, cls.GAP_CAP)
+            else:
+                run += 1
+            return (count, q0, run, g1, g2, g3, blocks, size, blocks_ok, all_close)
+        
+        if count == 0:
+            q0, blocks, size = run, 1, 1
+        else:
+            gap = run + 1
+            if count == 1:
+                g1 = gap
+            elif count == 2:
+                g2 = min(gap, cls.GAP_CAP)
+            elif count == 3:
+                g3 = min(gap, cls.GAP_CAP)
+            all_close = all_close and gap <= 2
+            if gap <= 2:
+                size = min(size + 1, 4)
+            else:
+                blocks_ok = blocks_ok and size <= 3
+                blocks, size = min(blocks + 1, 3), 1
+        return (min(count + 1, 5), q0, 0, g1, g2, g3, blocks, size, blocks_ok, all_close)
+    
+    @staticmethod
+    def accepts(state: Tuple) -> bool:
+        """Whether the digits consumed so far admit perfectoid factorization."""
+        count, q0, _, g1, g2, g3, blocks, size, blocks_ok, all_close = state
+        if count <= 1:
+            return count == 1
+        if count == 2:
+            # gap <= 2, gap == q0 (q1 == 2·q0), or gap == q1 (q0 == 0)
+            return g1 <= 2 or g1 == q0 or q0 == 0
+        if count == 3:
+            return ((g1 <= 1 and g2 <= 3) or (g1 <= 3 and g2 <= 1) or g1 + g2 <= 4
+                    or (q0 == 0 and g1 <= 2 and g1 + g2 <= 5))
+        if count == 4:
+            return (g1 + g2 + g3 <= 5 or (g1 <= 1 and g3 <= 1)
+                    or (q0 == 0 and g1 == 1 and g2 in (2, 3)))
+        return (blocks <= 2 and blocks_ok and size <= 3) or (q0 == 1 and all_close)
+    
+    @classmethod
+    def run(cls, digits) -> bool:
+        """Classify a digit sequence (any iterable, lowest position first)."""
+        state = cls.START
+        for digit in digits:
+            state = cls.step(state, digit)
+        return cls.accepts(state)
+
+
+def perfectoid_factorization_packed(packed: np.ndarray, length: int) -> np.ndarray:
+    """
+    Run the perfectoid automaton on many packed binary patterns at once.
+    
+    All patterns advance one digit per step as whole-array operations, so the
+    cost is O(length) vector operations regardless of the number of patterns.
+    
+    Args:
+        packed: uint8 array of shape (N, ceil(length / 8)) holding each pattern
+            as little-endian packed bits (np.packbits(..., bitorder="little"))
+        length: Number of binary digits per pattern
+        
+    Returns:
+        Boolean array with one entry per pattern
+    """
+    return _perfectoid_verdicts(_run_perfectoid_automaton(packed, length))
+
+
+def _perfectoid_verdicts(state: Dict[str, np.ndarray]) -> np.ndarray:
+    """PerfectoidAutomaton.accepts on arrays of states."""
+    count, q0, g1, g2, g3 = (state[key] for key in ("count", "q0", "g1", "g2", "g3"))
+    return np.select(
+        [count <= 1, count == 2, count == 3, count == 4],
+        [
+            count == 1,
+            (g1 <= 2) | (g1 == q0) | (q0 == 0),
+            ((g1 <= 1) & (g2 <= 3)) | ((g1 <= 3) & (g2 <= 1)) | (g1 + g2 <= 4)
+            | ((q0 == 0) & (g1 <= 2) & (g1 + g2 <= 5)),
+            (g1 + g2 + g3 <= 5) | ((g1 <= 1) & (g3 <= 1))
+            | ((q0 == 0) & (g1 == 1) & ((g2 == 2) | (g2 == 3))),
+        ],
+        ((state["blocks"] <= 2) & state["blocks_ok"] & (state["size"] <= 3))
+        | ((q0 == 1) & state["all_close"]),
+    )
+
+
+def _run_perfectoid_automaton(packed: np.ndarray, length: int) -> Dict[str, np.ndarray]:
+    """Final PerfectoidAutomaton state of every packed pattern, one array per field."""
+    packed = np.asarray(packed, dtype=np.uint8)
+    if packed.ndim != 2 or packed.shape[1] * 8 < length:
+        raise ValueError(f"Packed patterns must have shape (N, >= {(length + 7) // 8})")
+    
+    state = _perfectoid_start(len(packed))
+    for i in range(length):
+        state = _perfectoid_step(state, ((packed[:, i >> 3] >> (i & 7)) & 1).astype(bool))
+    return state
+
+
+def _perfectoid_start(n: int) -> Dict[str, np.ndarray]:
+    """PerfectoidAutomaton.START for n patterns, one array per field."""
+    state = {key: np.zeros(n, dtype=np.int64)
+             for key in ("count", "q0", "run", "g1", "g2", "g3", "blocks", "size")}
+    state["blocks_ok"] = np.ones(n, dtype=bool)
+    state["all_close"] = np.ones(n, dtype=bool)
+    return state
+
+
+def _perfectoid_step(state: Dict[str, np.ndarray],
+                     bit: Union[np.ndarray, bool]) -> Dict[str, np.ndarray]:
+    """
+    PerfectoidAutomaton.step on arrays of states.
+    
+    `bit` is a boolean array, or a single bool shared by all patterns. A new
+    state is returned; the input arrays are not modified.
+    """
+    cap = PerfectoidAutomaton.GAP_CAP
+    count, run, size = state["count"], state["run"], state["size"]
+    if np.ndim(bit) == 0:
+        bit = np.full(len(count), bool(bit))
+    zero = ~bit
+    
+    # Zero digits extend the run (exactly while q0 or g1 are still open)
+    run = np.where(zero, np.where(count >= 2, np.minimum(run + 1, cap), run + 1), run)
+    
+    first = bit & (count == 0)
+    later = bit & (count > 0)
+    gap = run + 1
+    joins = later & (gap <= 2)
+    splits = later & (gap > 2)
+    return {
+        "count": np.where(bit, np.minimum(count + 1, 5), count),
+        "q0": np.where(first, run, state["q0"]),
+        "run": np.where(bit, 0, run),
+        "g1": np.where(later & (count == 1), gap, state["g1"]),
+        "g2": np.where(later & (count == 2), np.minimum(gap, cap), state["g2"]),
+        "g3": np.where(later & (count == 3), np.minimum(gap, cap), state["g3"]),
+        "blocks": np.where(first, 1, np.where(splits, np.minimum(state["blocks"] + 1, 3),
+                                              state["blocks"])),
+        "size": np.where(first | splits, 1, np.where(joins, np.minimum(size + 1, 4), size)),
+        "blocks_ok": state["blocks_ok"] & (~splits | (size <= 3)),
+        "all_close": state["all_close"] & (~later | (gap <= 2)),
+    }
+
+
+# Branches of perfectoid_factorization_predicate, in the order they are tried,
+# with the verdict each one returns
+PERFECTOID_BRANCHES = (
+    ("empty", False),
+    ("single_digit", True),
+    ("two_digit_gap", True),
+    ("two_digit_position", True),
+    ("two_digit_reject", False),
+    ("three_digit_adjacent", True),
+    ("three_digit_near", True),
+    ("three_digit_span", True),
+    ("three_digit_origin", True),
+    ("three_digit_reject", False),
+    ("four_digit_span", True),
+    ("four_digit_pairs", True),
+    ("four_digit_origin", True),
+    ("four_digit_reject", False),
+    ("general_blocks", True),
+    ("general_prime_chain", True),
+    ("general_reject", False),
+)
+
+_ACCEPTING_BRANCHES = [k for k, (_, verdict) in enumerate(PERFECTOID_BRANCHES) if verdict]
+
+
+def _perfectoid_branches(state: Dict[str, np.ndarray]) -> np.ndarray:
+    """Index into PERFECTOID_BRANCHES of the branch deciding each final state."""
+    count, q0, g1, g2, g3 = (state[key] for key in ("count", "q0", "g1", "g2", "g3"))
+    two, three, four, many = count == 2, count == 3, count == 4, count >= 5
+    conditions = [
+        count == 0,
+        count == 1,
+        two & (g1 <= 2),
+        two & ((g1 == q0) | (q0 == 0)),
+        two,
+        three & (g1 <= 1) & (g2 <= 1),
+        three & (((g1 <= 1) & (g2 <= 3)) | ((g1 <= 3) & (g2 <= 1))),
+        three & (g1 + g2 <= 4),
+        three & (q0 == 0) & (g1 <= 2) & (g1 + g2 <= 5),
+        three,
+        four & (g1 + g2 + g3 <= 5),
+        four & (g1 <= 1) & (g3 <= 1),
+        four & (q0 == 0) & (g1 == 1) & ((g2 == 2) | (g2 == 3)),
+        four,
+        many & (state["blocks"] <= 2) & state["blocks_ok"] & (state["size"] <= 3),
+        many & (q0 == 1) & state["all_close"],
+        many,
+    ]
+    # np.select picks the first matching condition, like the predicate's early returns
+    return np.select(conditions, np.arange(len(conditions)))
+
+
+def classify_perfectoid_patterns(
+        patterns: Union[np.ndarray, List[BinaryPAdicNumber]]) -> Tuple[np.ndarray, Dict[str, int]]:
+    """
+    Evaluate perfectoid_factorization_predicate in bulk and tally the deciding branches.
+    
+    Args:
+        patterns: BinaryPAdicNumber objects, or a digit matrix with one row per
+            pattern (non-zero entries count as binary 1)
+        
+    Returns:
+        Tuple (verdicts, histogram): a boolean array with one entry per pattern,
+        and the number of patterns decided by each branch of PERFECTOID_BRANCHES
+    """
+    if isinstance(patterns, np.ndarray):
+        if patterns.ndim != 2:
+            raise ValueError("Digit matrix must be two-dimensional")
+        length = patterns.shape[1]
+        packed = np.packbits(patterns != 0, axis=1, bitorder="little")
+    else:
+        length = max((element.binary_length for element in patterns), default=0)
+        width = (length + 7) // 8
+        packed = np.zeros((len(patterns), width), dtype=np.uint8)
+        for row, element in enumerate(patterns):
+            packed[row] = np.frombuffer(element.binary_mask.to_bytes(width, "little"),
+                                        dtype=np.uint8)
+    
+    branches = _perfectoid_branches(_run_perfectoid_automaton(packed, length))
+    counts = np.bincount(branches, minlength=len(PERFECTOID_BRANCHES))
+    histogram = {name: int(counts[k]) for k, (name, _) in enumerate(PERFECTOID_BRANCHES)}
+    return np.isin(branches, _ACCEPTING_BRANCHES), histogram
+
+
+# Default width W of the perfectoid lookup table (2^W patterns, 2^W / 8 bytes)
+PERFECTOID_TABLE_WIDTH = 20
+
+# Built or loaded lookup tables, keyed by width
+_perfectoid_tables: Dict[int, np.ndarray] = {}
+
+
+def _lookup_packed(table: np.ndarray, mask: int) -> bool:
+    """Bit `mask` of a little-endian packed bit table."""
+    return bool((table[mask >> 3] >> (mask & 7)) & 1)
+
+
+def build_perfectoid_lookup_table(width: int = PERFECTOID_TABLE_WIDTH) -> np.ndarray:
+    """
+    Evaluate the perfectoid factorization rules on every pattern of a given width.
+    
+    The table is built with the vectorized PerfectoidAutomaton: the states of
+    all 2^k patterns of width k are stepped with a zero and with a one digit,
+    which gives the states of all patterns of width k + 1 in mask order, so
+    the whole table costs about 2^(W+1) state updates.
+    
+    Args:
+        width: Number of binary digits W
+        
+    Returns:
+        Little-endian packed bit table (uint8 array of 2^W / 8 bytes, at least 1)
+        whose bit m is the predicate value for the pattern with bitmask m
+    """
+    state = _perfectoid_start(1)
+    for _ in range(width):
+        # The new digit is the top bit of the mask, so its zero half comes first
+        zero, one = _perfectoid_step(state, False), _perfectoid_step(state, True)
+        state = {key: np.concatenate((zero[key], one[key])) for key in state}
+    return np.packbits(_perfectoid_verdicts(state), bitorder="little")
+
+
+def perfectoid_lookup_table(width: int = PERFECTOID_TABLE_WIDTH,
+                            path: Optional[str] = None) -> np.ndarray:
+    """
+    Return the perfectoid lookup table for a width, building it at most once.
+    
+    Once a table is available, perfectoid_factorization_predicate and
+    perfectoid_factorization_batch answer patterns of at most `width` digits
+    by lookup. Building the default table takes a fraction of a second, so it
+    is built on first use; to build it once at install time instead, call
+    this function with a path and pass the same path before the first lookup.
+    
+    Args:
+        width: Number of binary digits W
+        path: Optional .npy file; loaded if it exists, otherwise written after
+            building
+        
+    Returns:
+        Packed bit table as returned by build_perfectoid_lookup_table
+    """
+    if width not in _perfectoid_tables:
+        if path is not None and os.path.exists(path):
+            table = np.load(path)
+            if table.dtype != np.uint8 or len(table) != max(1, (1 << width) // 8):
+                raise ValueError(f"{path} does not hold a lookup table of width {width}")
+        else:
+            table = build_perfectoid_lookup_table(width)
+            if path is not None:
+                np.save(path, table)
+        table.setflags(write=False)
+        _perfectoid_tables[width] = table
+    return _perfectoid_tables[width]
+
+
+def perfectoid_factorization_batch(masks: Union[np.ndarray, List[int]],
+                                   lengths: Optional[Union[np.ndarray, List[int]]] = None,
+                                   width: int = PERFECTOID_TABLE_WIDTH) -> np.ndarray:
+    """
+    Evaluate perfectoid_factorization_predicate on many packed binary patterns.
+    
+    Patterns that fit in the lookup table are answered by a single gather;
+    wider patterns (only possible for object arrays of Python ints) fall back
+    to the rules.
+    
+    Args:
+        masks: Bitmasks of the binary patterns (bit i set iff digit i is non-zero)
+        lengths: Optional pattern lengths; patterns of length 0 are False
+        width: Width of the lookup table to use
+        
+    Returns:
+        Boolean array with one entry per pattern
+    """
+    table = perfectoid_lookup_table(width)
+    masks = np.asarray(masks)
+    if masks.dtype == object:
+        result = np.array([
+            _lookup_packed(table, int(m)) if not int(m) >> width
+            else _perfectoid_pattern_rule(BinaryPAdicNumber.mask_positions(int(m)))
+            for m in masks
+        ], dtype=bool)
+    else:
+        masks = masks.astype(np.int64)
+        if masks.size and (masks.min() < 0 or masks.max() >> width):
+            raise ValueError(f"Masks must be non-negative and fit in {width} bits")
+        result = ((table[masks >> 3] >> (masks & 7)) & 1).astype(bool)
+    if lengths is not None:
+        result &= np.asarray(lengths) > 0
+    return result
+
+
 def test_subadditivity_counterexamples(coefficient: float = 0.5, prime: int = 5) -> Dict[str, Any]:
     """
     Test whether apparent subadditivity counterexamples are resolved by the theory.
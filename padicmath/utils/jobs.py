@@ -0,0 +1,109 @@
+"""
+Execution of small job graphs in a process pool.
+
+A job graph maps job names to (function, args, dependencies). A job is
+submitted as soon as all of its dependencies have finished, so independent
+jobs run concurrently and the wall-clock time is bounded by the slowest chain
+of dependent jobs rather than the sum of all jobs.
+"""
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import os
+import time
+
+
+# One job: (function, positional args, names of the jobs it depends on).
+# A job with dependencies receives their results as one extra trailing
+# argument, a dict keyed by dependency name.
+Job = Tuple[Callable[..., Any], Tuple[Any, ...], Tuple[str, ...]]
+
+
+def _job_order(jobs: Dict[str, Job]) -> List[str]:
+    """
+    Topological order of a job graph, keeping the insertion order among ready jobs.
+
+    Raises:
+        ValueError: If a dependency is unknown or the graph has a cycle
+    """
+    for name, (_, _, depends_on) in jobs.items():
+        unknown = [dep for dep in depends_on if dep not in jobs]
+        if unknown:
+            raise ValueError(f"Job {name!r} depends on unknown jobs {unknown}")
+
+    order = []
+    done = set()
+    while len(order) < len(jobs):
+        ready = [name for name, (_, _, depends_on) in jobs.items()
+                 if name not in done and all(dep in done for dep in depends_on)]
+        if not ready:
+            raise ValueError("Job graph has a cycle among "
+                             f"{sorted(name for name in jobs if name not in done)}")
+        order.extend(ready)
+        done.update(ready)
+    return order
+
+
+def timed_call(func: Callable[..., Any], args: Tuple[Any, ...]) -> Tuple[Any, float]:
+    """Call func(*args) and return its result with the elapsed seconds."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def _job_args(job: Job, results: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Arguments of a job, with the results of its dependencies appended."""
+    _, args, depends_on = job
+    if depends_on:
+        return tuple(args) + ({dep: results[dep] for dep in depends_on},)
+    return tuple(args)
+
+
+def run_job_graph(jobs: Dict[str, Job],
+                  workers: Optional[int] = None) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """
+    Run a job graph, each job as soon as its dependencies are done.
+
+    Job functions and arguments must be picklable when workers > 1.
+
+    Args:
+        jobs: Mapping from job name to (function, args, dependencies)
+        workers: Number of worker processes (default: CPU count; 1 runs in-process)
+
+    Returns:
+        Tuple (results, timings): the result of every job and the seconds
+        each job spent running, both keyed by job name
+
+    Raises:
+        ValueError: If a dependency is unknown or the graph has a cycle
+    """
+    order = _job_order(jobs)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(jobs)))
+
+    results = {}
+    timings = {}
+    if workers == 1:
+        for name in order:
+            results[name], timings[name] = timed_call(jobs[name][0],
+                                                       _job_args(jobs[name], results))
+        return results, timings
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+        waiting = list(order)
+        while waiting or pending:
+            ready = [name for name in waiting
+                     if all(dep in results for dep in jobs[name][2])]
+            for name in ready:
+                waiting.remove(name)
+                future = executor.submit(timed_call, jobs[name][0],
+                                         _job_args(jobs[name], results))
+                pending[future] = name
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = pending.pop(future)
+                results[name], timings[name] = future.result()
+
+    return {name: results[name] for name in order}, {name: timings[name] for name in order}
@@ -0,0 +1,191 @@
+"""
+Parallel sweeps of test ideal comparisons over generated test cases.
+
+This module shards the (num, den) space produced by generate_test_cases into
+contiguous numerator ranges, evaluates each shard in a worker process and
+merges the partial counts into the result dictionaries returned by
+compare_test_ideals.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Tuple, Callable
+import math
+import os
+
+from .helpers import (
+    MembershipThresholds,
+    _comparison_result,
+    _smallest_prime_factors,
+    _distinct_prime_factors,
+    _coprime_denominators
+)
+
+
+# One shard: (section, first numerator, end numerator) with section
+# "integers" or "fractions", mirroring the two loops of generate_test_cases
+Shard = Tuple[str, int, int]
+
+
+def _shard_elements(shard: Shard, max_num: int) -> List[Tuple[int, int]]:
+    """Generate the test cases of one shard, in generate_test_cases order."""
+    section, start, stop = shard
+    if section == "integers":
+        return [(num, 1) for num in range(start, stop) if num != 0]
+    
+    spf = _smallest_prime_factors(max_num)
+    return [(num, den)
+            for num in range(start, stop) if num != 0
+            for den in _coprime_denominators(_distinct_prime_factors(abs(num), spf), max_num)]
+
+
+def _plan_shards(max_num: int, include_fractions: bool, shard_size: int) -> List[Shard]:
+    """Split the numerator range of each section into contiguous shards."""
+    sections = ["integers", "fractions"] if include_fractions else ["integers"]
+    shards = []
+    for section in sections:
+        for start in range(-max_num, max_num + 1, shard_size):
+            shards.append((section, start, min(start + shard_size, max_num + 1)))
+    return shards
+
+
+def _sweep_shard(shard: Shard, max_num: int, prime: int,
+                 coefficient_pairs: List[Tuple[float, float]],
+                 include_details: bool) -> List[Dict[str, Any]]:
+    """
+    Evaluate all coefficient pairs on one shard.
+    
+    Returns:
+        One partial result per coefficient pair, holding the four category
+        counts and (if requested) the element details of the shard
+    """
+    elements = _shard_elements(shard, max_num)
+    thresholds = MembershipThresholds(elements, prime)
+    
+    partials = []
+    for coefficient1, coefficient2 in coefficient_pairs:
+        in_first = thresholds.membership(coefficient1)
+        in_second = thresholds.membership(coefficient2)
+        
+        if include_details:
+            partial = _comparison_result(elements, in_first, in_second)
+        else:
+            partial = {
+                "in_both": int((in_first & in_second).sum()),
+                "only_in_first": int((in_first & ~in_second).sum()),
+                "only_in_second": int((~in_first & in_second).sum()),
+                "in_neither": int((~in_first & ~in_second).sum()),
+                "element_details": []
+            }
+        partials.append(partial)
+    
+    return partials
+
+
+def sweep_test_ideals(coefficient_pairs: List[Tuple[float, float]],
+                      prime: int = 5,
+                      max_num: int = 10,
+                      include_fractions: bool = True,
+                      workers: Optional[int] = None,
+                      shard_size: Optional[int] = None,
+                      include_details: bool = False,
+                      progress: Optional[Callable[[int, int], None]] = None) -> List[Dict[str, Any]]:
+    """
+    Compare test ideals for many coefficient pairs over generate_test_cases output.
+    
+    The numerator range is split into shards that are evaluated in a process
+    pool. Partial counts are merged as shards complete; element details (if
+    requested) are reassembled in shard order, so the result is identical to
+    calling compare_test_ideals on generate_test_cases(prime, max_num,
+    include_fractions) regardless of the number of workers.
+    
+    Args:
+        coefficient_pairs: List of (coefficient1, coefficient2) pairs to compare
+        prime: The prime p
+        max_num: Maximum absolute value for numerators and denominators
+        include_fractions: Whether to include fractions
+        workers: Number of worker processes (default: CPU count; 1 runs in-process)
+        shard_size: Number of numerators per shard (default: about four shards per worker)
+        include_details: Whether to collect per-element details
+        progress: Optional callback called as progress(completed_shards, total_shards)
+        
+    Returns:
+        List of result dicts in the format of compare_test_ideals, one per pair
+    """
+    for pair in coefficient_pairs:
+        for coefficient in pair:
+            if not 0 < coefficient < 1:
+                raise ValueError("Coefficient must be in range (0,1)")
+    
+    workers = workers or os.cpu_count() or 1
+    if shard_size is None:
+        shard_size = max(1, math.ceil((2 * max_num + 1) / (4 * workers)))
+    shards = _plan_shards(max_num, include_fractions, shard_size)
+    
+    shard_results: List[Optional[List[Dict[str, Any]]]] = [None] * len(shards)
+    if workers == 1:
+        for index, shard in enumerate(shards):
+            shard_results[index] = _sweep_shard(shard, max_num, prime, coefficient_pairs,
+                                                include_details)
+            if progress:
+                progress(index + 1, len(shards))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(_sweep_shard, shard, max_num, prime, coefficient_pairs,
+                                include_details): index
+                for index, shard in enumerate(shards)
+            }
+            for completed, future in enumerate(as_completed(futures), 1):
+                shard_results[futures[future]] = future.result()
+                if progress:
+                    progress(completed, len(shards))
+    
+    results = []
+    for pair_index in range(len(coefficient_pairs)):
+        result = {
+            "in_both": 0,
+            "only_in_first": 0,
+            "only_in_second": 0,
+            "in_neither": 0,
+            "equal": False,
+            "first_contains_second": False,
+            "second_contains_first": False,
+            "element_details": []
+        }
+        for partials in shard_results:
+            partial = partials[pair_index]
+            for key in ("in_both", "only_in_first", "only_in_second", "in_neither"):
+                result[key] += partial[key]
+            result["element_details"].extend(partial["element_details"])
+        
+        # Determine relationships
+        result["equal"] = result["only_in_first"] == 0 and result["only_in_second"] == 0
+        result["first_contains_second"] = result["only_in_second"] == 0
+        result["second_contains_first"] = result["only_in_first"] == 0
+        results.append(result)
+    
+    return results
+
+
+def sweep_compare_test_ideals(coefficient1: float, coefficient2: float,
+                              prime: int = 5,
+                              max_num: int = 10,
+                              include_fractions: bool = True,
+                              workers: Optional[int] = None,
+                              **kwargs) -> Dict[str, Any]:
+    """
+    Parallel equivalent of compare_test_ideals(c1, c2, generate_test_cases(...), prime).
+    
+    Args:
+        coefficient1: First coefficient
+        coefficient2: Second coefficient
+        prime: The prime p
+        max_num: Maximum absolute value for numerators and denominators
+        include_fractions: Whether to include fractions
+        workers: Number of worker processes
+        **kwargs: Further options passed to sweep_test_ideals
+        
+    Returns:
+        Dict in the format of compare_test_ideals
+    """
+    return sweep_test_ideals([(coefficient1, coefficient2)], prime, max_num,
+                             include_fractions, workers, **kwargs)[0]
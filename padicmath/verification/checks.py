@@ -0,0 +1,387 @@
+"""
+Computational checks behind the stages of BinaryPAdicVerifier.
+
+Each stage of the verification framework is backed by a function that
+generates its own element set (from generate_test_cases and exhaustive
+binary patterns), runs the relevant library computations on it and returns
+the flags of the stage together with counts of what was checked. The
+functions are module-level, silent and depend only on their arguments, so
+the independent stages can run as separate jobs in a process pool.
+
+The flags test computable consequences of the named properties: e.g.
+"localization" is checked as invariance of membership under rescaling a
+fraction by a p-unit. The flags of the schema stage are named after what
+they check, which is the digit arithmetic of the p-adic expansions.
+"""
+from typing import Dict, List, Any, Tuple
+import itertools
+
+import numpy as np
+
+from ..core.padic import PAdicNumber, BinaryPAdicNumber, IntPAdicNumber, precision_context
+from ..utils.helpers import (
+    rational_to_padic_batch,
+    rational_to_binary_padic,
+    is_in_test_ideal,
+    is_in_test_ideal_batch,
+    MembershipThresholds,
+    generate_test_cases,
+    perfectoid_factorization_predicate,
+    perfectoid_factorization_batch,
+    PerfectoidAutomaton,
+    classify_perfectoid_patterns,
+    _perfectoid_pattern_rule
+)
+from .perfectoid import verify_perfectoid_predicates
+
+# Coefficient grid on which test ideal memberships are compared
+COEFFICIENT_GRID = tuple(round(0.05 * k, 2) for k in range(1, 20))
+
+# Maximum number of elements whose pairwise products are checked
+PRODUCT_SAMPLE_SIZE = 48
+
+# Maximum width of the exhaustively enumerated binary patterns
+PATTERN_WIDTH_LIMIT = 16
+
+# Number of patterns checked against the scalar perfectoid rules
+RULE_SAMPLE_SIZE = 4096
+
+# Flags computed by each stage check, in the order of the framework components
+STAGE_FLAGS = {
+    "global": ("patch_consistency", "binary_consistency",
+               "localization_consistency", "coherence_verified"),
+    "schema": ("multiplicative_expansion", "precision_truncation",
+               "int_arithmetic_agreement", "context_truncation", "representation_roundtrip"),
+    "perfectoid": ("factorization_verified", "general_factorization",
+                   "predicate_verified", "mathematical_consistency"),
+    "edge": ("pathological_verified", "boundary_verified",
+             "stability_verified", "extreme_verified"),
+    "final": ("integration_verified", "problems_resolved",
+              "computationally_tractable", "globally_coherent"),
+}
+
+# Former names of the schema flags, still present in the results of
+# BinaryPAdicVerifier.verify_schema_theoretic_properties
+SCHEMA_FLAG_ALIASES = {
+    "morphism_compatibility": "multiplicative_expansion",
+    "base_change_verified": "precision_truncation",
+    "tensor_compatibility": "int_arithmetic_agreement",
+    "formal_verified": "context_truncation",
+    "advanced_formal_verified": "representation_roundtrip",
+}
+
+
+def _unit_cases(prime: int, max_num: int) -> List[Tuple[int, int]]:
+    """Test cases whose denominator is a p-unit, i.e. elements of Z_p."""
+    return [(num, den) for num, den in generate_test_cases(prime, max_num) if den % prime]
+
+
+def _sample(items: List[Any], size: int) -> List[Any]:
+    """Evenly spaced sample of at most size items."""
+    step = max(1, -(-len(items) // size))
+    return items[::step]
+
+
+def _digits(padic: PAdicNumber, length: int) -> List[int]:
+    """First length digits of a p-adic number, padded with zeros."""
+    digits = list(padic.digits[:length])
+    return digits + [0] * (length - len(digits))
+
+
+def _units(prime: int, count: int) -> List[int]:
+    """The first count integers > 1 that are p-units."""
+    return list(itertools.islice((u for u in itertools.count(2) if u % prime), count))
+
+
+def check_global_consistency(prime: int, precision: int, max_num: int) -> Dict[str, Any]:
+    """
+    Stage I: membership is computed consistently by every code path.
+
+    - patch_consistency: vectorized digit expansions equal the scalar ones
+    - binary_consistency: scalar, batch and cached-threshold membership agree
+      on the whole coefficient grid
+    - localization_consistency: rescaling num/den by a p-unit leaves digits
+      and membership unchanged
+    - coherence_verified: test ideals are nested along the coefficient grid
+    """
+    cases = generate_test_cases(prime, max_num)
+    nums = [num for num, _ in cases]
+    dens = [den for _, den in cases]
+    digits, valuations = rational_to_padic_batch(nums, dens, prime, precision)
+
+    scalar = [PAdicNumber.from_rational(num, den, prime, precision) for num, den in cases]
+    patch_consistency = all(
+        _digits(padic, precision) == digits[i].tolist() and padic.valuation == valuations[i]
+        for i, padic in enumerate(scalar))
+
+    batch = is_in_test_ideal_batch(digits, COEFFICIENT_GRID, prime)
+    thresholds = MembershipThresholds(digits, prime)
+    binary_consistency = all(
+        np.array_equal(thresholds.membership(c), batch[:, j])
+        and all(is_in_test_ideal(BinaryPAdicNumber(padic.digits, prime, padic.valuation), c)
+                == batch[i, j] for i, padic in enumerate(scalar))
+        for j, c in enumerate(COEFFICIENT_GRID))
+
+    localization_consistency = True
+    for unit in _units(prime, 3):
+        local_digits, local_valuations = rational_to_padic_batch(
+            [num * unit for num in nums], [den * unit for den in dens], prime, precision)
+        if not (np.array_equal(local_digits, digits)
+                and np.array_equal(local_valuations, valuations)
+                and np.array_equal(is_in_test_ideal_batch(local_digits, COEFFICIENT_GRID, prime),
+                                   batch)):
+            localization_consistency = False
+
+    containment = thresholds.containment_matrix(list(COEFFICIENT_GRID))
+    coherence_verified = bool(containment[np.tril_indices(len(COEFFICIENT_GRID))].all())
+
+    return {
+        "patch_consistency": patch_consistency,
+        "binary_consistency": binary_consistency,
+        "localization_consistency": localization_consistency,
+        "coherence_verified": coherence_verified,
+        "checked": {"elements": len(cases), "coefficients": len(COEFFICIENT_GRID)},
+    }
+
+
+def check_schema_properties(prime: int, precision: int, max_num: int) -> Dict[str, Any]:
+    """
+    Stage II: the digit arithmetic of the p-adic expansions.
+
+    - multiplicative_expansion: Q ∩ Z_p → Z/p^n is multiplicative, i.e.
+      from_rational(ab) equals from_rational(a) · from_rational(b)
+    - precision_truncation: expansions at precision n are the truncations of
+      those at precision 2n
+    - int_arithmetic_agreement: integer-backed and list-based arithmetic agree
+      on sums and products
+    - context_truncation: products under precision_context(k) equal the
+      truncated full products
+    - representation_roundtrip: conversions between the representations
+      round-trip and preserve the binary pattern
+    """
+    cases = _unit_cases(prime, max_num)
+    sample = _sample(cases, PRODUCT_SAMPLE_SIZE)
+    padics = {case: PAdicNumber.from_rational(*case, prime, precision) for case in sample}
+    ints = {case: IntPAdicNumber.from_rational(*case, prime, precision) for case in sample}
+
+    multiplicative_expansion = True
+    int_arithmetic_agreement = True
+    context_truncation = True
+    for (a, b) in itertools.combinations_with_replacement(sample, 2):
+        product = padics[a] * padics[b]
+        expected = PAdicNumber.from_rational(a[0] * b[0], a[1] * b[1], prime, precision)
+        if (_digits(product, precision) != expected.digits
+                or product.valuation != expected.valuation):
+            multiplicative_expansion = False
+
+        int_product = ints[a] * ints[b]
+        int_sum = ints[a] + ints[b]
+        total = padics[a] + padics[b]
+        if (int_product.digits != _digits(product, precision)
+                or int_product.valuation != product.valuation
+                or int_sum.digits != _digits(total, int_sum.precision)
+                or int_sum.valuation != total.valuation):
+            int_arithmetic_agreement = False
+
+        k = precision // 2
+        with precision_context(k):
+            truncated = padics[a] * padics[b]
+        if _digits(truncated, k) != _digits(product, k) or len(truncated.digits) > k:
+            context_truncation = False
+
+    precision_truncation = all(
+        PAdicNumber.from_rational(*case, prime, 2 * precision).digits[:precision]
+        == PAdicNumber.from_rational(*case, prime, precision).digits
+        for case in cases)
+
+    representation_roundtrip = all(
+        IntPAdicNumber.from_padic(padics[case]) == ints[case]
+        and ints[case].to_padic().digits == padics[case].digits
+        and ints[case].to_binary_padic().binary_mask == padics[case].to_binary_padic().binary_mask
+        for case in sample)
+
+    return {
+        "multiplicative_expansion": multiplicative_expansion,
+        "precision_truncation": precision_truncation,
+        "int_arithmetic_agreement": int_arithmetic_agreement,
+        "context_truncation": context_truncation,
+        "representation_roundtrip": representation_roundtrip,
+        "checked": {"elements": len(cases), "pairs": len(sample) * (len(sample) + 1) // 2},
+    }
+
+
+def check_perfectoid_factorization(prime: int, precision: int, max_num: int) -> Dict[str, Any]:
+    """
+    Stage III: the perfectoid factorization predicate on all patterns.
+
+    - factorization_verified: single digits and two digits at distance at
+      most 2 (the basic elements p, x, x + p and their shifts) are accepted
+      by both implementations of the predicate
+    - general_factorization: the bulk classifier agrees with the lookup
+      table on every pattern of the enumerated width, and with the scalar
+      rules of the helper predicate (independent of the automaton behind
+      both) on a random sample of patterns
+    - predicate_verified: the scalar predicate on converted test cases
+      depends only on the binary pattern and is invariant under p-unit rescaling
+    - mathematical_consistency: the streaming automaton agrees with the
+      lookup table on a sample of patterns of every popcount, and the
+      exhaustive sweep of verify_perfectoid_predicates agrees with the scalar
+      predicates on its samples
+
+    The number of patterns on which the core and helper predicates differ
+    is returned as "implementation_disagreements". It is informational and
+    sets no flag: the core method implements only the one- and two-digit
+    rules, so the predicates are expected to differ.
+    """
+    width = min(precision, PATTERN_WIDTH_LIMIT)
+    masks = np.arange(1 << width, dtype=np.int64)
+    table_verdicts = perfectoid_factorization_batch(masks, width=width)
+
+    basic = [1 << i for i in range(width)]
+    basic += [(1 << i) | (1 << (i + gap)) for gap in (1, 2) for i in range(width - gap)]
+    factorization_verified = all(
+        bool(table_verdicts[mask])
+        and BinaryPAdicNumber.from_mask(mask, width, prime).perfect_factorization_predicate()
+        for mask in basic)
+
+    bits = ((masks[:, None] >> np.arange(width)) & 1).astype(np.uint8)
+    verdicts, histogram = classify_perfectoid_patterns(bits)
+    rule_sample = np.random.default_rng(0).choice(
+        masks, size=min(len(masks), RULE_SAMPLE_SIZE), replace=False)
+    general_factorization = bool(np.array_equal(verdicts, table_verdicts)) and all(
+        bool(verdicts[mask]) == (bool(mask) and _perfectoid_pattern_rule(
+            BinaryPAdicNumber.mask_positions(int(mask))))
+        for mask in rule_sample)
+
+    predicate_verified = True
+    unit = _units(prime, 1)[0]
+    for num, den in _unit_cases(prime, max_num):
+        element = rational_to_binary_padic(num, den, prime, precision)
+        pattern = BinaryPAdicNumber.from_mask(element.binary_mask, element.binary_length, prime)
+        rescaled = rational_to_binary_padic(num * unit, den * unit, prime, precision)
+        verdict = perfectoid_factorization_predicate(element)
+        if (verdict != perfectoid_factorization_predicate(pattern)
+                or verdict != perfectoid_factorization_predicate(rescaled)):
+            predicate_verified = False
+
+    sample = _sample(masks.tolist(), 4096)
+    mathematical_consistency = all(
+        PerfectoidAutomaton.run((mask >> i) & 1 for i in range(width)) == table_verdicts[mask]
+        for mask in sample)
+
+    differential = verify_perfectoid_predicates(width, workers=1, max_reported=0)
+    mathematical_consistency = mathematical_consistency and differential["confirmed"]
+    return {
+        "factorization_verified": factorization_verified,
+        "general_factorization": general_factorization,
+        "predicate_verified": predicate_verified,
+        "mathematical_consistency": mathematical_consistency,
+        "branch_histogram": histogram,
+        "implementation_disagreements": differential["disagreements"],
+        "checked": {"patterns": len(masks), "basic_elements": len(basic)},
+    }
+
+
+def check_edge_cases(prime: int, precision: int, max_num: int) -> Dict[str, Any]:
+    """
+    Stage IV: degenerate inputs, boundary coefficients, other primes, large values.
+
+    - pathological_verified: the empty pattern and multiples of p^precision
+      (all digits zero) are in no test ideal
+    - boundary_verified: coefficients next to 0 and 1 give the limiting
+      memberships, identically in the scalar and batch paths
+    - stability_verified: scalar and batch conversions and memberships agree
+      for several primes and precisions
+    - extreme_verified: numerators far beyond int64 convert and classify
+      identically in the scalar and batch paths
+    """
+    empty = BinaryPAdicNumber([], prime)
+    vanishing = [BinaryPAdicNumber(PAdicNumber.from_rational(sign * prime ** precision * k, 1,
+                                                             prime, precision).digits, prime)
+                 for sign in (1, -1) for k in range(1, max_num + 1)]
+    pathological_verified = (
+        not any(is_in_test_ideal(empty, c) for c in COEFFICIENT_GRID)
+        and not is_in_test_ideal_batch(vanishing, COEFFICIENT_GRID, prime).any())
+
+    cases = generate_test_cases(prime, max_num)
+    eps = 1e-9
+    near_zero, near_one = eps, 1 - eps
+    boundary = is_in_test_ideal_batch(cases, [near_zero, near_one], prime)
+    scalar_boundary = np.array([[is_in_test_ideal(case, c, prime) for c in (near_zero, near_one)]
+                                for case in cases])
+    profile = [rational_to_binary_padic(num, den, prime) for num, den in cases]
+    expected_near_one = np.array([e.binary_mask & ((1 << (e.binary_length - 1)) - 1) != 0
+                                  if e.binary_length else False for e in profile])
+    boundary_verified = (not boundary[:, 0].any()
+                         and np.array_equal(boundary, scalar_boundary)
+                         and np.array_equal(boundary[:, 1], expected_near_one))
+
+    stability_verified = True
+    for p in sorted({2, 3, prime}):
+        p_cases = generate_test_cases(p, max_num)
+        nums = [num for num, _ in p_cases]
+        dens = [den for _, den in p_cases]
+        for n in (precision, precision + 5):
+            digits, _ = rational_to_padic_batch(nums, dens, p, n)
+            rows = [PAdicNumber.from_rational(num, den, p, n).digits for num, den in p_cases]
+            if digits.tolist() != rows:
+                stability_verified = False
+        short, _ = rational_to_padic_batch(nums, dens, p, precision)
+        long, _ = rational_to_padic_batch(nums, dens, p, precision + 5)
+        if not np.array_equal(short, long[:, :precision]):
+            stability_verified = False
+
+    large = [(sign * (10 ** 30 + k), den) for sign in (1, -1)
+             for k in range(max_num) for den in (1, 3 if prime != 3 else 7)]
+    digits, valuations = rational_to_padic_batch([n for n, _ in large], [d for _, d in large],
+                                                 prime, precision)
+    scalar = [PAdicNumber.from_rational(num, den, prime, precision) for num, den in large]
+    extreme_verified = (
+        all(padic.digits == digits[i].tolist() and padic.valuation == valuations[i]
+            for i, padic in enumerate(scalar))
+        and np.array_equal(
+            is_in_test_ideal_batch(digits, COEFFICIENT_GRID, prime),
+            np.array([[is_in_test_ideal(padic, c) for c in COEFFICIENT_GRID] for padic in scalar])))
+
+    return {
+        "pathological_verified": pathological_verified,
+        "boundary_verified": boundary_verified,
+        "stability_verified": stability_verified,
+        "extreme_verified": extreme_verified,
+        "checked": {"elements": len(cases) + len(vanishing) + len(large)},
+    }
+
+
+def check_final_consistency(stages: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Stage V: combine the results of the other stages.
+
+    The flag names follow the verification framework; each only records
+    which stage checks passed:
+
+    - integration_verified: the global and schema stages pass
+    - problems_resolved: the perfectoid stage passes
+    - computationally_tractable: every stage checked a non-empty workload
+    - globally_coherent: all stages pass
+
+    Args:
+        stages: Results of the stage checks, keyed by stage name
+            ("global", "schema", "perfectoid", "edge")
+    """
+    def passed(name: str) -> bool:
+        return all(stages[name][flag] for flag in STAGE_FLAGS[name])
+
+    integration_verified = passed("global") and passed("schema")
+    problems_resolved = passed("perfectoid")
+    computationally_tractable = all(
+        stage["checked"] and all(count > 0 for count in stage["checked"].values())
+        for stage in stages.values())
+    globally_coherent = all(passed(name) for name in stages)
+
+    return {
+        "integration_verified": integration_verified,
+        "problems_resolved": problems_resolved,
+        "computationally_tractable": computationally_tractable,
+        "globally_coherent": globally_coherent,
+        "checked": {name: sum(stage["checked"].values()) for name, stage in stages.items()},
+    }
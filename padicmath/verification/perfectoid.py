@@ -0,0 +1,213 @@
+"""
+Differential verification of the perfectoid factorization predicates.
+
+The library has two implementations of the perfectoid factorization
+predicate: BinaryPAdicNumber.perfect_factorization_predicate (core) and
+helpers.perfectoid_factorization_predicate (helper). Both depend only on the
+binary pattern, so they can be compared exhaustively on every pattern of a
+given width.
+
+The low digits of all patterns are run through the vectorized perfectoid
+automaton once. The high digits are enumerated in Gray-code order: one high
+digit changes per step, and the automaton states of the high digits below it
+are kept on a stack, so on average two vectorized steps update the states of
+a whole block of patterns. The core predicate is read off the same states
+(digit count and first gap). Shards of the high digits run in a process pool.
+
+Both predicates are thus re-derived from automaton states rather than called.
+Each shard therefore also evaluates the scalar implementations on a random
+sample of its patterns (or on all of them) and reports every pattern where
+the sweep differs from them.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional, Tuple
+import math
+import os
+
+import numpy as np
+
+from ..core.padic import BinaryPAdicNumber
+from ..utils.helpers import (
+    _perfectoid_pattern_rule,
+    _perfectoid_start,
+    _perfectoid_step,
+    _perfectoid_verdicts
+)
+
+
+def _core_verdicts(state: Dict[str, np.ndarray]) -> np.ndarray:
+    """perfect_factorization_predicate from automaton states: one digit, or two within gap 2."""
+    count = state["count"]
+    return (count == 1) | ((count == 2) & (state["g1"] <= 2))
+
+
+def _scalar_verdicts(mask: int, width: int) -> Tuple[bool, bool]:
+    """
+    Helper and core verdicts of the scalar implementations on one pattern.
+    
+    The helper verdict comes from the rules of perfectoid_factorization_predicate,
+    since its lookup table is itself built with the automaton under test.
+    """
+    element = BinaryPAdicNumber.from_mask(mask, width, 5)
+    helper = bool(mask) and _perfectoid_pattern_rule(element.nonzero_positions())
+    return helper, element.perfect_factorization_predicate()
+
+
+def _check_shard(width: int, low_bits: int, shard_bits: int, shard: int,
+                 max_reported: Optional[int], samples: Optional[int]) -> Dict[str, Any]:
+    """
+    Compare both predicates on all patterns whose digits low_bits, ...,
+    low_bits + shard_bits - 1 spell `shard`.
+    
+    Returns:
+        Partial result with per-popcount disagreement counts, the smallest
+        max_reported disagreeing masks in increasing order, the number of
+        patterns checked against the scalar implementations and the masks
+        where the sweep differs from them
+    """
+    low_masks = np.arange(1 << low_bits, dtype=np.int64)
+    low_popcount = np.zeros(len(low_masks), dtype=np.int64)
+    state = _perfectoid_start(len(low_masks))
+    for i in range(low_bits):
+        bit = ((low_masks >> i) & 1).astype(bool)
+        low_popcount += bit
+        state = _perfectoid_step(state, bit)
+    
+    for k in range(shard_bits):
+        state = _perfectoid_step(state, bool((shard >> k) & 1))
+    
+    # Remaining high digits: stack[d] is the state after the first d of them
+    offset = low_bits + shard_bits
+    remaining = width - offset
+    digits = [0] * remaining
+    stack = [state]
+    for d in range(remaining):
+        stack.append(_perfectoid_step(stack[d], False))
+    
+    helper_only = np.zeros(width + 1, dtype=np.int64)
+    core_only = np.zeros(width + 1, dtype=np.int64)
+    reported = []
+    shard_popcount = bin(shard).count("1")
+    
+    # Patterns checked against the scalar implementations, as Gray step -> low masks
+    if samples is None:
+        checks = {g: low_masks for g in range(1 << remaining)}
+    else:
+        rng = np.random.default_rng(shard)
+        checks = {}
+        for g, low in zip(rng.integers(0, 1 << remaining, size=samples),
+                          rng.integers(0, 1 << low_bits, size=samples)):
+            checks.setdefault(int(g), []).append(int(low))
+    validated = 0
+    mismatches = []
+    
+    for g in range(1 << remaining):
+        final = stack[remaining]
+        helper = _perfectoid_verdicts(final)
+        core = _core_verdicts(final)
+        high_mask = shard << low_bits
+        for d, digit in enumerate(digits):
+            high_mask |= digit << (offset + d)
+        
+        differ = helper != core
+        if differ.any():
+            high_popcount = shard_popcount + sum(digits)
+            popcounts = low_popcount[differ] + high_popcount
+            helper_only += np.bincount(popcounts[helper[differ]], minlength=width + 1)
+            core_only += np.bincount(popcounts[core[differ]], minlength=width + 1)
+            # Masks of one step are increasing, so its first ones are its smallest
+            masks = (low_masks[differ] | high_mask)[:max_reported].tolist()
+            if max_reported is None:
+                reported.extend(masks)
+            else:
+                reported = sorted(reported + masks)[:max_reported]
+        
+        for low in checks.get(g, ()):
+            validated += 1
+            mask = int(low) | high_mask
+            if _scalar_verdicts(mask, width) != (helper[low], core[low]):
+                mismatches.append(mask)
+        
+        if g + 1 == 1 << remaining:
+            break
+        # Reflected Gray code: bit j toggles; the most frequent toggles hit the
+        # last consumed digit, so only the stack above it is recomputed
+        j = ((g + 1) & -(g + 1)).bit_length() - 1
+        d = remaining - 1 - j
+        digits[d] ^= 1
+        for depth in range(d, remaining):
+            stack[depth + 1] = _perfectoid_step(stack[depth], bool(digits[depth]))
+    
+    return {"helper_only": helper_only, "core_only": core_only, "reported": reported,
+            "validated": validated, "mismatches": sorted(mismatches)}
+
+
+def verify_perfectoid_predicates(width: int, workers: Optional[int] = None,
+                                 low_bits: int = 16,
+                                 max_reported: Optional[int] = 1000,
+                                 samples: Optional[int] = 256) -> Dict[str, Any]:
+    """
+    Compare the two perfectoid factorization predicates on all patterns of a width.
+    
+    Args:
+        width: Pattern width W; all 2^W binary patterns are checked
+        workers: Number of worker processes (default: CPU count; 1 runs in-process)
+        low_bits: Number of low digits evaluated as one vector (block size 2^low_bits)
+        max_reported: Maximum number of disagreeing masks returned (None for all)
+        samples: Number of random patterns per shard (64 shards at most)
+            checked against the scalar implementations (None checks every pattern)
+        
+    Returns:
+        Dict with the number of patterns and disagreements, per-popcount
+        counts ("patterns", "helper_only" where only the helper accepts,
+        "core_only" where only the core method accepts, "disagreements"),
+        the smallest max_reported disagreeing masks in increasing order, the
+        number of patterns checked against the scalar implementations
+        ("validated") and the masks where the sweep differs from them
+        ("mismatches"), and whether the sweep is confirmed: no mismatches,
+        and the scalar implementations disagree on every reported mask
+    """
+    if width < 0:
+        raise ValueError("Width must be non-negative")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    
+    low_bits = min(width, low_bits)
+    shard_bits = min(width - low_bits, 6)
+    shards = range(1 << shard_bits)
+    args = (width, low_bits, shard_bits)
+    
+    if workers == 1:
+        partials = [_check_shard(*args, shard, max_reported, samples) for shard in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_check_shard, *args, shard, max_reported, samples)
+                       for shard in shards]
+            partials = [future.result() for future in futures]
+    
+    helper_only = sum(partial["helper_only"] for partial in partials)
+    core_only = sum(partial["core_only"] for partial in partials)
+    reported = sorted(mask for partial in partials for mask in partial["reported"])
+    reported = reported[:max_reported]
+    mismatches = sorted(mask for partial in partials for mask in partial["mismatches"])
+    
+    by_popcount = {
+        k: {
+            "patterns": math.comb(width, k),
+            "helper_only": int(helper_only[k]),
+            "core_only": int(core_only[k]),
+            "disagreements": int(helper_only[k] + core_only[k]),
+        }
+        for k in range(width + 1)
+    }
+    return {
+        "width": width,
+        "patterns": 1 << width,
+        "disagreements": sum(counts["disagreements"] for counts in by_popcount.values()),
+        "by_popcount": by_popcount,
+        "reported": reported,
+        "validated": sum(partial["validated"] for partial in partials),
+        "mismatches": mismatches,
+        "confirmed": not mismatches and all(
+            len(set(_scalar_verdicts(mask, width))) == 2 for mask in reported),
+    }
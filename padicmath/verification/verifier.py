@@ -7,11 +7,30 @@ It systematically tests global consistency, schema-theoretic properties,
 perfectoid factorization, and edge cases to ensure the theory is robust.
 """
 from dataclasses import dataclass, field
-from typing import Dict, List, Any, Optional, Tuple, Union, Set
-import math
+from typing import Dict, List, Any, Optional
 
-from ..core.padic import PAdicNumber, BinaryPAdicNumber
-from ..utils.helpers import rational_to_padic, rational_to_binary_padic, is_in_test_ideal
+from ..utils.jobs import run_job_graph, timed_call
+from .checks import (
+    STAGE_FLAGS,
+    SCHEMA_FLAG_ALIASES,
+    check_global_consistency,
+    check_schema_properties,
+    check_perfectoid_factorization,
+    check_edge_cases,
+    check_final_consistency
+)
+
+# Check behind each verification stage
+_STAGE_CHECKS = {
+    "global": check_global_consistency,
+    "schema": check_schema_properties,
+    "perfectoid": check_perfectoid_factorization,
+    "edge": check_edge_cases,
+    "final": check_final_consistency,
+}
+
+# Stages whose results the final consistency stage combines
+_STAGE_DEPENDENCIES = ("global", "schema", "perfectoid", "edge")
 
 @dataclass
 class VerificationComponent:
@@ -40,14 +59,21 @@ class BinaryPAdicVerifier:
     sound framework for resolving open problems in the field.
     """
     
-    def __init__(self, prime: int = 5):
+    def __init__(self, prime: int = 5, precision: int = 10, max_num: int = 10):
         """
         Initialize the verifier with a specified prime.
         
         Args:
             prime: The prime number p for p-adic calculations (default: 5)
+            precision: Number of p-adic digits used by the stage checks
+            max_num: Bound on numerators and denominators of the generated
+                test elements (see generate_test_cases)
         """
         self.prime = prime
+        self.precision = precision
+        self.max_num = max_num
+        self.stage_results = {}
+        self.stage_timings = {}
         self.verification_results = []
         self.verification_framework = self._create_verification_framework()
         self.unified_theory_aspects = self._create_unified_theory_aspects()
@@ -63,19 +89,19 @@ class BinaryPAdicVerifier:
             VerificationProblem(
                 problem="Global Consistency",
                 components=[
-                    VerificationComponent(aspect="Affine patch consistency"),
-                    VerificationComponent(aspect="Binary predicate consistency across patches"),
-                    VerificationComponent(aspect="Binary predicate behavior under localization"),
-                    VerificationComponent(aspect="Global coherence")
+                    VerificationComponent(aspect="Vectorized and scalar expansions agree"),
+                    VerificationComponent(aspect="Scalar, batch and threshold membership agree"),
+                    VerificationComponent(aspect="Membership invariant under p-unit rescaling"),
+                    VerificationComponent(aspect="Test ideals nested along the coefficient grid")
                 ]
             ),
             VerificationProblem(
                 problem="Schema-Theoretic Properties",
                 components=[
-                    VerificationComponent(aspect="Compatibility with pullbacks and pushforwards"),
-                    VerificationComponent(aspect="Flat base change property"),
-                    VerificationComponent(aspect="Tensor operation compatibility"),
-                    VerificationComponent(aspect="Formal schema-theoretic properties")
+                    VerificationComponent(aspect="Multiplicativity of the digit expansion"),
+                    VerificationComponent(aspect="Truncation under a change of precision"),
+                    VerificationComponent(aspect="Integer-backed and list-based arithmetic agree"),
+                    VerificationComponent(aspect="Precision contexts and representation round trips")
                 ]
             ),
             VerificationProblem(
@@ -84,7 +110,7 @@ class BinaryPAdicVerifier:
                     VerificationComponent(aspect="Perfectoid factorization of basic elements"),
                     VerificationComponent(aspect="General perfectoid factorization analysis"),
                     VerificationComponent(aspect="Perfectoid factorization predicate verification"),
-                    VerificationComponent(aspect="Mathematical consistency of factorization")
+                    VerificationComponent(aspect="Automaton and sweep agree with the scalar rules")
                 ]
             ),
             VerificationProblem(
@@ -99,10 +125,10 @@ class BinaryPAdicVerifier:
             VerificationProblem(
                 problem="Final Consistency",
                 components=[
-                    VerificationComponent(aspect="Integration with established theory"),
-                    VerificationComponent(aspect="Resolution of three open problems"),
-                    VerificationComponent(aspect="Computational tractability"),
-                    VerificationComponent(aspect="Globally coherent")
+                    VerificationComponent(aspect="Membership and digit arithmetic stages pass"),
+                    VerificationComponent(aspect="Perfectoid stage passes"),
+                    VerificationComponent(aspect="Every stage checked a non-empty workload"),
+                    VerificationComponent(aspect="All stages pass")
                 ]
             )
         ]
@@ -110,28 +136,64 @@ class BinaryPAdicVerifier:
     
     def _create_unified_theory_aspects(self):
         """
-        Create aspects for verifying the unified binary p-adic test ideal theory.
+        Create the summary aspects derived from the stage checks.
+        
+        Each aspect names the computations it is derived from; none of them
+        is a proof of the geometric statements of the theory.
         
         Returns:
             List of unified theory verification aspects
         """
         return [
-            VerificationComponent(aspect="Mathematical foundation sound"),
-            VerificationComponent(aspect="Globally consistent on schemes"),
-            VerificationComponent(aspect="Compatible with scheme operations"),
-            VerificationComponent(aspect="Resolves all three open problems"),
-            VerificationComponent(aspect="Handles edge cases and boundaries"),
-            VerificationComponent(aspect="Consistent with established results"),
-            VerificationComponent(aspect="Provides computational framework")
+            VerificationComponent(aspect="Membership and digit arithmetic consistent"),
+            VerificationComponent(aspect="Membership code paths agree"),
+            VerificationComponent(aspect="Digit arithmetic consistent"),
+            VerificationComponent(aspect="Perfectoid predicates consistent"),
+            VerificationComponent(aspect="Edge cases and boundaries handled"),
+            VerificationComponent(aspect="Stage results consistent with each other"),
+            VerificationComponent(aspect="Non-empty workloads checked")
         ]
     
+    def _stage_result(self, stage: str) -> Dict[str, Any]:
+        """
+        Result of a stage check, computed in-process unless it is already known.
+        
+        run_deep_verification_analysis fills the results of all stages from
+        the job graph before the verify_* methods report them.
+        """
+        if stage not in self.stage_results:
+            if stage == "final":
+                args = ({name: self._stage_result(name) for name in _STAGE_DEPENDENCIES},)
+            else:
+                args = (self.prime, self.precision, self.max_num)
+            self.stage_results[stage], self.stage_timings[stage] = timed_call(
+                _STAGE_CHECKS[stage], args)
+        return self.stage_results[stage]
+    
+    def _apply_stage(self, stage: str, problem_name: str) -> Dict[str, Any]:
+        """Copy the flags of a stage check onto the components of its framework problem."""
+        checks = self._stage_result(stage)
+        flags = [checks[flag] for flag in STAGE_FLAGS[stage]]
+        if stage == "schema":
+            # Context truncation and round trips share the last component
+            flags = flags[:3] + [flags[3] and flags[4]]
+        
+        problem = next(p for p in self.verification_framework if p.problem == problem_name)
+        for component, verified in zip(problem.components, flags):
+            component.verified = bool(verified)
+        
+        result = {flag: bool(checks[flag]) for flag in STAGE_FLAGS[stage]}
+        result["checked"] = checks["checked"]
+        return result
+    
     def verify_global_consistency(self):
         """
         Verify global consistency of the binary p-adic approach.
         
-        This tests whether the binary p-adic approach works consistently across
-        global schemes, checking consistency across affine patches, predicates,
-        and localization behavior.
+        Test ideal membership of the generated test cases is computed by the
+        scalar, batch and cached-threshold paths, before and after rescaling
+        by p-units (localization), and the test ideals are checked to be
+        nested along a grid of coefficients.
         
         Returns:
             Dict with verification results
@@ -139,107 +201,12 @@ class BinaryPAdicVerifier:
         print("\n============== I. GLOBAL CONSISTENCY VERIFICATION ==============")
         print("Testing whether binary p-adic approach works consistently across global schemes...")
         
-        # Model a global scheme as collection of affine patches with gluing data
-        print("\n=== A. Affine Patch Consistency Model ===")
-        print("Considering a projective scheme X over R, covered by affine patches {U_i}:")
-        
-        # Define test data - model affine patches
-        affine_patches = [
-            {"name": "U₁", "model": "Spec(R[x,y]/(f₁))", "characteristic": "mixed (0,5)"},
-            {"name": "U₂", "model": "Spec(R[x,z]/(f₂))", "characteristic": "mixed (0,5)"},
-            {"name": "U₃", "model": "Spec(R[y,z]/(f₃))", "characteristic": "mixed (0,5)"}
-        ]
+        result = self._apply_stage("global", "Global Consistency")
+        print(f"Checked {result['checked']['elements']} elements on "
+              f"{result['checked']['coefficients']} coefficients")
         
-        # Test affine patch consistency
-        patch_consistency = True
-        for patch in affine_patches:
-            print(f"{patch['name']}: {patch['model']} ({patch['characteristic']})")
-        
-        # Test binary predicate consistency across patches
-        print("\n=== B. Binary Predicate Consistency Across Patches ===")
-        
-        # Model test elements with binary p-adic representations
-        test_elements = [
-            {
-                "element": "x+y+1", 
-                "binary": [1, 0, 0, 0, 0],
-                "patch_results": {"U₁": True, "U₂": True, "U₃": None}
-            },
-            {
-                "element": "5z+y", 
-                "binary": [0, 1, 0, 0, 0],
-                "patch_results": {"U₁": True, "U₂": True, "U₃": True}
-            },
-            {
-                "element": "5²xy", 
-                "binary": [0, 0, 1, 0, 0],
-                "patch_results": {"U₁": False, "U₂": False, "U₃": None}
-            }
-        ]
-        
-        # Check binary predicate consistency
-        binary_consistency = True
-        for element in test_elements:
-            # Check that binary predicate gives consistent results across patches
-            defined_patches = [p for p, result in element["patch_results"].items() if result is not None]
-            if len(defined_patches) > 1:
-                first_result = element["patch_results"][defined_patches[0]]
-                consistent = all(element["patch_results"][p] == first_result for p in defined_patches[1:])
-                if not consistent:
-                    binary_consistency = False
-        
-        # Verify binary predicate behavior under localization
-        print("\n=== C. Binary Predicate Behavior Under Localization ===")
-        
-        # Test localization at different elements
-        localization_tests = [
-            {"element": "x", "binary_before": [1, 0, 0, 0, 0], "binary_after": [1, 0, 0, 0, 0]},
-            {"element": "5", "binary_before": [0, 1, 0, 0, 0], "binary_after": [0, 1, 0, 0, 0]},
-            {"element": "1+5x", "binary_before": [1, 0, 0, 0, 0], "binary_after": [1, 0, 0, 0, 0]}
-        ]
-        
-        # Check localization behavior
-        localization_consistency = True
-        for test in localization_tests:
-            # Verify that binary pattern transforms correctly under localization
-            binary_before = BinaryPAdicNumber(test["binary_before"], self.prime)
-            binary_after = BinaryPAdicNumber(test["binary_after"], self.prime)
-            
-            # Test with a coefficient where their behavior should match
-            coefficient = 0.5
-            if is_in_test_ideal(binary_before, coefficient) != is_in_test_ideal(binary_after, coefficient):
-                localization_consistency = False
-        
-        # Validate global coherence of the theory
-        print("\n=== D. Global Coherence Validation ===")
-        
-        # Verify sheaf coherence properties
-        sheaf_coherence = {
-            "restriction_consistent": True,
-            "gluing_satisfied": True,
-            "commutativity": True
-        }
-        
-        # Set verification results
-        coherence_verified = all(sheaf_coherence.values())
-        
-        # Update verification framework
-        problem = next(p for p in self.verification_framework if p.problem == "Global Consistency")
-        problem.components[0].verified = patch_consistency
-        problem.components[1].verified = binary_consistency
-        problem.components[2].verified = localization_consistency
-        problem.components[3].verified = coherence_verified
-        
-        # Prepare results
-        result = {
-            "global_consistency": patch_consistency and binary_consistency and 
-                                  localization_consistency and coherence_verified,
-            "patch_consistency": patch_consistency,
-            "binary_consistency": binary_consistency,
-            "localization_consistency": localization_consistency,
-            "coherence_verified": coherence_verified,
-            "message": "Global consistency verification complete"
-        }
+        result["global_consistency"] = all(result[flag] for flag in STAGE_FLAGS["global"])
+        result["message"] = "Global consistency verification complete"
         
         self.verification_results.append(result)
         print(f"\nGlobal consistency verified: {result['global_consistency']}")
@@ -249,9 +216,14 @@ class BinaryPAdicVerifier:
         """
         Verify the schema-theoretic properties of the binary p-adic approach.
         
-        This includes checking compatibility with pullbacks, pushforwards,
-        tensor operations, and formal schema-theoretic properties as detailed
-        in Section 4 of the paper on Global Scheme-Theoretic Properties.
+        The p-adic expansion of the generated test cases is checked to be
+        multiplicative, compatible with changes of precision, and identical
+        under the list-based and integer-backed arithmetic, including
+        products truncated by precision_context.
+        
+        The flags are also returned under their former names (see
+        SCHEMA_FLAG_ALIASES), so callers reading e.g. "morphism_compatibility"
+        keep working.
         
         Returns:
             Dict with verification results
@@ -259,116 +231,14 @@ class BinaryPAdicVerifier:
         print("\n============== II. SCHEMA-THEORETIC PROPERTIES VERIFICATION ==============")
         print("Validating schema-theoretic properties of the binary p-adic test ideal theory...")
         
-        # Test compatibility with pullbacks and pushforwards
-        print("\n=== A. Compatibility with Pullbacks and Pushforwards ===")
-        
-        # Define morphism test scenarios based on Theorem 4.2 in the paper
-        morphism_tests = [
-            {"type": "Finite morphism", "compatible": True, "details": "Test ideals commute with finite morphisms"},
-            {"type": "Blowup", "compatible": True, "details": "Binary predicates transform properly under blowups"},
-            {"type": "General projective birational", "compatible": True, "details": "Preserves binary pattern structure"},
-            {"type": "Etale morphism", "compatible": True, "details": "Binary predicates are preserved"}
-        ]
-        
-        # Verify morphism compatibility
-        morphism_compatibility = all(test["compatible"] for test in morphism_tests)
-        
-        # Check flat base change property from Proposition 4.5
-        print("\n=== B. Flat Base Change Property ===")
-        
-        # Define flat base change test with detailed verification
-        flat_base_change = {
-            "property_holds": True, 
-            "details": "For a flat morphism f: Y → X, we have f*(τ+(X,Δ)) = τ+(Y,f*Δ)",
-            "binary_transform": True,
-            "details_binary": "Binary predicates transform correctly under flat base change",
-            "commutativity": True,
-            "details_commutativity": "The diagram commutes as required by schema theory"
-        }
-        
-        # Additional verification for the Cartesian diagram commutation
-        cartesian_diagram = {
-            "property_holds": True,
-            "details": "For a Cartesian diagram with flat morphisms, the test ideal formation commutes"
-        }
-        
-        # Verify flat base change
-        base_change_verified = all(flat_base_change.values())
-        
-        # Check compatibility with tensor operations (Theorem 4.7)
-        print("\n=== C. Tensor Operation Compatibility ===")
-        
-        # Test tensor operations with detailed verification
-        tensor_operations = [
-            {"operation": "τ+(O_X, Δ₁) ⊗ τ+(O_X, Δ₂)", "compatible": True, 
-             "details": "The tensor product is coherent with the subadditivity property"},
-            {"operation": "τ+(O_X, Δ) ⊗ L (line bundle)", "compatible": True,
-             "details": "Commutes with tensoring by line bundles"},
-            {"operation": "τ+(O_X, Δ) ⊗ O_X(D)", "compatible": True,
-             "details": "Compatible with divisorial twists"},
-            {"operation": "τ+(O_X, Δ) ⊗ f_*O_Y", "compatible": True,
-             "details": "For a finite morphism f: Y → X, tensoring is compatible"}
-        ]
+        result = self._apply_stage("schema", "Schema-Theoretic Properties")
+        print(f"Checked {result['checked']['elements']} elements and "
+              f"{result['checked']['pairs']} products")
         
-        # Verify tensor compatibility
-        tensor_compatibility = all(op["compatible"] for op in tensor_operations)
-        
-        # Formal schema-theoretic properties (Theorem 4.8)
-        print("\n=== D. Formal Schema-Theoretic Properties ===")
-        
-        # Define formal properties with detailed verification
-        formal_properties = [
-            {"property": "Quasi-coherence", "verified": True, 
-             "details": "τ+(X,Δ) forms a quasi-coherent sheaf of ideals on X"},
-            {"property": "Compatibility with restriction", "verified": True, 
-             "details": "For an open subset U ⊂ X, we have τ+(X,Δ)|_U = τ+(U,Δ|_U)"},
-            {"property": "Preservation under étale morphisms", "verified": True, 
-             "details": "For an étale morphism f: Y → X, we have f*(τ+(X,Δ)) = τ+(Y,f*Δ)"},
-            {"property": "Compatibility with completion", "verified": True, 
-             "details": "For the completion at a point x ∈ X, the test ideal commutes with completion"},
-            {"property": "Respect for blowups", "verified": True, 
-             "details": "For a blowup π: X' → X, the test ideal transforms according to proper transform rules"}
-        ]
-        
-        # Additional advanced formal properties from Section 4.3 of the paper
-        advanced_formal_properties = [
-            {"property": "Global Coherence", "verified": True, 
-             "details": "The test ideal sheaf is globally coherent as defined in Theorem 4.1"},
-            {"property": "Local-to-Global Principle", "verified": True, 
-             "details": "Local test ideal computation determines the global sheaf structure"},
-            {"property": "Compatibility with Frobenius in positive characteristic fibers", "verified": True, 
-             "details": "Aligns with classical test ideals on positive characteristic fibers"},
-            {"property": "Compatibility with Perfectoid Completion", "verified": True, 
-             "details": "The perfectoid completion preserves test ideal structure"},
-            {"property": "Algebraization Property", "verified": True, 
-             "details": "Formal local properties algebraize to global properties"}
-        ]
-        
-        # Verify formal properties
-        formal_verified = all(prop["verified"] for prop in formal_properties)
-        advanced_formal_verified = all(prop["verified"] for prop in advanced_formal_properties)
-        
-        # Update verification framework
-        problem = next(p for p in self.verification_framework if p.problem == "Schema-Theoretic Properties")
-        problem.components[0].verified = morphism_compatibility
-        problem.components[1].verified = base_change_verified
-        problem.components[2].verified = tensor_compatibility
-        problem.components[3].verified = formal_verified and advanced_formal_verified
-        
-        # Prepare results
-        result = {
-            "schema_properties_verified": (morphism_compatibility and 
-                                         base_change_verified and 
-                                         tensor_compatibility and 
-                                         formal_verified and
-                                         advanced_formal_verified),
-            "morphism_compatibility": morphism_compatibility,
-            "base_change_verified": base_change_verified,
-            "tensor_compatibility": tensor_compatibility,
-            "formal_verified": formal_verified,
-            "advanced_formal_verified": advanced_formal_verified,
-            "message": "Schema-theoretic properties verification complete"
-        }
+        result["schema_properties_verified"] = all(result[flag] for flag in STAGE_FLAGS["schema"])
+        for alias, flag in SCHEMA_FLAG_ALIASES.items():
+            result[alias] = result[flag]
+        result["message"] = "Schema-theoretic properties verification complete"
         
         self.verification_results.append(result)
         print(f"\nSchema properties verified: {result['schema_properties_verified']}")
@@ -378,9 +248,15 @@ class BinaryPAdicVerifier:
         """
         Verify the perfectoid factorization theory for subadditivity.
         
-        This tests the mathematical foundations of perfectoid factorization,
-        the factorization of specific elements, and the perfectoid factorization
-        predicate that characterizes test ideal membership.
+        Every binary pattern up to the verification precision (at most
+        PATTERN_WIDTH_LIMIT digits) is classified by the lookup table, the
+        bulk classifier and the streaming automaton, and the basic elements
+        are checked against both implementations of the predicate.
+        
+        The core method implements only the one- and two-digit rules, so the
+        two implementations are expected to differ on wider patterns; the
+        number of such patterns ("implementation_disagreements") is reported
+        for information and does not affect the verdict.
         
         Returns:
             Dict with verification results
@@ -388,89 +264,21 @@ class BinaryPAdicVerifier:
         print("\n============== III. PERFECTOID FACTORIZATION VERIFICATION ==============")
         print("Rigorously verifying the perfectoid factorization theory for subadditivity...")
         
-        # Theoretical foundation verification
-        print("\n=== A. Theoretical Foundation of Perfectoid Factorization ===")
-        
-        # Verify specific factorization claims
-        print("\n=== B. Verification of Specific Factorization Claims ===")
-        
-        # Define test cases for perfectoid factorization
-        factorization_tests = [
-            {
-                "element": "p", 
-                "binary": [0, 1, 0, 0, 0],
-                "factorization_valid": True,
-                "compatible_with_ideal": True
-            },
-            {
-                "element": "x", 
-                "binary": [1, 0, 0, 0, 0],
-                "factorization_valid": True,
-                "compatible_with_ideal": True
-            },
-            {
-                "element": "x+p", 
-                "binary": [1, 1, 0, 0, 0],
-                "factorization_valid": True,
-                "compatible_with_ideal": True
-            }
-        ]
-        
-        # Verify factorization tests
-        factorization_verified = all(test["factorization_valid"] and 
-                                   test["compatible_with_ideal"] 
-                                   for test in factorization_tests)
-        
-        # Check factorization in general cases
-        print("\n=== C. General Perfectoid Factorization Analysis ===")
-        
-        # Define binary pattern classes
-        binary_pattern_classes = [
-            {"pattern": "Single digit (10000, 01000, etc.)", "works": True},
-            {"pattern": "Two digits (11000, 10100, etc.)", "works": True},
-            {"pattern": "Complex patterns (11010, etc.)", "works": True},
-            {"pattern": "Infinite patterns", "works": True}
-        ]
-        
-        # Verify general perfectoid factorization
-        general_factorization = all(pattern["works"] for pattern in binary_pattern_classes)
-        
-        # Verify the perfectoid factorization predicate
-        print("\n=== D. Perfectoid Factorization Predicate Verification ===")
-        
-        # Define predicate properties
-        predicate_properties = {
-            "well_defined": True,
-            "binary_pattern_dependent": True,
-            "characterizes_membership": True,
-            "localization_compatible": True
-        }
-        
-        # Verify predicate properties
-        predicate_verified = all(predicate_properties.values())
-        
-        # Mathematical consistency check
-        mathematical_consistency = True
-        
-        # Update verification framework
-        problem = next(p for p in self.verification_framework if p.problem == "Perfectoid Factorization")
-        problem.components[0].verified = factorization_verified
-        problem.components[1].verified = general_factorization
-        problem.components[2].verified = predicate_verified
-        problem.components[3].verified = mathematical_consistency
-        
-        # Prepare results
-        result = {
-            "perfectoid_factorization_verified": factorization_verified and 
-                                               general_factorization and 
-                                               predicate_verified and 
-                                               mathematical_consistency,
-            "factorization_verified": factorization_verified,
-            "general_factorization": general_factorization,
-            "predicate_verified": predicate_verified,
-            "mathematical_consistency": mathematical_consistency,
-            "message": "Perfectoid factorization verification complete"
-        }
+        result = self._apply_stage("perfectoid", "Perfectoid Factorization")
+        checks = self._stage_result("perfectoid")
+        print(f"Checked {result['checked']['patterns']} binary patterns")
+        print("Patterns decided per branch:")
+        for branch, count in checks["branch_histogram"].items():
+            print(f"  {branch}: {count}")
+        print(f"Patterns on which the core and helper predicates differ "
+              f"(informational, not a verification failure): "
+              f"{checks['implementation_disagreements']}")
+        
+        result["perfectoid_factorization_verified"] = all(result[flag]
+                                                          for flag in STAGE_FLAGS["perfectoid"])
+        result["branch_histogram"] = checks["branch_histogram"]
+        result["implementation_disagreements"] = checks["implementation_disagreements"]
+        result["message"] = "Perfectoid factorization verification complete"
         
         self.verification_results.append(result)
         print(f"\nPerfectoid factorization verified: {result['perfectoid_factorization_verified']}")
@@ -480,8 +288,9 @@ class BinaryPAdicVerifier:
         """
         Verify the behavior of the theory in edge cases and boundary conditions.
         
-        This includes testing pathological examples, boundary behavior,
-        algorithmic stability, and extreme values to ensure robustness.
+        This covers elements with no non-zero digits, coefficients next to 0
+        and 1, several primes and precisions, and numerators beyond the int64
+        range.
         
         Returns:
             Dict with verification results
@@ -489,79 +298,11 @@ class BinaryPAdicVerifier:
         print("\n============== IV. EDGE CASES AND BOUNDARY BEHAVIOR ==============")
         print("Testing extreme edge cases and boundary behavior to ensure theory robustness...")
         
-        # Test pathological examples
-        print("\n=== A. Pathological Examples ===")
-        
-        # Define pathological test cases
-        pathological_tests = [
-            {"name": "Highly singular scheme", "theory_handles": True},
-            {"name": "Irrational coefficients", "theory_handles": True},
-            {"name": "Scheme with mixed residue characteristics", "theory_handles": True},
-            {"name": "Non-reduced scheme", "theory_handles": True}
-        ]
-        
-        # Verify pathological cases
-        pathological_verified = all(test["theory_handles"] for test in pathological_tests)
-        
-        # Test boundary behavior
-        print("\n=== B. Boundary Behavior ===")
-        
-        # Define boundary test cases
-        boundary_tests = [
-            {"boundary": "p → 0 limit", "consistent": True},
-            {"boundary": "Coefficient → 1", "consistent": True},
-            {"boundary": "Infinite p-adic expansion", "consistent": True},
-            {"boundary": "Val_p → ∞", "consistent": True}
-        ]
-        
-        # Verify boundary behavior
-        boundary_verified = all(test["consistent"] for test in boundary_tests)
-        
-        # Test algorithmic stability
-        print("\n=== C. Algorithmic Stability ===")
-        
-        # Define stability tests
-        stability_tests = [
-            {"aspect": "Precision variation", "stable": True},
-            {"aspect": "Different prime choices", "stable": True},
-            {"aspect": "Computational efficiency", "stable": True}
-        ]
-        
-        # Verify algorithmic stability
-        stability_verified = all(test["stable"] for test in stability_tests)
-        
-        # Test extreme values
-        print("\n=== D. Extreme Value Testing ===")
-        
-        # Define extreme value tests
-        extreme_tests = [
-            {"scenario": "Very large coefficients", "theory_works": True},
-            {"scenario": "Near-zero coefficients", "theory_works": True},
-            {"scenario": "Highly complex binary patterns", "theory_works": True}
-        ]
-        
-        # Verify extreme value behavior
-        extreme_verified = all(test["theory_works"] for test in extreme_tests)
+        result = self._apply_stage("edge", "Edge Cases and Boundary Behavior")
+        print(f"Checked {result['checked']['elements']} elements")
         
-        # Update verification framework
-        problem = next(p for p in self.verification_framework if p.problem == "Edge Cases and Boundary Behavior")
-        problem.components[0].verified = pathological_verified
-        problem.components[1].verified = boundary_verified
-        problem.components[2].verified = stability_verified
-        problem.components[3].verified = extreme_verified
-        
-        # Prepare results
-        result = {
-            "edge_cases_verified": pathological_verified and 
-                                 boundary_verified and 
-                                 stability_verified and 
-                                 extreme_verified,
-            "pathological_verified": pathological_verified,
-            "boundary_verified": boundary_verified,
-            "stability_verified": stability_verified,
-            "extreme_verified": extreme_verified,
-            "message": "Edge cases verification complete"
-        }
+        result["edge_cases_verified"] = all(result[flag] for flag in STAGE_FLAGS["edge"])
+        result["message"] = "Edge cases verification complete"
         
         self.verification_results.append(result)
         print(f"\nEdge cases verified: {result['edge_cases_verified']}")
@@ -571,8 +312,8 @@ class BinaryPAdicVerifier:
         """
         Conduct final consistency verification of the entire theory.
         
-        This integrates all previous verification results and checks
-        the overall consistency of the binary p-adic test ideal theory.
+        This integrates the results of the four other stages (running any
+        that have not run yet) and derives the unified theory aspects from them.
         
         Returns:
             Dict with verification results
@@ -580,72 +321,65 @@ class BinaryPAdicVerifier:
         print("\n============== V. FINAL CONSISTENCY VERIFICATION ==============")
         print("Conducting final consistency verification of the binary p-adic test ideal theory...")
         
-        # Check integration with established theory
-        integration_verified = True
-        
-        # Check resolution of three open problems
-        problems_resolved = True
-        
-        # Check computational tractability
-        computationally_tractable = True
+        result = self._apply_stage("final", "Final Consistency")
+        del result["checked"]
         
-        # Check global coherence
-        globally_coherent = True
-        
-        # Update verification framework
-        problem = next(p for p in self.verification_framework if p.problem == "Final Consistency")
-        problem.components[0].verified = integration_verified
-        problem.components[1].verified = problems_resolved
-        problem.components[2].verified = computationally_tractable
-        problem.components[3].verified = globally_coherent
+        stages = {name: self._stage_result(name) for name in _STAGE_DEPENDENCIES}
+        passed = {name: all(stages[name][flag] for flag in STAGE_FLAGS[name])
+                  for name in stages}
         
         # Update unified theory aspects
-        self.unified_theory_aspects[0].verified = True  # Mathematical foundation sound
-        self.unified_theory_aspects[1].verified = True  # Globally consistent on schemes
-        self.unified_theory_aspects[2].verified = True  # Compatible with scheme operations
-        self.unified_theory_aspects[3].verified = True  # Resolves all three open problems
-        self.unified_theory_aspects[4].verified = True  # Handles edge cases and boundaries
-        self.unified_theory_aspects[5].verified = True  # Consistent with established results
-        self.unified_theory_aspects[6].verified = True  # Provides computational framework
+        aspects = [
+            passed["global"] and passed["schema"],  # Membership and digit arithmetic
+            passed["global"],                       # Membership code paths
+            passed["schema"],                       # Digit arithmetic
+            result["problems_resolved"],            # Perfectoid predicates
+            passed["edge"],                         # Edge cases and boundaries
+            result["integration_verified"],         # Stage results consistent
+            result["computationally_tractable"]     # Non-empty workloads
+        ]
+        for aspect, verified in zip(self.unified_theory_aspects, aspects):
+            aspect.verified = bool(verified)
         
         # Prepare results
-        result = {
-            "final_verification": integration_verified and 
-                                 problems_resolved and 
-                                 computationally_tractable and 
-                                 globally_coherent,
-            "integration_verified": integration_verified,
-            "problems_resolved": problems_resolved,
-            "computationally_tractable": computationally_tractable,
-            "globally_coherent": globally_coherent,
-            "verification_framework": [
-                {
-                    "problem": problem.problem,
-                    "verified": problem.is_verified,
-                    "components": [
-                        {"aspect": c.aspect, "verified": c.verified}
-                        for c in problem.components
-                    ]
-                }
-                for problem in self.verification_framework
-            ],
-            "unified_theory_aspects": [
-                {"aspect": aspect.aspect, "verified": aspect.verified}
-                for aspect in self.unified_theory_aspects
-            ],
-            "message": "Final consistency verification complete"
-        }
+        result["final_verification"] = all(result[flag] for flag in STAGE_FLAGS["final"])
+        result["stage_timings"] = dict(self.stage_timings)
+        result["verification_framework"] = self._framework_summary()
+        result["unified_theory_aspects"] = [
+            {"aspect": aspect.aspect, "verified": aspect.verified}
+            for aspect in self.unified_theory_aspects
+        ]
+        result["message"] = "Final consistency verification complete"
         
         self.verification_results.append(result)
         print(f"\nFinal verification: {result['final_verification']}")
         return result
     
-    def run_deep_verification_analysis(self):
+    def _framework_summary(self) -> List[Dict[str, Any]]:
+        """Verification framework as a list of plain dicts."""
+        return [
+            {
+                "problem": problem.problem,
+                "verified": problem.is_verified,
+                "components": [
+                    {"aspect": c.aspect, "verified": c.verified}
+                    for c in problem.components
+                ]
+            }
+            for problem in self.verification_framework
+        ]
+    
+    def run_deep_verification_analysis(self, workers: Optional[int] = None):
         """
         Run the complete verification analysis of the binary p-adic test ideal theory.
         
-        This executes all verification steps and compiles the results into a
-        comprehensive report on the mathematical soundness of the theory.
+        The four independent stage checks run as parallel jobs and the final
+        consistency stage runs once they are done, so the wall-clock time is
+        that of the slowest stage plus the final one. The stages are then
+        reported in order.
+        
+        Args:
+            workers: Number of worker processes (default: CPU count; 1 runs in-process)
         
         Returns:
             Dict with complete verification results
@@ -653,7 +387,14 @@ class BinaryPAdicVerifier:
         print("==================== DEEP GLOBAL VERIFICATION ANALYSIS ====================")
         print("Conducting comprehensive validation of binary p-adic test ideal theory...")
         
-        # Run individual verification steps
+        args = (self.prime, self.precision, self.max_num)
+        jobs = {name: (_STAGE_CHECKS[name], args, ()) for name in _STAGE_DEPENDENCIES}
+        jobs["final"] = (_STAGE_CHECKS["final"], (), _STAGE_DEPENDENCIES)
+        results, timings = run_job_graph(jobs, workers)
+        self.stage_results.update(results)
+        self.stage_timings.update(timings)
+        
+        # Report the individual verification steps
         print("\nRunning individual verification steps...")
         global_result = self.verify_global_consistency()
         schema_result = self.verify_schema_theoretic_properties()
@@ -675,33 +416,28 @@ class BinaryPAdicVerifier:
             for component in problem.components:
                 print(f"{component.aspect}: {'✓' if component.verified else '✗'}")
         
+        print("\nStage timings:")
+        for name, seconds in self.stage_timings.items():
+            print(f"  {name}: {seconds:.3f}s")
+        
         # Final conclusion
         if all_verified:
             print("\n=== FINAL VERIFICATION CONCLUSION ===")
-            print("✓ FULLY VERIFIED: The Binary P-adic Test Ideal Theory is mathematically sound")
-            print("✓ The theory successfully addresses all open problems globally")
-            print("✓ All components of the theory are consistent and well-defined")
-            print("✓ The approach handles all identified edge cases and boundary conditions")
-            print("✓ The binary p-adic characterization provides a powerful unified framework")
+            print("✓ All stage checks passed on the generated elements and patterns:")
+            print("✓ membership is computed consistently by every code path")
+            print("✓ the digit arithmetic of the p-adic expansions is consistent")
+            print("✓ the perfectoid predicates agree with their scalar rules")
+            print("✓ degenerate, boundary and large inputs are handled consistently")
         
         # Prepare final results
         final_verification = {
             "all_verification_results": self.verification_results,
-            "verification_framework": [
-                {
-                    "problem": problem.problem,
-                    "verified": problem.is_verified,
-                    "components": [
-                        {"aspect": c.aspect, "verified": c.verified}
-                        for c in problem.components
-                    ]
-                }
-                for problem in self.verification_framework
-            ],
+            "verification_framework": self._framework_summary(),
             "unified_theory_aspects": [
                 {"aspect": aspect.aspect, "verified": aspect.verified}
                 for aspect in self.unified_theory_aspects
             ],
+            "stage_timings": dict(self.stage_timings),
             "final_verification": all_verified,
             "message": "Deep verification analysis complete"
         }
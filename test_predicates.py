@@ -2,16 +2,30 @@
 """
 Test script to validate the binary p-adic predicate implementation.
 """
+import copy
+import itertools
 import math
+import os
+import pickle
+import tempfile
 from fractions import Fraction
 from padiclib import (
     PadicElement,
     Divisor,
     QDivisor,
     BinaryPredicate,
+    WeightedDigitPredicate,
+    DivisorPredicate,
+    divisor_weight_vector,
     test_ideal_membership,
+    batch_test_ideal_membership,
     subadditivity_factorization,
+    FactorizationSearch,
     FormulationClassifier,
+    precision_context,
+    cached_test_set,
+    get_test_set_cache_info,
+    clear_test_set_cache,
 )
 
 
@@ -45,6 +59,175 @@ def test_padic_arithmetic():
     print()
 
 
+def test_normalization():
+    """Test carry propagation and canonical construction."""
+    print("Testing digit normalization:")
+
+    p = 5
+
+    # Carries that land on an existing position and then beyond the last one
+    a = PadicElement(p, {0: 24, 1: 24}, 0)  # 24 + 24·5 = 144 = 4 + 3·5 + 1·5³
+    print(f"  24 + 24·5 = {a}")
+    assert a.digits == {0: 4, 1: 3, 3: 1}
+
+    # Products of dense elements are fully normalized
+    b = PadicElement(p, {i: 4 for i in range(6)}, 0)  # 5⁶ - 1
+    c = b * b
+    assert all(0 < d < p for d in c.digits.values())
+    assert sum(d * p**k for k, d in c.digits.items()) == (p**6 - 1) ** 2
+    print(f"  (5⁶ - 1)² = {c}")
+
+    # Canonical construction skips normalization
+    d = PadicElement.from_canonical(p, {0: 2, 3: 1}, 0)
+    assert d.digits == {0: 2, 3: 1}
+
+    print()
+
+
+def test_multiplication_strategies():
+    """Test that sparse and dense multiplication agree."""
+    print("Testing multiplication strategies:")
+
+    p = 7
+    dense = PadicElement(p, {i: (3 * i + 1) % p or 1 for i in range(300)}, 0)
+    sparse = PadicElement(p, {0: 2, 150: 5}, 0)
+
+    for x, y in [(dense, dense), (dense, sparse), (sparse, sparse)]:
+        by_convolution = x.multiply(y, strategy="sparse")
+        by_packing = x.multiply(y, strategy="dense")
+        assert by_convolution.digits == by_packing.digits
+        assert (x * y).digits == by_convolution.digits
+
+    # Truncated products only keep positions below the requested precision
+    truncated = dense.multiply(dense, precision=40)
+    assert max(truncated.digits) < 40
+    assert truncated.digits == {
+        k: d for k, d in (dense * dense).digits.items() if k < 40
+    }
+    print(f"  300-digit square has {len((dense * dense).digits)} non-zero digits")
+    print()
+
+
+def test_precision_context():
+    """Test that precision-capped arithmetic bounds repeated squaring."""
+    print("Testing precision-capped arithmetic:")
+
+    p = 5
+    x = PadicElement(p, {0: 2, 1: 3, 2: 1}, 0)
+
+    with precision_context(12):
+        capped = x**64
+    full = x**64
+
+    assert max(capped.digits) < 12
+    assert capped.digits == {k: d for k, d in full.digits.items() if k < 12}
+    print(f"  x^64 keeps {len(capped.digits)} of {len(full.digits)} non-zero digits")
+
+    # Per-element precision propagates through products
+    y = PadicElement(p, {i: 1 for i in range(30)}, 0, precision=10)
+    assert (y * x).precision == 10 and max((y * x).digits) < 10
+    print()
+
+
+def test_test_set_cache():
+    """Test that membership queries share cached test sets."""
+    print("Testing test set cache:")
+
+    p = 5
+    clear_test_set_cache()
+    predicate = BinaryPredicate(lambda element, t: element.valuation < t, p)
+
+    for t in range(1, 20):
+        test_ideal_membership(predicate, PadicElement(p, {0: 1}, 0), t)
+
+    info = get_test_set_cache_info()
+    print(f"  hits={info.hits} misses={info.misses} size={info.currsize}")
+    assert info.misses == 1 and info.hits == 18
+
+    # Cached test sets are shared, so they must not be modifiable
+    test_set = cached_test_set(p, 30)
+    assert test_set is cached_test_set(p, 11)
+    try:
+        test_set[0].digits[0] = 2
+        raise AssertionError("cached test set digits should be read-only")
+    except TypeError:
+        pass
+    print()
+
+
+def test_batch_membership():
+    """Test batched membership against per-element queries."""
+    print("Testing batched membership:")
+
+    p = 5
+    elements = [
+        PadicElement(p, {0: 1}, 0),
+        PadicElement(p, {0: 2, 1: 3}, 0),
+        PadicElement(p, {2: 1}, 2),
+        PadicElement(p, {i: 1 for i in range(5)}, 0),
+        PadicElement(p, {3: 4, 6: 1}, 0),
+    ]
+    t_values = list(range(0, 12))
+
+    plain = create_standard_predicate(p, 2, 1.5)
+    with_divisor = create_standard_predicate(p, 2, 1.5)
+    with_divisor.divisor = QDivisor({Divisor("D"): Fraction(1, 3)})
+
+    for predicate in (plain, with_divisor):
+        matrix = batch_test_ideal_membership(predicate, elements, t_values)
+        for element, row in zip(elements, matrix):
+            expected = [test_ideal_membership(predicate, element, t) for t in t_values]
+            assert row == expected
+        print(f"  members per t: {[sum(column) for column in zip(*matrix)]}")
+
+    assert plain.test_ideal_batch([1, 7], [1, 2]) == [
+        [plain.test_ideal(1, 1), plain.test_ideal(1, 2)],
+        [plain.test_ideal(7, 1), plain.test_ideal(7, 2)],
+    ]
+    print()
+
+
+def test_membership_threshold():
+    """Test threshold search against a linear scan over t."""
+    print("Testing membership threshold search:")
+
+    p = 5
+    divisor = QDivisor({Divisor("D"): Fraction(1, 3)})  # t_Δ = 3
+    predicate = BinaryPredicate(lambda element, t: True, p, divisor, monotone="decreasing")
+
+    for k in (0, 4, 40, 200):
+        element = PadicElement(p, {k: 1}, 0)  # first non-zero digit at position k
+        threshold = predicate.membership_threshold(element, 500)
+        scan = [t for t in range(501) if predicate.test_ideal(element, t)]
+        assert threshold == max(scan) == divisor.compute_threshold() + k
+        print(f"  p^{k}: in τ(p^t) for t <= {threshold}")
+
+    # Divisor predicates are declared decreasing and match a linear scan
+    compiled = DivisorPredicate(
+        QDivisor({Divisor("D1"): Fraction(2, 3), Divisor("D2"): Fraction(1, 7)}), p
+    )
+    assert compiled.monotone == "decreasing"
+    elements = [PadicElement(p, {}, 0), PadicElement(p, {0: 1}, 0)] + [
+        PadicElement(p, {k + i: d for i, d in enumerate(digits) if d}, v)
+        for v in range(3)
+        for k in range(v, v + 4)
+        for digits in itertools.product(range(3), repeat=2)
+    ]
+    for element in elements:
+        for t_min, t_max in ((0, 20), (3, 12), (5, 5)):
+            scan = [t for t in range(t_min, t_max + 1) if compiled.test_ideal(element, t)]
+            threshold = compiled.membership_threshold(element, t_max, t_min)
+            assert threshold == (max(scan) if scan else None)
+    print(f"  DivisorPredicate agrees with a linear scan on {len(elements)} elements")
+
+    try:
+        create_standard_predicate(p, 2, 1.5).membership_threshold(1, 10)
+        raise AssertionError("undeclared predicates should be rejected")
+    except ValueError:
+        pass
+    print()
+
+
 def create_standard_predicate(p, threshold, complexity):
     """Create a standard test ideal predicate."""
 
@@ -68,6 +251,37 @@ def create_standard_predicate(p, threshold, complexity):
     return BinaryPredicate(predicate_func, p)
 
 
+def test_compiled_predicate():
+    """Test a structured predicate against its callable equivalent."""
+    print("Testing compiled predicates:")
+
+    p = 5
+    opaque = create_standard_predicate(p, 2, 1.5)
+    compiled = WeightedDigitPredicate(
+        p,
+        weights=lambda i: p ** (-i / 2),
+        bound=1.5,
+        window=lambda t: t + 10,
+        valuation_guard=2,
+        guard_result=True,
+    )
+
+    elements = [
+        PadicElement(p, {i: (i * 7) % p for i in range(k, k + 4)}, v)
+        for k in range(8)
+        for v in range(3)
+    ]
+    for t in (0, 3, 8):
+        expected = [opaque.evaluate(element, t) for element in elements]
+        assert compiled.evaluate_batch(elements, t) == expected
+        assert [compiled.evaluate(element, t) for element in elements] == expected
+        assert opaque.evaluate_batch(elements, t) == expected
+
+    assert compiled.digit_window(4) == 14 and opaque.digit_window(4) is None
+    print(f"  {len(elements)} elements agree at t = 0, 3, 8")
+    print()
+
+
 def test_divisor_predicate():
     """Test predicates defined by divisors."""
     print("Testing divisor-based predicates:")
@@ -82,6 +296,40 @@ def test_divisor_predicate():
     threshold = divisor.compute_threshold()
     complexity = divisor.compute_complexity_bound()
 
+    # Divisors are immutable values: equal components give equal, hashable divisors
+    same = QDivisor({Divisor("D2"): Fraction(3, 5), Divisor("D1"): Fraction(2, 3)})
+    assert same == divisor and hash(same) == hash(divisor)
+    assert {divisor: "cached"}[same] == "cached"
+    assert divisor.compute_complexity_bound() is divisor.compute_complexity_bound()
+    try:
+        divisor.components[D1] = Fraction(1, 2)
+        raise AssertionError("divisor components should be read-only")
+    except TypeError:
+        pass
+
+    # Invariants come from the exact integer path, rounded once
+    assert threshold == 2 and divisor.integer_pairs() == ((2, 3), (3, 5))
+    assert divisor.common_denominator() == ((10, 9), 15)
+    assert divisor.exact_complexity_bound() == sum(
+        c_i * (1 + sum(c_j * math.gcd(c_i.denominator, c_j.denominator) / c_i.denominator
+                       for c_j in components.values()))
+        for c_i in components.values()
+    )
+    assert complexity == float(divisor.exact_complexity_bound())
+    assert divisor.compute_epsilon_values()[D1] == 2 / 12
+
+    # Divisors survive pickling and copying, and per-position weights are not memoized
+    for value in (D1, divisor):
+        assert pickle.loads(pickle.dumps(value)) == value
+        assert copy.deepcopy(value) == value and copy.copy(value) == value
+    restored = pickle.loads(pickle.dumps(divisor))
+    assert hash(restored) == hash(divisor)
+    assert restored.compute_complexity_bound() == complexity
+    memo_size = len(divisor._invariants)
+    for i in range(100):
+        divisor.compute_weights(i, 5)
+    assert len(divisor._invariants) == memo_size
+
     print(f"  Divisor: {divisor}")
     print(f"  Threshold t_Δ: {threshold}")
     print(f"  Complexity bound C_Δ: {complexity}")
@@ -125,6 +373,24 @@ def test_divisor_predicate():
         result = predicate.test_ideal(elem, 2)
         print(f"  Element {i+1}: {elem} in test ideal? {result}")
 
+    # The compiled predicate shares one cached weight vector and agrees with the loop
+    compiled = DivisorPredicate(divisor, p, truncation=20)
+    assert list(compiled.weight_vector(20)) == [
+        divisor.compute_weights(i, p) for i in range(20)
+    ]
+    assert DivisorPredicate(divisor, p).weight_vector(20) is divisor_weight_vector(
+        divisor, p, 20
+    )
+    samples = elements + [
+        PadicElement(p, {i: 1 for i in range(k, k + 3)}, v)
+        for k in range(6)
+        for v in range(3)
+    ]
+    expected = [predicate.evaluate(elem, 2) for elem in samples]
+    assert compiled.evaluate_batch(samples, 2) == expected
+    assert [compiled.evaluate(elem, 2) for elem in samples] == expected
+    print(f"  Compiled predicate agrees on {len(samples)} elements")
+
     print()
 
 
@@ -187,6 +453,65 @@ def test_subadditivity():
         print("\n  No simple factorization found")
 
     print(f"  Element in combined test ideal? {combined_result}")
+
+    # θ is evaluated by a pruned factorization search, usable at large t
+    compiled1 = WeightedDigitPredicate(p, lambda i: p ** (-i / 2), 1.5, lambda t: t + 10, 2)
+    compiled2 = WeightedDigitPredicate(p, lambda i: p ** (-i / 2), 2.0, lambda t: t + 10, 3)
+    compiled1.divisor, compiled2.divisor = div1, div2
+    theta, _ = subadditivity_factorization(compiled1, compiled2)
+    y = PadicElement(p, {0: 3, 1: 2, 3: 1, 150: 4}, 0)
+    a, b, s = theta.func.find(y, 200)
+    assert (a * b).get_digits_up_to(200) == y.get_digits_up_to(200)
+    assert compiled1.evaluate(a, s) and compiled2.evaluate(b, 200 - s)
+    assert theta.evaluate(y, 200) and theta.func.statistics()["memo_hits"] >= 1
+    print(f"  θ at t = 200: {theta.func.statistics()}")
+
+    # The search agrees with exhaustive enumeration of factor pairs mod p^t
+    q = 3
+    sparse = BinaryPredicate(lambda e, t: sum(map(bool, e.get_digits_up_to(t + 2))) <= 1, q)
+    guarded = BinaryPredicate(lambda e, t: e.get_digit(0) != 2 or t > 1, q)
+    search = FactorizationSearch(sparse, guarded)
+    value = lambda digits: sum(d * q**i for i, d in enumerate(digits))
+    element = lambda digits: PadicElement(q, dict(enumerate(digits)), 0)
+    for t in range(4):
+        prefixes = list(itertools.product(range(q), repeat=t))
+        for digits in prefixes:
+            expected = any(
+                sparse.evaluate(element(u), s)
+                and guarded.evaluate(element(v), t - s)
+                and (value(u) * value(v) - value(digits)) % q**t == 0
+                for s in range(t + 1)
+                for u in prefixes
+                for v in prefixes
+            )
+            assert search(element(digits), t) == expected
+
+    # A search cut off by max_nodes makes θ conservatively False and is counted
+    never = BinaryPredicate(lambda e, t: False, q)
+    x = element((1, 2, 1))
+    small = FactorizationSearch(never, never, max_nodes=2)
+    assert small(x, 3) is False
+    assert small.statistics()["exhausted"] > 0
+    assert small.statistics()["undecided"] == 1
+    small.max_nodes = 10000
+    assert small.find(x, 3) is None
+    assert small.statistics()["undecided"] == 1
+
+    # θ built from opaque predicates is decided by monomial factors at any t
+    even = BinaryPredicate(lambda e, t: sum(e.get_digits_up_to(t)) % 2 == 0, p, div1)
+    unit = BinaryPredicate(lambda e, t: e.get_digit(0) != 0, p, div2)
+    opaque, _ = subadditivity_factorization(even, unit)
+    elements = [PadicElement(p, dict(enumerate(digits)), 0)
+                for digits in itertools.product(range(p), repeat=3)]
+    for t in range(1, 6):
+        for x in elements:
+            assert isinstance(test_ideal_membership(opaque, x, t), bool)
+    assert all(opaque.evaluate(x, t) for x in elements for t in range(1, 13))
+    classifier = FormulationClassifier(p)
+    classifier.register_formulation("theta", opaque)
+    assert classifier.find_equivalent_formulations(opaque) == ["theta"]
+    assert opaque.func.statistics()["undecided"] == 0
+    print(f"  Opaque θ: {opaque.func.statistics()}")
     print()
 
 
@@ -258,6 +583,64 @@ def test_formulation_classifier():
 
     equivalents = classifier.find_equivalent_formulations(new_predicate)
     print(f"  Formulations equivalent to new predicate: {equivalents}")
+
+    # Equivalence classes group formulations with equal signatures
+    classes = classifier.equivalence_classes()
+    names = ["standard", "alternate", "different"]
+    for name1 in names:
+        for name2 in names:
+            same_class = any(name1 in c and name2 in c for c in classes)
+            assert same_class == classifier.are_equivalent(name1, name2)
+    print(f"  Equivalence classes: {classes}")
+
+    # Structured (picklable) predicates can be evaluated in worker processes
+    compiled = FormulationClassifier(p)
+    for name, bound in [("low", 0.9), ("high", 1.5), ("higher", 2.0)]:
+        compiled.register_formulation(
+            name, WeightedDigitPredicate(p, [p**-i for i in range(15)], bound, 15, 2)
+        )
+    assert compiled.equivalence_classes(workers=2) == [["low"], ["high", "higher"]]
+    print(f"  Compiled classes: {compiled.equivalence_classes(workers=2)}")
+
+    # Divisor predicates pickle with their divisors and agree with in-process signatures
+    divisors = FormulationClassifier(p)
+    for name, coefficient in [("third", Fraction(1, 3)), ("half", Fraction(1, 2))]:
+        divisors.register_formulation(
+            name, DivisorPredicate(QDivisor({Divisor("D"): coefficient}), p)
+        )
+    assert divisors.signatures(workers=2) == divisors.signatures()
+    print(f"  Divisor classes: {divisors.equivalence_classes(workers=2)}")
+
+    # Queries are matched against the fingerprint index, which persists to disk
+    query = WeightedDigitPredicate(p, [p**-i for i in range(15)], 1.75, 15, 2)
+    assert compiled.find_equivalent_formulations(query) == ["high", "higher"]
+    assert compiled.find_equivalent_formulations(query, precision=6) == ["high", "higher"]
+    compiled.register_formulation("higher", WeightedDigitPredicate(p, [1.0] * 15, 0.5, 15, 2))
+    assert compiled.find_equivalent_formulations(query) == ["high"]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "index.json")
+        compiled.save_index(path)
+        restored = FormulationClassifier(p)
+        restored.load_index(path)
+    # Loaded names are answered only once registered; registering the same
+    # predicate reuses the loaded fingerprint instead of evaluating it
+    assert restored.find_equivalent_formulations(query) == []
+    high = WeightedDigitPredicate(p, [p**-i for i in range(15)], 1.5, 15, 2)
+    evaluate_fingerprint = restored.fingerprint
+    restored.fingerprint = None  # any evaluation would fail
+    restored.register_formulation("high", high)
+    restored.fingerprint = evaluate_fingerprint
+    assert restored.find_equivalent_formulations(query, workers=2) == ["high"]
+
+    # Changed predicates under loaded names are evaluated, not matched by name
+    restored.register_formulation("higher", BinaryPredicate(lambda e, t: False, p))
+    restored.register_formulation(
+        "low", WeightedDigitPredicate(p, [p**-i for i in range(15)], 1.75, 15, 2)
+    )
+    assert restored.find_equivalent_formulations(query) == ["high", "low"]
+    never = BinaryPredicate(lambda e, t: False, p)
+    assert restored.find_equivalent_formulations(never) == ["higher"]
     print()
 
 
@@ -266,6 +649,13 @@ def main():
     print("====== Binary P-adic Predicate Testing ======\n")
 
     test_padic_arithmetic()
+    test_normalization()
+    test_multiplication_strategies()
+    test_precision_context()
+    test_compiled_predicate()
+    test_test_set_cache()
+    test_batch_membership()
+    test_membership_threshold()
     test_divisor_predicate()
     test_subadditivity()
     test_formulation_classifier()